@@ -1 +1,3 @@
-from article._base.jobs.scrape_articles import BaseScrapeArticlesJob
+from article._base.jobs.scrape_articles import (BaseDynamicScrapeArticlesJob,
+                                                BaseScrapeAllArticlesJob,
+                                                BaseScrapeArticlesJob)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+
+from dagster import JobDefinition, job
+from strenum import StrEnum
+
+from article._base.jobs.base_job import BaseJob
+from article._base.ops.base_op import BaseCategorizedOpFactory
+from common.config.providers import Providers
+from common.utils.id import build_id
+
+
+class BaseCompactSnapshotsJob(BaseJob):
+  """Base Compact Snapshots job, compacting a day's snapshots of every category
+
+  Attributes:
+      categories (list[StrEnum]): Categories
+      provider (str): Provider name
+      resource_defs (Dict[str, Any]): Resource Definitions of Dagster
+      compact_snapshots_op_factory (BaseCategorizedOpFactory)
+  """
+
+  def __init__(self,
+               categories: Iterable[StrEnum],
+               provider: Providers,
+               compact_snapshots_op_factory: BaseCategorizedOpFactory,
+               resource_defs: Optional[Dict[str, Any]] = None) -> None:
+    super().__init__(provider, resource_defs)
+    self._categories = list(categories)
+    self._compact_snapshots_op_factory = compact_snapshots_op_factory
+
+  @property
+  def categories(self) -> list[StrEnum]:
+    return self._categories
+
+  @property
+  def compact_snapshots_op_factory(self) -> BaseCategorizedOpFactory:
+    return self._compact_snapshots_op_factory
+
+  def build(self, **kwargs) -> JobDefinition:
+    """Create the job compacting snapshots of all categories
+
+    Returns:
+        JobDefinition: Compaction job
+    """
+    compact_snapshots_ops = [
+        self.compact_snapshots_op_factory.create_op(category)
+        for category in self.categories
+    ]
+
+    @job(name=build_id(provider=self.provider,
+                       identifier="compact_snapshots_job"),
+         resource_defs=self.resource_defs,
+         **kwargs)
+    def _job():
+      for compact_snapshots_op in compact_snapshots_ops:
+        compact_snapshots_op()
+
+    return _job
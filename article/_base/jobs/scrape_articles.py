@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from dagster import OpDefinition, job
 from strenum import StrEnum
 
-from article._base.jobs.base_job import BaseCategorizedJob
-from article._base.ops.base_op import BaseCategorizedOpFactory
+from article._base.jobs.base_job import BaseCategorizedJob, BaseJob
+from article._base.ops.base_op import BaseCategorizedOpFactory, BaseOp
 from article._base.ops.scrape_articles import ArticleDetail
 from common.config.providers import Providers
 from common.utils.id import build_id
@@ -22,19 +22,25 @@ class BaseScrapeArticlesJob(BaseCategorizedJob):
       scrape_articles_op_factory (BaseCategorizedOpFactory)
       save_articles_op_factory (BaseCategorizedOpFactory)
       save_cursor_op_factory (BaseCategorizedOpFactory)
+      export_articles_op_factory (BaseCategorizedOpFactory | None): Columnar
+        export of the articles, skipped if not specified
   """
 
-  def __init__(self,
-               category: StrEnum,
-               provider: Providers,
-               scrape_articles_op_factory: BaseCategorizedOpFactory,
-               save_articles_op_factory: BaseCategorizedOpFactory,
-               save_cursor_op_factory: BaseCategorizedOpFactory,
-               resource_defs: Optional[Dict[str, Any]] = None) -> None:
+  def __init__(
+      self,
+      category: StrEnum,
+      provider: Providers,
+      scrape_articles_op_factory: BaseCategorizedOpFactory,
+      save_articles_op_factory: BaseCategorizedOpFactory,
+      save_cursor_op_factory: BaseCategorizedOpFactory,
+      resource_defs: Optional[Dict[str, Any]] = None,
+      export_articles_op_factory: Optional[BaseCategorizedOpFactory] = None
+  ) -> None:
     super().__init__(category, provider, resource_defs)
     self._scrape_articles_op_factory = scrape_articles_op_factory
     self._save_articles_op_factory = save_articles_op_factory
     self._save_cursor_op_factory = save_cursor_op_factory
+    self._export_articles_op_factory = export_articles_op_factory
 
   @property
   def scrape_articles_op_factory(self) -> BaseCategorizedOpFactory:
@@ -48,6 +54,32 @@ class BaseScrapeArticlesJob(BaseCategorizedJob):
   def save_cursor_op_factory(self) -> BaseCategorizedOpFactory:
     return self._save_cursor_op_factory
 
+  @property
+  def export_articles_op_factory(self) -> Optional[BaseCategorizedOpFactory]:
+    return self._export_articles_op_factory
+
+  def _create_export_articles_op(
+      self,
+      category: StrEnum,
+      name_suffix: str = "") -> Optional[OpDefinition]:
+    """Create the op exporting a category's articles if the export is enabled
+
+    Args:
+        category (StrEnum): Category
+        name_suffix (str, optional): Suffix keeping op's name unique within the
+          repository. Defaults to "".
+
+    Returns:
+        OpDefinition | None: Export Articles op
+    """
+    if self.export_articles_op_factory is None:
+      return None
+    return self.export_articles_op_factory.create_op(
+        category,
+        name=build_id(
+            provider=self.provider,
+            identifier=f"export_{category}_articles{name_suffix}_op"))
+
   def build(self, **kwargs) -> OpDefinition:
     """Create category-based job for scraping (Protected method)
 
@@ -58,6 +90,7 @@ class BaseScrapeArticlesJob(BaseCategorizedJob):
         self.category)
     save_articles_op = self.save_articles_op_factory.create_op(self.category)
     save_cursor_op = self.save_cursor_op_factory.create_op(self.category)
+    export_articles_op = self._create_export_articles_op(self.category)
 
     @job(name=build_id(provider=self.provider,
                        identifier=f"scrape_{self.category}_articles_job"),
@@ -68,5 +101,161 @@ class BaseScrapeArticlesJob(BaseCategorizedJob):
       articles: list[ArticleDetail] = scrape_articles_op()
       save_articles_op(articles=articles)
       save_cursor_op(articles=articles)
+      if export_articles_op is not None:
+        export_articles_op(articles=articles)
+
+    return _job
+
+
+class BaseDynamicScrapeArticlesJob(BaseScrapeArticlesJob):
+  """Base Scrape Articles job fanning out batches of links (Dagster dynamic
+  outputs) to mapped scrape ops, so that the multiprocess executor spreads deep
+  backfills across processes and a failed batch is retried on its own.
+
+  Attributes:
+      scrape_articles_op_factory (BaseScrapeArticlesOpFactory): Factory of the
+        discover links, scrape links and collect articles ops
+  """
+
+  def build(self, **kwargs) -> OpDefinition:
+    """Create category-based dynamic job for scraping
+
+    Returns:
+        JobDefinition: Dynamic scraping job on a specific category
+    """
+    (discover_links_op, scrape_links_op,
+     collect_articles_op) = self.scrape_articles_op_factory.create_dynamic_ops(
+         self.category)
+    # NOTE: Op names must be unique within the repository
+    save_articles_op = self.save_articles_op_factory.create_op(
+        self.category,
+        name=build_id(
+            provider=self.provider,
+            identifier=f"save_{self.category}_articles_s3_dynamic_op"))
+    save_cursor_op = self.save_cursor_op_factory.create_op(
+        self.category,
+        name=build_id(
+            provider=self.provider,
+            identifier=f"save_{self.category}_article_cursor_dynamic_op"))
+    export_articles_op = self._create_export_articles_op(
+        self.category, name_suffix="_dynamic")
+
+    @job(name=build_id(
+        provider=self.provider,
+        identifier=f"scrape_{self.category}_articles_dynamic_job"),
+         resource_defs=self.resource_defs,
+         **kwargs)
+    def _job():
+      # pylint: disable=no-value-for-parameter
+      link_batches = discover_links_op()
+      articles: list[ArticleDetail] = collect_articles_op(
+          article_batches=link_batches.map(scrape_links_op).collect())
+      save_articles_op(articles=articles)
+      save_cursor_op(articles=articles)
+      if export_articles_op is not None:
+        export_articles_op(articles=articles)
+
+    return _job
+
+
+class BaseScrapeAllArticlesJob(BaseJob):
+  """Base Scrape Articles job crawling every category in one run: the categories
+  share the run's resources (HTTP connection pool, rate limit, seen links index)
+  and their cursors are updated at once, while each category still gets its own
+  snapshot of articles.
+
+  Attributes:
+      categories (list[StrEnum]): Categories, in scraping order
+      provider (str): Provider name
+      resource_defs (Dict[str, Any]): Resource Definitions of Dagster
+      scrape_all_articles_op (BaseOp): Op scraping all categories (an output per
+        category, named `<category>_articles`)
+      save_articles_op_factory (BaseCategorizedOpFactory)
+      save_all_cursors_op (BaseOp): Op saving all categories' cursors (an input
+        per category, named `<category>_articles`)
+      export_articles_op_factory (BaseCategorizedOpFactory | None): Columnar
+        export of the articles, skipped if not specified
+  """
+
+  def __init__(
+      self,
+      categories: Iterable[StrEnum],
+      provider: Providers,
+      scrape_all_articles_op: BaseOp,
+      save_articles_op_factory: BaseCategorizedOpFactory,
+      save_all_cursors_op: BaseOp,
+      resource_defs: Optional[Dict[str, Any]] = None,
+      export_articles_op_factory: Optional[BaseCategorizedOpFactory] = None
+  ) -> None:
+    super().__init__(provider, resource_defs)
+    self._categories = list(categories)
+    self._scrape_all_articles_op = scrape_all_articles_op
+    self._save_articles_op_factory = save_articles_op_factory
+    self._save_all_cursors_op = save_all_cursors_op
+    self._export_articles_op_factory = export_articles_op_factory
+
+  @property
+  def categories(self) -> list[StrEnum]:
+    return self._categories
+
+  @property
+  def scrape_all_articles_op(self) -> BaseOp:
+    return self._scrape_all_articles_op
+
+  @property
+  def save_articles_op_factory(self) -> BaseCategorizedOpFactory:
+    return self._save_articles_op_factory
+
+  @property
+  def save_all_cursors_op(self) -> BaseOp:
+    return self._save_all_cursors_op
+
+  @property
+  def export_articles_op_factory(self) -> Optional[BaseCategorizedOpFactory]:
+    return self._export_articles_op_factory
+
+  def build(self, **kwargs) -> OpDefinition:
+    """Create the job scraping all categories
+
+    Returns:
+        JobDefinition: Scraping job on all categories
+    """
+    scrape_all_articles_op = self.scrape_all_articles_op.build()
+    save_all_cursors_op = self.save_all_cursors_op.build()
+    # NOTE: Op names must be unique within the repository
+    save_articles_ops = {
+        category: self.save_articles_op_factory.create_op(
+            category,
+            name=build_id(provider=self.provider,
+                          identifier=f"save_{category}_articles_s3_all_op"))
+        for category in self.categories
+    }
+    export_articles_ops = {}
+    if self.export_articles_op_factory is not None:
+      export_articles_ops = {
+          category: self.export_articles_op_factory.create_op(
+              category,
+              name=build_id(provider=self.provider,
+                            identifier=f"export_{category}_articles_all_op"))
+          for category in self.categories
+      }
+
+    @job(name=build_id(provider=self.provider,
+                       identifier="scrape_all_articles_job"),
+         resource_defs=self.resource_defs,
+         **kwargs)
+    def _job():
+      # pylint: disable=no-value-for-parameter
+      category_articles = dict(
+          zip(self.categories, scrape_all_articles_op()))
+      for category, save_articles_op in save_articles_ops.items():
+        save_articles_op(articles=category_articles[category])
+      for category, export_articles_op in export_articles_ops.items():
+        export_articles_op(articles=category_articles[category])
+      save_all_cursors_op(
+          **{
+              f"{category}_articles": articles
+              for category, articles in category_articles.items()
+          })
 
     return _job
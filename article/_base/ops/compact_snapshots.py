@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional, Set
+
+from dagster import Field, OpDefinition, get_dagster_logger, op
+from dataclasses_json import DataClassJsonMixin
+from strenum import StrEnum
+
+from article._base.ops.base_op import BaseCategorizedOp
+from article._base.ops.scrape_articles import ArticleDetail
+from common.config import DateFormats
+from common.config.resource_keys import ResourceKeys
+from common.config.snapshot import SnapshotFormats
+from common.utils.date import format_datetime_str, get_today_utc
+from common.utils.id import build_id
+from common.utils.link import normalize_link
+from common.utils.resource import build_resource_key
+from common.utils.s3 import (delete_files_s3, list_files_s3,
+                             read_dataclass_snapshot_s3, write_json_file_s3,
+                             write_json_lines_file_s3)
+
+# NOTE: Outside of `<provider>/<category>`, the prefix tracked by the sensors
+COMPACTED_DIRNAME = "compacted"
+
+
+@dataclass
+class CompactedSource(DataClassJsonMixin):
+  """Snapshot merged into a compacted file
+  """
+  uri: str
+  record_count: int
+
+
+@dataclass
+class CompactionManifest(DataClassJsonMixin):
+  """Manifest of a category's compacted snapshots of a day
+  """
+  category: str
+  date: str
+  uri: str
+  record_count: int
+  duplicate_count: int
+  created_at: str
+  sources: list[CompactedSource] = field(default_factory=list)
+  expired_sources: list[str] = field(default_factory=list)
+
+
+class BaseCompactSnapshotsOp(BaseCategorizedOp):
+  """Base Compact Snapshots operation
+
+    Description:
+      Merges the snapshots saved by the scrape runs of a day (UTC, as in their
+      names) into `<provider>/compacted/<category>/<date>.jsonl.gz`, one record
+      per article's link (the latest scraped one), and writes a manifest of the
+      merged files next to it. The originals may then be expired, except the
+      category's latest snapshot which the Save Quests sensor keeps as cursor.
+  """
+
+  def __init__(self,
+               category: StrEnum,
+               provider: str,
+               required_resource_keys: Optional[Set[str]] = None) -> None:
+    super().__init__(
+        category=category,
+        provider=provider,
+        required_resource_keys=required_resource_keys,
+        config_schema={
+            "date":
+                Field(str,
+                      default_value="",
+                      description="Day (YYYY-MM-DD, UTC) of the snapshots to "
+                      "compact, yesterday if empty"),
+            "expire_originals":
+                Field(bool,
+                      default_value=False,
+                      description="Delete the merged snapshots once compacted")
+        })
+
+  def _build_category_uri(self, context) -> str:
+    s3_resource = getattr(
+        context.resources,
+        build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI))
+    return f"{s3_resource}/{self.category}"
+
+  def _build_compacted_uri(self, context, date: str) -> str:
+    s3_resource = getattr(
+        context.resources,
+        build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI))
+    return f"{s3_resource}/{COMPACTED_DIRNAME}/{self.category}/{date}"
+
+  def build(self, **kwargs) -> OpDefinition:
+    """Build Compact Snapshots operation for specified category
+
+    Returns:
+        OpDefinition: Compaction Operation
+    """
+    kwargs.setdefault(
+        "name",
+        build_id(provider=self.provider,
+                 identifier=f"compact_{self.category}_snapshots_op"))
+
+    @op(required_resource_keys=self.required_resource_keys,
+        config_schema=self.config_schema,
+        **kwargs)
+    def _op(context):
+      """Compact a day's snapshots of the category operation
+
+      Args:
+          context: Dagster context object
+      """
+      date = context.op_config["date"] or format_datetime_str(
+          get_today_utc() - timedelta(days=1), DateFormats.YYYYMMDD)
+      category_uri = self._build_category_uri(context)
+      source_uris = list_files_s3(f"{category_uri}/{date}")
+      if len(source_uris) == 0:
+        get_dagster_logger().info(
+            f"No {self.category} snapshot to compact on {date}.")
+        return
+      compacted_uri = self._build_compacted_uri(context, date)
+      output_uri = f"{compacted_uri}.{SnapshotFormats.JSONL_GZ}"
+      # Compacted again (e.g. late snapshots), merge the previous compaction
+      source_uris = list_files_s3(output_uri) + source_uris
+      articles: dict[str, ArticleDetail] = {}
+      sources: list[CompactedSource] = []
+      record_count = 0
+      for uri in source_uris:  # Chronological, the latest scrape wins
+        source_count = 0
+        for article in read_dataclass_snapshot_s3(ArticleDetail, uri):
+          link = normalize_link(article.link)
+          articles.pop(link, None)  # Keep the order of the latest scrape
+          articles[link] = article
+          source_count += 1
+        sources.append(CompactedSource(uri=uri, record_count=source_count))
+        record_count += source_count
+      write_json_lines_file_s3(
+          (article.to_dict() for article in articles.values()), output_uri)
+      manifest = CompactionManifest(
+          category=self.category,
+          date=date,
+          uri=output_uri,
+          record_count=len(articles),
+          duplicate_count=record_count - len(articles),
+          created_at=format_datetime_str(get_today_utc()),
+          sources=sources)
+      if context.op_config["expire_originals"]:
+        # NOTE: The sensor lists the category again from its latest run key
+        latest_uri = list_files_s3(f"{category_uri}/")[-1]
+        manifest.expired_sources = [
+            uri for uri in source_uris
+            if uri not in (latest_uri, output_uri)
+        ]
+      # Manifest first: expired originals stay listed in a written manifest
+      write_json_file_s3(manifest.to_dict(), f"{compacted_uri}.manifest.json")
+      delete_files_s3(manifest.expired_sources)
+      get_dagster_logger().info(
+          f"Compact {len(sources)} {self.category} snapshots of {date} into "
+          f"{output_uri}: {manifest.record_count} articles, "
+          f"{manifest.duplicate_count} duplicates, "
+          f"{len(manifest.expired_sources)} expired.")
+
+    return _op
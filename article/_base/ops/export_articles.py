@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, Set
+
+import pytz
+from dagster import In, OpDefinition, get_dagster_logger, op
+from strenum import StrEnum
+
+from article._base.ops.base_op import BaseCategorizedOp
+from article._base.ops.scrape_articles import ArticleDetail
+from common.config.env import EnvVariables
+from common.config.snapshot import ExportFormats
+from common.utils.columnar import write_partitioned_dataset
+from common.utils.id import build_id
+
+ARTICLE_PARTITION_COLUMNS = ["provider", "category", "date"]
+ARTICLE_DICTIONARY_COLUMNS = ["author", "subcategory"]
+ARTICLE_COMPRESSED_COLUMNS = ["content"]
+
+
+def build_articles_export_uri() -> str:
+  """Build the root URI of the articles' columnar export (all providers)
+
+  Returns:
+      str: Export's URI
+  """
+  return f"{EnvVariables.S3_BUCKET_URI}/{EnvVariables.ARTICLES_EXPORT_PREFIX}"
+
+
+class BaseExportArticlesOp(BaseCategorizedOp):
+  """Base Export Articles operation: columnar copy (Parquet/Arrow IPC) of the
+  scraped articles for analytics scans, next to the JSON snapshots
+
+    Description:
+      Files are partitioned by provider, article's category and posted date
+      (`provider=.../category=.../date=YYYY-MM-DD`), author and subcategory are
+      dictionary-encoded (category as well, being a partition) and the content is
+      compressed. Use `read_partitioned_dataset` to scan the export.
+
+  Attributes:
+      category (StrEnum): Category
+      provider (str): Provider's name
+      export_format (ExportFormats): Parquet or Arrow IPC files
+  """
+
+  def __init__(self,
+               category: StrEnum,
+               provider: str,
+               export_format: ExportFormats,
+               required_resource_keys: Optional[Set[str]] = None) -> None:
+    super().__init__(category=category,
+                     provider=provider,
+                     required_resource_keys=required_resource_keys)
+    self._export_format = ExportFormats(export_format)
+
+  @property
+  def export_format(self) -> ExportFormats:
+    return self._export_format
+
+  def _build_records(self, articles: list[ArticleDetail]) -> list[dict]:
+    """Flatten articles into the export's records, with partition columns
+
+    Args:
+        articles (list[ArticleDetail]): List of article details
+
+    Returns:
+        list[dict]: Records
+    """
+    return [{
+        **article.to_dict(), "provider": self.provider,
+        "date": (article.posted_at or "")[:10] or "unknown"
+    } for article in articles]
+
+  def build(self, **kwargs) -> OpDefinition:
+    """Build Export Articles operation for specified category
+
+    Returns:
+        OpDefinition: Export Operation
+    """
+    kwargs.setdefault(
+        "name",
+        build_id(provider=self.provider,
+                 identifier=f"export_{self.category}_articles_op"))
+
+    @op(required_resource_keys=self.required_resource_keys,
+        ins={"articles": In(dagster_type=list[ArticleDetail])},
+        **kwargs)
+    def _op(context, articles: list[ArticleDetail]):
+      """Export list of articles to the columnar dataset operation
+
+      Args:
+          articles (list[ArticleDetail]): List of article details
+      """
+      if len(articles) == 0:
+        return  # Nothing to export
+      uri = build_articles_export_uri()
+      # NOTE: The run's ID keeps the files of re-runs & concurrent runs apart
+      basename = (f"{self.category}-{datetime.now(tz=pytz.utc):%Y%m%dT%H%M%S}-"
+                  f"{context.run_id}")
+      write_partitioned_dataset(self._build_records(articles),
+                                uri,
+                                self.export_format,
+                                ARTICLE_PARTITION_COLUMNS,
+                                basename,
+                                dictionary_columns=ARTICLE_DICTIONARY_COLUMNS,
+                                compressed_columns=ARTICLE_COMPRESSED_COLUMNS)
+      get_dagster_logger().info(
+          f"Export {len(articles)} articles to {uri} ({self.export_format}).")
+
+    return _op
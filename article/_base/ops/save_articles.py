@@ -5,17 +5,20 @@ from datetime import datetime
 from typing import Optional, Set
 
 import pytz
-from dagster import In, OpDefinition, get_dagster_logger, op
+from dagster import Field, In, OpDefinition, get_dagster_logger, op
 from strenum import StrEnum
 
 from article._base.ops.base_op import BaseCategorizedOp
 from article._base.ops.scrape_articles import ArticleDetail
 from common.config import DateFormats
+from common.config.env import EnvVariables
 from common.config.resource_keys import ResourceKeys
+from common.config.snapshot import SnapshotFormats
 from common.utils.date import format_datetime_str
 from common.utils.id import build_id
 from common.utils.resource import build_resource_key
-from common.utils.s3 import write_json_file_s3
+from common.utils.s3 import write_json_file_s3, write_json_lines_file_s3
+from common.utils.seen_links import SeenLinks
 
 
 class BaseSaveArticlesOp(BaseCategorizedOp):
@@ -39,7 +42,16 @@ class BaseSaveArticlesOp(BaseCategorizedOp):
     """
     super().__init__(category=category,
                      provider=provider,
-                     required_resource_keys=required_resource_keys)
+                     required_resource_keys=required_resource_keys,
+                     config_schema={
+                         "snapshot_format":
+                             Field(str,
+                                   default_value=str(
+                                       EnvVariables.SNAPSHOT_FORMAT),
+                                   description="Snapshot's format: indented "
+                                   "'json' array or gzipped JSON Lines "
+                                   "'jsonl.gz'")
+                     })
 
   def _build_save_file_uri(self, context) -> str:
     """Build Save File URI from Dagster resource context
@@ -48,14 +60,15 @@ class BaseSaveArticlesOp(BaseCategorizedOp):
         context: Dagster context
 
     Returns:
-        str: File's URI
+        str: File's URI, its extension is the snapshot's format
     """
     today_datestr = format_datetime_str(datetime.now(tz=pytz.utc),
                                         DateFormats.YYYYMMDDHHMMSS)
     s3_resource = getattr(
         context.resources,
         build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI))
-    file_uri = f"{s3_resource}/{self.category}/{today_datestr}.json"
+    snapshot_format = SnapshotFormats(context.op_config["snapshot_format"])
+    file_uri = f"{s3_resource}/{self.category}/{today_datestr}.{snapshot_format}"
     return file_uri
 
   def build(self, **kwargs) -> OpDefinition:
@@ -64,10 +77,13 @@ class BaseSaveArticlesOp(BaseCategorizedOp):
     Returns:
         OpDefinition: Save to S3 Operation
     """
+    kwargs.setdefault(
+        "name",
+        build_id(provider=self.provider,
+                 identifier=f"save_{self.category}_articles_s3_op"))
 
-    @op(name=build_id(provider=self.provider,
-                      identifier=f"save_{self.category}_articles_s3_op"),
-        required_resource_keys=self.required_resource_keys,
+    @op(required_resource_keys=self.required_resource_keys,
+        config_schema=self.config_schema,
         ins={"articles": In(dagster_type=list[ArticleDetail])},
         **kwargs)
     def _op(context, articles: list[ArticleDetail]):
@@ -78,8 +94,17 @@ class BaseSaveArticlesOp(BaseCategorizedOp):
           articles (list[ArticleDetail]): List of article details
       """
       file_uri = self._build_save_file_uri(context)
-      article_details = ArticleDetail.schema().dump(articles, many=True)
-      write_json_file_s3(article_details, file_uri)
+      if file_uri.endswith(f".{SnapshotFormats.JSONL_GZ}"):
+        write_json_lines_file_s3((article.to_dict() for article in articles),
+                                 file_uri)
+      else:
+        article_details = ArticleDetail.schema().dump(articles, many=True)
+        write_json_file_s3(article_details, file_uri)
       get_dagster_logger().info(f"Save {file_uri} successfully.")
+      seen_links_key = build_resource_key(self.provider, ResourceKeys.SEEN_LINKS)
+      if seen_links_key in self.required_resource_keys:
+        # Mark stored links, skipped by the next scrapes
+        seen_links: SeenLinks = getattr(context.resources, seen_links_key)
+        seen_links.update(article.link for article in articles)
 
     return _op
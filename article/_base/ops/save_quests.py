@@ -1,27 +1,36 @@
 from abc import abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import chain, islice
 from random import randint
-from typing import Optional, Set
+from typing import Iterator, Optional, Set, Union
 
 import pymongo
-from dagster import OpDefinition, OpExecutionContext, get_dagster_logger, op
+from dagster import (Field, OpDefinition, OpExecutionContext, Output,
+                     get_dagster_logger, op)
 from dataclasses_json import DataClassJsonMixin
-from pymongo import InsertOne
+from pymongo import InsertOne, UpdateOne
 from pymongo.database import Database
-from pymongo.errors import BulkWriteError
 from strenum import StrEnum
 
 from article._base.ops.base_op import BaseCategorizedOp
 from article._base.ops.save_articles import ArticleDetail
 from article._base.resources.alchemy import AlchemyClient, GeneratedQuest
 from common.config.avatar import ProviderAvatars
+from common.config.env import EnvVariables
 from common.config.providers import Providers
 from common.config.resource_keys import ResourceKeys
+from common.config.write_modes import WriteModes
 from common.utils.date import format_datetime, get_today_utc
 from common.utils.id import build_id
+from common.utils.link import normalize_link
+from common.utils.mongo import (build_article_write_request,
+                                bulk_write_articles, create_article_link_index,
+                                find_existing_links)
 from common.utils.resource import build_resource_key
-from common.utils.s3 import read_dataclass_json_file_s3
+from common.utils.s3 import read_dataclass_snapshot_s3
+
+PRECHECK_BATCH_SIZE = 1000  # Links per query of the existing articles
 
 
 @dataclass
@@ -53,6 +62,7 @@ class ArticleSchema(DataClassJsonMixin):
   postedAt: datetime
   createdAt: datetime
   deletedAt: Optional[datetime] = None
+  normalizedLink: Optional[str] = None  # Unique, set by the write request
 
 
 def standardize_quest(quest: GeneratedQuest) -> QuestSchema:
@@ -79,6 +89,9 @@ class BaseSaveQuestsOp(BaseCategorizedOp):
     Description:
       Save Quest Operation receives the input of a latest scraped data from S3, then call
       the Alchemy API to generate quests and persist generated data to Duty's DB
+      Articles already in Duty's DB (by normalized link, one query per batch) are
+      skipped before any quest generation. Quests of a batch are generated with
+      concurrent requests, a failed article is left for the next run.
   """
 
   @abstractmethod
@@ -96,7 +109,15 @@ class BaseSaveQuestsOp(BaseCategorizedOp):
         str(ResourceKeys.ALCHEMY_CLIENT),
         str(ResourceKeys.DUTY_MONGO_CLIENT),
     }
-    self._config_schema = {"filename": str}
+    self._config_schema = {
+        "filename":
+            str,
+        "write_mode":
+            Field(str,
+                  default_value=str(EnvVariables.ARTICLES_WRITE_MODE),
+                  description="'upsert' new links only, or 'insert' (existing "
+                  "links fail as duplicates)"),
+    }
 
   def build(self, **kwargs) -> OpDefinition:
     """Build a base Save Quest operation
@@ -126,56 +147,98 @@ class BaseSaveQuestsOp(BaseCategorizedOp):
                                        ResourceKeys.ALCHEMY_CLIENT)
       duty_db: Database = getattr(context.resources,
                                   ResourceKeys.DUTY_MONGO_CLIENT)
-      articles: list[ArticleDetail] = read_dataclass_json_file_s3(ArticleDetail,
-                                                                  uri,
-                                                                  many=True)
-      article_count = len(articles)
-      if article_count == 0:
+      # NOTE: JSON Lines snapshots are consumed incrementally
+      articles: Iterator[ArticleDetail] = iter(
+          read_dataclass_snapshot_s3(ArticleDetail, uri))
+      first_article = next(articles, None)
+      if first_article is None:
         get_dagster_logger().warn(
             "Operation stopped early due to empty article detail results.")
         return
+      articles = chain([first_article], articles)
       # Init compound indexes for articles collection
       duty_db.articles.create_index([("postedAt", pymongo.ASCENDING),
                                      ("_id", pymongo.ASCENDING)])
       duty_db.articles.create_index([("category", pymongo.ASCENDING),
                                      ("postedAt", pymongo.ASCENDING),
                                      ("_id", pymongo.ASCENDING)])
+      # NOTE: Backfills legacy articles' normalized link, needed by the precheck
+      create_article_link_index(duty_db.articles)
+      write_mode = WriteModes(context.op_config["write_mode"])
       # Insert quests
       get_dagster_logger().info(
-          f"Total {article_count} {self.category} articles are going to be processed..."
-      )
-      insert_requests: list[InsertOne] = []
-      for idx, article in enumerate(articles):
-        quests: list[GeneratedQuest] = alchemy.generate_quests(article.content)
-        get_dagster_logger().info(
-            f"Generated {len(quests)} quests for article at: {article.link} ({idx+1})"
-        )
-        quest_schemas: list[QuestSchema] = [
-            standardize_quest(quest) for quest in quests
-        ]
-        article_schema = ArticleSchema(
-            title=article.title,
-            thumbnailURL=article.thumbnail_url,
-            content=article.content,
-            link=article.link,
-            author=article.author,
-            category=article.category,
-            subcategory=article.subcategory,
-            provider=self.provider,
-            providerAvatarURL=getattr(ProviderAvatars, self.provider.upper()),
-            quests=quest_schemas,
-            postedAt=format_datetime(article.posted_at),
-            createdAt=get_today_utc(),
-        )
-        insert_requests.append(InsertOne(article_schema.to_dict()))
-      error_count = 0
-      try:
-        duty_db.articles.bulk_write(insert_requests, ordered=False)
-      except BulkWriteError as bwe:
-        error_count = len(bwe.details["writeErrors"])
-        get_dagster_logger().error(bwe.details)
+          f"{self.category} articles of {uri} are going to be processed...")
+      write_requests: list[Union[InsertOne, UpdateOne]] = []
+      existing_count = 0
+      failed_count = 0
+      # NOTE: One $in query per batch of articles, the snapshot's size mostly
+      for batch in iter(lambda: list(islice(articles, PRECHECK_BATCH_SIZE)),
+                        []):
+        existing_links = find_existing_links(
+            duty_db.articles, [normalize_link(article.link) for article in batch])
+        new_articles: list[ArticleDetail] = []
+        for article in batch:
+          link = normalize_link(article.link)
+          if link in existing_links:
+            existing_count += 1
+            continue
+          existing_links.add(link)  # Repeated in the snapshot
+          new_articles.append(article)
+        # Concurrent requests, results in the articles' order
+        batch_quests = alchemy.generate_quests_many(
+            [article.content for article in new_articles])
+        for article, quests in zip(new_articles, batch_quests):
+          if quests is None:
+            # Not written, generated again by the next run
+            failed_count += 1
+            get_dagster_logger().warn(
+                f"Skipped article at: {article.link}, quest generation failed")
+            continue
+          get_dagster_logger().info(
+              f"Generated {len(quests)} quests for article at: {article.link} "
+              f"({len(write_requests)+1})")
+          quest_schemas: list[QuestSchema] = [
+              standardize_quest(quest) for quest in quests
+          ]
+          article_schema = ArticleSchema(
+              title=article.title,
+              thumbnailURL=article.thumbnail_url,
+              content=article.content,
+              link=article.link,
+              author=article.author,
+              category=article.category,
+              subcategory=article.subcategory,
+              provider=self.provider,
+              providerAvatarURL=getattr(ProviderAvatars,
+                                        self.provider.upper()),
+              quests=quest_schemas,
+              postedAt=format_datetime(article.posted_at),
+              createdAt=get_today_utc(),
+          )
+          write_requests.append(
+              build_article_write_request(article_schema.to_dict(),
+                                          write_mode))
+      get_dagster_logger().info(
+          f"Skipped {existing_count} articles already in 'articles' collection, "
+          f"{failed_count} failed quest generations.")
+      counts = bulk_write_articles(duty_db.articles, write_requests)
       get_dagster_logger().info(
-          f"Successfully inserted {article_count-error_count} documents to 'articles' collection."
-      )
+          f"Successfully wrote {counts.written_count}/{len(write_requests)} "
+          f"documents ({write_mode}) to 'articles' collection: "
+          f"{counts.existing_count} existing, {counts.duplicate_count} "
+          f"duplicates, {counts.error_count} errors.")
+      metadata = {
+          "article_count": existing_count + failed_count + len(write_requests),
+          "existing_count": existing_count,
+          "generated_count": len(write_requests),
+          "failed_generation_count": failed_count,
+          "written_count": counts.written_count,
+          "duplicate_count": counts.duplicate_count,
+          "error_count": counts.error_count,
+      }
+      if alchemy.cache is not None:
+        metadata["quest_cache_hit_count"] = alchemy.cache.stats.hit_count
+        metadata["quest_cache_hit_rate"] = alchemy.cache.stats.hit_rate
+      return Output(None, metadata=metadata)
 
     return _op
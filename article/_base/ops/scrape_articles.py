@@ -1,12 +1,30 @@
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Set
+from functools import partial
+from time import sleep
+from typing import Callable, Deque, Iterable, Iterator, Optional, Set
+from xml.etree.ElementTree import ParseError
 
+from dagster import In, OpDefinition, get_dagster_logger, op
 from dataclasses_json import DataClassJsonMixin
+from requests import RequestException
 from strenum import StrEnum
 
-from article._base.ops.base_op import BaseCategorizedOp
+from article._base.ops.base_op import (BaseCategorizedOp,
+                                       BaseCategorizedOpFactory)
+from article._base.resources.http import HttpClient
+from article._base.utils.cursor import ArticleCursor
+from article._base.utils.pipeline import ScrapePipeline
 from common.config.providers import Providers
+from common.errors.article import ArticleParseError
+from common.utils.feed import iter_feed_entries
+from common.utils.id import build_id
+from common.utils.rate_limit import AdaptiveHostRateLimiter
+from common.utils.seen_links import SeenLinks
+
+LINK_BATCH_SIZE = 20  # Links per batch of the dynamic scrape job (~ a listing page)
 
 
 @dataclass
@@ -32,6 +50,11 @@ class BaseScrapeArticlesOp(BaseCategorizedOp):
       required_resource_keys (Set[str] | None): Required Resource Keys of Dagster
       scrape_threshold (int): Threshold (Max Page) for scraping activity
       scrape_sleep_time (float): Delay between scrape activities
+      scrape_max_workers (int): Number of concurrent article fetches (1 for sequential)
+      scrape_prefetch_pages (int): Listing pages prefetched ahead in pipelined mode
+        (0 disables the pipeline)
+      article_parser (Callable[[str, str], ArticleDetail]): Picklable parser of
+        article's HTML, run in the run's parse pool when one is configured
   """
 
   def __init__(
@@ -40,11 +63,15 @@ class BaseScrapeArticlesOp(BaseCategorizedOp):
       provider: Providers,
       scrape_threshold: int,
       scrape_sleep_time: float,
+      scrape_max_workers: int = 1,
+      scrape_prefetch_pages: int = 0,
       required_resource_keys: Optional[Set[str]] = None,
   ) -> None:
     super().__init__(category, provider, required_resource_keys)
     self._scrape_threshold = scrape_threshold
     self._scrape_sleep_time = scrape_sleep_time
+    self._scrape_max_workers = scrape_max_workers
+    self._scrape_prefetch_pages = scrape_prefetch_pages
 
   @property
   def scrape_threshold(self) -> int:
@@ -54,10 +81,384 @@ class BaseScrapeArticlesOp(BaseCategorizedOp):
   def scrape_sleep_time(self) -> int:
     return self._scrape_sleep_time
 
+  @property
+  def scrape_max_workers(self) -> int:
+    return self._scrape_max_workers
+
+  @property
+  def scrape_prefetch_pages(self) -> int:
+    return self._scrape_prefetch_pages
+
+  @abstractmethod
+  def _scrape_links(self, http_client: HttpClient, page_url: str) -> list[str]:
+    pass
+
   @abstractmethod
-  def _scrape_links(self, page_url: str) -> list[str]:
+  def _fetch_article(self, http_client: HttpClient, article_url: str) -> str:
     pass
 
+  def _scrape_new_links(self, scrape_links: Callable[[str], list[str]],
+                        seen_links: Optional[SeenLinks],
+                        page_url: str) -> list[str]:
+    """Scrape links of a listing page, skipping the already stored ones
+
+    Args:
+        scrape_links (Callable[[str], list[str]]): Scrape links of a listing page
+        seen_links (SeenLinks | None): Index of already stored links
+        page_url (str): Page's url to scrape links
+
+    Returns:
+        list[str]: New links, empty if the page's links are all known (older pages
+          are assumed to be known as well) or if there is no page anymore
+    """
+    links = scrape_links(page_url)
+    if seen_links is None or len(links) == 0:
+      return links
+    new_links = [link for link in links if link not in seen_links]
+    if len(new_links) < len(links):
+      get_dagster_logger().info(
+          f"Skip {len(links) - len(new_links)}/{len(links)} known links "
+          f"at: {page_url}")
+    return new_links
+
+  @staticmethod
+  def _claim_pages(
+      page_urls: Iterable[str], scrape_links: Callable[[str], list[str]],
+      claimed_links: Set[str]
+  ) -> tuple[Iterable[str], Callable[[str], list[str]]]:
+    """Skip the links already claimed by another scrape of the run (e.g. an
+    article listed in several categories), then claim the remaining ones
+
+    Args:
+        page_urls (Iterable[str]): Pages' URLs in order
+        scrape_links (Callable[[str], list[str]]): Scrape links of a page
+        claimed_links (Set[str]): Links claimed by the run so far (updated)
+
+    Returns:
+        tuple[Iterable[str], Callable[[str], list[str]]]: Pages' URLs and their
+          unclaimed links' scraper. Pages are scraped while iterated, those having
+          claimed links only are skipped instead of ending the scrape.
+    """
+    unclaimed_links: dict[str, list[str]] = {}
+
+    def _iter_pages() -> Iterator[str]:
+      for page_url in page_urls:
+        links = scrape_links(page_url)
+        if len(links) == 0:
+          return  # No more page
+        links = [link for link in links if link not in claimed_links]
+        if len(links) == 0:
+          continue
+        claimed_links.update(links)
+        unclaimed_links[page_url] = links
+        yield page_url
+
+    return _iter_pages(), lambda page_url: unclaimed_links.pop(page_url, [])
+
+  def _discover_feed_links(self, http_client: HttpClient, feed_url: str,
+                           cursor: ArticleCursor) -> Optional[list[str]]:
+    """Discover new links from a RSS feed or a sitemap, dropping the links known
+    by the cursor before any article is fetched
+
+    Args:
+        http_client (HttpClient): Shared HTTP client
+        feed_url (str): RSS feed/sitemap's URL
+        cursor (ArticleCursor): Category's cursor
+
+    Returns:
+        list[str] | None: New links in feed's order, None if listing pages must be
+          scraped instead (feed is unavailable, or it does not reach back to the
+          cursor so that some new articles may be missing)
+    """
+    if cursor.watermark is None:
+      get_dagster_logger().info("No cursor yet, fallback to listing pages.")
+      return None
+    try:
+      entries = list(iter_feed_entries(http_client.get(feed_url).content))
+    except (RequestException, ParseError) as err:
+      get_dagster_logger().warning(
+          f"Feed at {feed_url} is unavailable, fallback to listing pages: {err}")
+      return None
+    new_links = [
+        entry.link
+        for entry in entries
+        if not cursor.is_known_link(entry.link, entry.published_at)
+    ]
+    if len(new_links) == len(entries):
+      get_dagster_logger().info(
+          f"Feed at {feed_url} does not reach the cursor, fallback to listing "
+          "pages.")
+      return None
+    get_dagster_logger().info(
+        f"Discover {len(new_links)}/{len(entries)} new links at: {feed_url}")
+    return new_links
+
+  @property
+  @abstractmethod
+  def article_parser(self) -> Callable[[str, str], ArticleDetail]:
+    """Module-level function parsing (html, article_url) into ArticleDetail, so
+    that it can be sent to worker processes
+    """
+
+  def _parse_article(self, article_url: str,
+                     parse_future: Future) -> Optional[ArticleDetail]:
+    """Wait for the parse of an article
+
+    Args:
+        article_url (str): Link to article
+        parse_future (Future): Parse submitted by `_fetch_article_for_parse`
+
+    Returns:
+        ArticleDetail | None: Article's detail, None if it cannot be parsed (e.g.
+          photo/video only articles)
+    """
+    try:
+      return parse_future.result()
+    except ArticleParseError as err:
+      get_dagster_logger().warning(f"Skip article: {err}")
+      return None
+
+  def _fetch_article_for_parse(
+      self,
+      http_client: HttpClient,
+      article_url: str,
+      parse_executor: Optional[Executor] = None) -> Future:
+    """Fetch an article and submit its parse without waiting for it
+
+    Args:
+        http_client (HttpClient): Shared HTTP client
+        article_url (str): Link to article
+        parse_executor (Executor, optional): Process pool parsing the HTML, parsed
+          in the calling thread if not specified.
+
+    Returns:
+        Future: Parse of the article's detail
+    """
+    html = self._fetch_article(http_client, article_url)
+    if parse_executor is not None:
+      # NOTE: Only the HTML goes to the worker, only the ArticleDetail comes back
+      return parse_executor.submit(self.article_parser, html, article_url)
+    parse_future: Future = Future()
+    try:
+      parse_future.set_result(self.article_parser(html, article_url))
+    except ArticleParseError as err:
+      parse_future.set_exception(err)
+    return parse_future
+
+  def _fetch_articles(
+      self,
+      http_client: HttpClient,
+      links: list[str],
+      executor: Optional[ThreadPoolExecutor] = None,
+      parse_executor: Optional[Executor] = None
+  ) -> Iterator[Optional[ArticleDetail]]:
+    """Fetch articles of a listing page in the same order as their links. Parses
+    run in the pool while the next articles are fetched.
+
+    Args:
+        http_client (HttpClient): Shared HTTP client (rate-limited per host)
+        links (list[str]): Article links of a listing page (newest first)
+        executor (ThreadPoolExecutor, optional): Executor for concurrent fetching,
+          articles are fetched sequentially with a fixed delay if not specified.
+        parse_executor (Executor, optional): Process pool parsing the HTML
+
+    Yields:
+        ArticleDetail | None: Article's detail (None if it cannot be parsed),
+          ordered as the input links
+    """
+    fetch_article = partial(self._fetch_article_for_parse,
+                            http_client,
+                            parse_executor=parse_executor)
+    if executor is not None:
+      # NOTE: Closing the map's iterator cancels the pending fetches past the cursor
+      parse_futures = executor.map(fetch_article, links)
+      try:
+        for link, parse_future in zip(links, parse_futures):
+          yield self._parse_article(link, parse_future)
+      finally:
+        parse_futures.close()
+      return
+    pending: Deque[tuple[str, Future]] = deque()
+    try:
+      for link in links:
+        pending.append((link, fetch_article(link)))
+        while len(pending) > 0 and pending[0][1].done():
+          yield self._parse_article(*pending.popleft())
+        if not isinstance(http_client.rate_limiter, AdaptiveHostRateLimiter):
+          sleep(self.scrape_sleep_time)  # Delay scraper (adaptive limit paces)
+      while len(pending) > 0:
+        yield self._parse_article(*pending.popleft())
+    finally:
+      for _, parse_future in pending:
+        parse_future.cancel()
+
+  def _scrape_articles(
+      self,
+      http_client: HttpClient,
+      page_urls: Iterable[str],
+      parse_executor: Optional[Executor] = None,
+      seen_links: Optional[SeenLinks] = None,
+      scrape_links: Optional[Callable[[str], list[str]]] = None
+  ) -> Iterator[ArticleDetail]:
+    """Scrape articles of listing pages, newest first. Closing the iterator (e.g.
+    when the cursor is reached) cancels the remaining work.
+
+    Args:
+        http_client (HttpClient): Shared HTTP client
+        page_urls (Iterable[str]): Listing pages' URLs in order
+        parse_executor (Executor, optional): Run's process pool parsing articles'
+          HTML, parsed in the fetching threads if not specified.
+        seen_links (SeenLinks, optional): Index of already stored links, skipped
+          without being fetched. Scraping stops at a page of known links only.
+        scrape_links (Callable[[str], list[str]], optional): Scrape links of a page,
+          defaults to the listing pages' scraper.
+
+    Yields:
+        ArticleDetail: Article's detail
+    """
+    scrape_new_links = partial(
+        self._scrape_new_links, scrape_links or
+        partial(self._scrape_links, http_client), seen_links)
+    executor: Optional[ThreadPoolExecutor] = None
+    articles: Iterator[Optional[ArticleDetail]]
+    try:
+      if self.scrape_prefetch_pages > 0:
+        pipeline = ScrapePipeline(
+            scrape_links=scrape_new_links,
+            fetch_article=partial(self._fetch_article_for_parse,
+                                  http_client,
+                                  parse_executor=parse_executor),
+            parse_article=self._parse_article,
+            max_workers=self.scrape_max_workers,
+            prefetch_pages=self.scrape_prefetch_pages)
+        articles = pipeline.run(page_urls)
+      else:
+        if self.scrape_max_workers > 1:
+          executor = ThreadPoolExecutor(max_workers=self.scrape_max_workers)
+        articles = self._scrape_pages(http_client, page_urls, scrape_new_links,
+                                      executor, parse_executor)
+      try:
+        yield from (article for article in articles if article is not None)
+      finally:
+        articles.close()
+    finally:
+      if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+  def _scrape_pages(
+      self, http_client: HttpClient, page_urls: Iterable[str],
+      scrape_links: Callable[[str], list[str]],
+      executor: Optional[ThreadPoolExecutor],
+      parse_executor: Optional[Executor]) -> Iterator[Optional[ArticleDetail]]:
+    """Scrape articles page by page (not pipelined)
+    """
+    for page_url in page_urls:
+      links = scrape_links(page_url)
+      if len(links) == 0:
+        break
+      yield from self._fetch_articles(http_client, links, executor,
+                                      parse_executor)
+
+  def _discover_link_batches(
+      self,
+      http_client: HttpClient,
+      page_urls: Iterable[str],
+      cursor: ArticleCursor,
+      seen_links: Optional[SeenLinks] = None,
+      scrape_links: Optional[Callable[[str], list[str]]] = None
+  ) -> Iterator[list[str]]:
+    """Discover new links in batches (per listing page) without fetching articles.
+    Discovery stops at a page holding a link known by the cursor or the index.
+
+    Args:
+        http_client (HttpClient): Shared HTTP client
+        page_urls (Iterable[str]): Listing pages' URLs in order
+        cursor (ArticleCursor): Category's cursor
+        seen_links (SeenLinks, optional): Index of already stored links
+        scrape_links (Callable[[str], list[str]], optional): Scrape links of a page,
+          defaults to the listing pages' scraper.
+
+    Yields:
+        list[str]: Batch of new links, newest first
+    """
+    scrape_new_links = partial(
+        self._scrape_new_links, scrape_links or
+        partial(self._scrape_links, http_client), seen_links)
+    for page_url in page_urls:
+      links = scrape_new_links(page_url)
+      new_links = [
+          link for link in links if not cursor.is_known_link(link, None)
+      ]
+      for idx in range(0, len(new_links), LINK_BATCH_SIZE):
+        yield new_links[idx:idx + LINK_BATCH_SIZE]
+      if len(new_links) == 0 or len(new_links) < len(links):
+        break  # No more page or the cursor is reached
+
+  def _scrape_link_batch(self,
+                         http_client: HttpClient,
+                         links: list[str],
+                         cursor: ArticleCursor,
+                         parse_executor: Optional[Executor] = None
+                        ) -> list[ArticleDetail]:
+    """Scrape a batch of links, dropping the articles known by the cursor
+
+    Args:
+        http_client (HttpClient): Shared HTTP client
+        links (list[str]): Batch of links
+        cursor (ArticleCursor): Category's cursor
+        parse_executor (Executor, optional): Run's process pool parsing articles'
+          HTML
+
+    Returns:
+        list[ArticleDetail]: Scraped articles
+    """
+    articles = self._scrape_articles(http_client, [""],
+                                     parse_executor=parse_executor,
+                                     scrape_links=lambda _: links)
+    return [article for article in articles if not cursor.is_known(article)]
+
+  def build_collect_articles(self, **kwargs) -> OpDefinition:
+    """Build the op collecting scraped batches of the dynamic scrape job
+
+    Returns:
+        OpDefinition: Dagster's Op Definition
+    """
+
+    @op(name=build_id(provider=self.provider,
+                      identifier=f"collect_{self.category}_articles_op"),
+        ins={"article_batches": In(dagster_type=list[list[ArticleDetail]])},
+        **kwargs)
+    def _op(article_batches: list[list[ArticleDetail]]) -> list[ArticleDetail]:
+      """Merge scraped batches into one list of articles, newest first
+
+      Args:
+          article_batches (list[list[ArticleDetail]]): Scraped batches
+
+      Returns:
+          list[ArticleDetail]: Unique articles (by link), newest first
+      """
+      articles = {}
+      for batch in article_batches:
+        for article in batch:
+          articles.setdefault(article.link, article)  # Cross-listed articles
+      # NOTE: Posted time strings sort chronologically, unknown ones go last
+      collected = sorted(articles.values(),
+                         key=lambda article: article.posted_at or '',
+                         reverse=True)
+      get_dagster_logger().info(
+          f"Total {self.category} articles collected: {len(collected)}")
+      return collected
+
+    return _op
+
+
+class BaseScrapeArticlesOpFactory(BaseCategorizedOpFactory):
+  """Base factory of Scrape Articles ops, including the ops of the dynamic scrape
+  job (discover link batches -> scrape each batch -> collect)
+  """
+
   @abstractmethod
-  def _scrape_article(self, article_url: str) -> ArticleDetail:
+  def create_dynamic_ops(
+      self, category: StrEnum,
+      **kwargs) -> tuple[OpDefinition, OpDefinition, OpDefinition]:
     pass
@@ -1,10 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Optional
 
 import requests
-from dagster import ResourceDefinition, resource
+from dagster import ResourceDefinition, get_dagster_logger, resource
 from dataclasses_json import DataClassJsonMixin
+from pymongo.database import Database
+from requests.adapters import HTTPAdapter
 
 from common.config.env import EnvVariables
+from common.config.resource_keys import ResourceKeys
+from common.utils.quest_cache import QuestCache
 
 
 @dataclass
@@ -19,39 +25,225 @@ class GeneratedQuest(DataClassJsonMixin):
 
 class AlchemyClient:
   """Alchemy Client for API calls, and many more interaction methods!
+
+    Description:
+      Requests share a pooled session (keep-alive connections). Quests of several
+      contents are generated concurrently, with at most `max_in_flight` requests
+      at once. If batching is enabled, contents are packed into batch requests of
+      at most `batch_max_chars` characters (a longer content goes alone), so that
+      the model server fills its inference batches. When the API has no batch
+      endpoint, or a batch fails, contents are requested one by one. Quests found
+      in the cache (by content's hash) are not generated again.
+
+  Attributes:
+      api_url (str): Alchemy API's URL
+      max_in_flight (int): Maximum concurrent requests
+      timeout (float): Request's timeout in seconds
+      batch_max_chars (int): Maximum characters of a batch request, 0 disables
+        batching
+      cache (QuestCache | None): Persistent cache of generated quests
   """
 
-  def __init__(self) -> None:
+  def __init__(self,
+               max_in_flight: int = 1,
+               timeout: float = 180,
+               batch_max_chars: int = 0,
+               cache: Optional[QuestCache] = None) -> None:
     self._api_url: str = EnvVariables.ALCHEMY_API_URL
+    self._max_in_flight = max_in_flight
+    self._timeout = timeout
+    self._batch_max_chars = batch_max_chars
+    self._cache = cache
+    self._is_batch_supported = batch_max_chars > 0
+    self._session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+    self._session.mount("http://", adapter)
+    self._session.mount("https://", adapter)
+    self._executor = ThreadPoolExecutor(max_workers=max_in_flight,
+                                        thread_name_prefix="alchemy")
 
   @property
   def api_url(self) -> str:
     return self._api_url
 
+  @property
+  def max_in_flight(self) -> int:
+    return self._max_in_flight
+
+  @property
+  def timeout(self) -> float:
+    return self._timeout
+
+  @property
+  def batch_max_chars(self) -> int:
+    return self._batch_max_chars
+
+  @property
+  def cache(self) -> Optional[QuestCache]:
+    return self._cache
+
   def get_questgen_endpoint(self) -> str:
     """Get quest generation endpoint from Alchemy API
     """
     return f"{self.api_url}/questgen"
 
+  def get_questgen_batch_endpoint(self) -> str:
+    """Get batch quest generation endpoint from Alchemy API
+    """
+    return f"{self.api_url}/questgen/batch"
+
   def generate_quests(self, content: str) -> list[GeneratedQuest]:
     """Generate list of quests from input content
 
     Args:
         content (str): Content of articles/books/etc.
 
+    Raises:
+        requests.RequestException: Failed request
+
     Returns:
         list[GeneratedQuest]: List of quests
     """
     payload = {"content": content}
     questgen_endpoint = self.get_questgen_endpoint()
-    resp_text = requests.post(url=questgen_endpoint, json=payload,
-                              timeout=180).text
-    quests = GeneratedQuest.schema().loads(resp_text, many=True)
+    resp = self._session.post(url=questgen_endpoint,
+                              json=payload,
+                              timeout=self.timeout)
+    resp.raise_for_status()
+    quests = GeneratedQuest.schema().loads(resp.text, many=True)
     return quests
 
+  def _try_generate_quests(self,
+                           content: str) -> Optional[list[GeneratedQuest]]:
+    try:
+      return self.generate_quests(content)
+    except Exception as err:  # pylint: disable=broad-except
+      get_dagster_logger().error(f"Failed to generate quests: {err}")
+      return None
+
+  def generate_quests_batch(
+      self, contents: list[str]) -> Optional[list[list[GeneratedQuest]]]:
+    """Generate lists of quests from several contents in one request
+
+    Args:
+        contents (list[str]): Contents of articles/books/etc.
+
+    Raises:
+        requests.RequestException: Failed request
+        ValueError: Results do not match the contents
+
+    Returns:
+        list[list[GeneratedQuest]] | None: Quests of each content in the same
+          order, None if the API has no batch endpoint
+    """
+    payload = {"contents": contents}
+    resp = self._session.post(url=self.get_questgen_batch_endpoint(),
+                              json=payload,
+                              timeout=self.timeout)
+    if resp.status_code in (404, 405):
+      return None
+    resp.raise_for_status()
+    results = resp.json()
+    if len(results) != len(contents):
+      raise ValueError(
+          f"Got {len(results)} results for a batch of {len(contents)} contents")
+    return [GeneratedQuest.schema().load(quests, many=True) for quests in results]
+
+  def _try_generate_quests_batch(
+      self, contents: list[str]) -> list[Optional[list[GeneratedQuest]]]:
+    if self._is_batch_supported:
+      try:
+        results = self.generate_quests_batch(contents)
+        if results is not None:
+          return results
+        self._is_batch_supported = False
+        get_dagster_logger().warn(
+            "Alchemy API has no batch endpoint, generating quests one by one.")
+      except Exception as err:  # pylint: disable=broad-except
+        get_dagster_logger().error(
+            f"Failed to generate quests of a batch of {len(contents)} contents, "
+            f"retrying one by one: {err}")
+    return [self._try_generate_quests(content) for content in contents]
+
+  def _pack_batches(self, contents: list[str]) -> list[list[str]]:
+    """Pack contents in order into batches of at most the maximum characters
+    """
+    batches: list[list[str]] = []
+    batch_chars = 0
+    for content in contents:
+      if len(batches) == 0 or batch_chars + len(content) > self.batch_max_chars:
+        batches.append([])
+        batch_chars = 0
+      batches[-1].append(content)
+      batch_chars += len(content)
+    return batches
+
+  def _generate_quests_uncached(
+      self, contents: list[str]) -> list[Optional[list[GeneratedQuest]]]:
+    if not self._is_batch_supported:
+      return list(self._executor.map(self._try_generate_quests, contents))
+    return [
+        quests for batch_quests in self._executor.map(
+            self._try_generate_quests_batch, self._pack_batches(contents))
+        for quests in batch_quests
+    ]
+
+  def generate_quests_many(
+      self, contents: list[str]) -> list[Optional[list[GeneratedQuest]]]:
+    """Generate quests of several contents concurrently (bounded by the maximum
+    in-flight requests), by batches if supported, skipping the cached ones
+
+    Args:
+        contents (list[str]): Contents of articles/books/etc.
+
+    Returns:
+        list[list[GeneratedQuest] | None]: Quests of each content in the same
+          order, None for a failed one (logged)
+    """
+    if self.cache is None:
+      return self._generate_quests_uncached(contents)
+    keys = [self.cache.build_key(content) for content in contents]
+    cached = self.cache.get_many(list(dict.fromkeys(keys)))
+    # Contents repeated in the call are generated once
+    missing = {key: content for key, content in zip(keys, contents)
+               if key not in cached}
+    generated = dict(
+        zip(missing, self._generate_quests_uncached(list(missing.values()))))
+    self.cache.put_many({
+        key: [quest.to_dict() for quest in quests]
+        for key, quests in generated.items()
+        if quests is not None
+    })
+    return [
+        generated[key] if key in generated else
+        [GeneratedQuest.from_dict(quest) for quest in cached[key]]
+        for key in keys
+    ]
+
+  def close(self) -> None:
+    self._executor.shutdown(wait=True)
+    self._session.close()
+
 
-@resource()
-def get_alchemy_client() -> ResourceDefinition:
+@resource(required_resource_keys={str(ResourceKeys.DUTY_MONGO_CLIENT)})
+def get_alchemy_client(init_context) -> ResourceDefinition:
   """Get Alchemy client to interact with the API intuitively
   """
-  return AlchemyClient()
+  cache: Optional[QuestCache] = None
+  if EnvVariables.QUEST_CACHE_ENABLED.lower() == "true":
+    duty_db: Database = getattr(init_context.resources,
+                                ResourceKeys.DUTY_MONGO_CLIENT)
+    cache = QuestCache(duty_db[EnvVariables.QUEST_CACHE_COLLECTION],
+                       model_version=EnvVariables.ALCHEMY_MODEL_VERSION,
+                       ttl=float(EnvVariables.QUEST_CACHE_TTL),
+                       max_entries=int(EnvVariables.QUEST_CACHE_MAX_ENTRIES))
+  client = AlchemyClient(
+      max_in_flight=int(EnvVariables.ALCHEMY_MAX_IN_FLIGHT),
+      batch_max_chars=int(EnvVariables.ALCHEMY_BATCH_MAX_CHARS),
+      cache=cache)
+  try:
+    yield client
+  finally:
+    if cache is not None:
+      get_dagster_logger().info(f"Alchemy quest cache: {cache.stats.summary()}")
+    client.close()
@@ -0,0 +1,329 @@
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep, time
+from typing import Optional
+
+import requests
+from dagster import ResourceDefinition, get_dagster_logger, resource
+from requests.adapters import HTTPAdapter
+
+from common.config.env import EnvVariables
+from common.utils.http_cache import HttpCache
+from common.utils.rate_limit import AdaptiveHostRateLimiter, HostRateLimiter
+from common.utils.shared_rate_limit import (BaseSharedTokenBuckets,
+                                            FileSharedTokenBuckets,
+                                            PostgresSharedTokenBuckets)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(resp: requests.Response) -> Optional[float]:
+  """Parse the Retry-After header (seconds or HTTP date) of a response
+
+  Args:
+      resp (requests.Response): Response
+
+  Returns:
+      float | None: Requested delay in seconds, None if missing or invalid
+  """
+  retry_after = resp.headers.get("Retry-After")
+  if retry_after is None:
+    return None
+  if retry_after.isdigit():
+    return float(retry_after)
+  try:
+    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time())
+  except (TypeError, ValueError):
+    return None
+
+
+@dataclass
+class HttpClientStats:
+  """Request statistics of a HTTP client
+  """
+  request_count: int = 0
+  retry_count: int = 0
+  error_count: int = 0
+  total_latency: float = 0.0
+  max_latency: float = 0.0
+  cache_hit_count: int = 0
+  cache_miss_count: int = 0
+
+  @property
+  def mean_latency(self) -> float:
+    if self.request_count == 0:
+      return 0.0
+    return self.total_latency / self.request_count
+
+  def summary(self) -> str:
+    return (f"{self.request_count} requests, {self.retry_count} retries, "
+            f"{self.error_count} errors, latency mean {self.mean_latency:.3f}s "
+            f"/ max {self.max_latency:.3f}s, cache {self.cache_hit_count} hits "
+            f"/ {self.cache_miss_count} misses")
+
+
+class HttpClient:
+  """Pooled HTTP client shared by scrapers, with keep-alive connections, timeouts,
+  retries (exponential backoff with jitter on 5xx/429), per-host rate limit and an
+  optional conditional-GET cache
+
+  Attributes:
+      name (str): Client's name used in logs
+      connect_timeout (float): Connect timeout in seconds
+      read_timeout (float): Read timeout in seconds
+      max_retries (int): Maximum retries of a request
+      backoff_factor (float): Base delay (seconds) of the exponential backoff
+      rate_limiter (HostRateLimiter | None): Per-host rate limiter
+      cache (HttpCache | None): Persistent cache revalidated with conditional requests
+      stats (HttpClientStats): Request statistics
+  """
+
+  def __init__(self,
+               name: str,
+               pool_maxsize: int,
+               connect_timeout: float,
+               read_timeout: float,
+               max_retries: int,
+               backoff_factor: float,
+               rate_limiter: Optional[HostRateLimiter] = None,
+               cache: Optional[HttpCache] = None) -> None:
+    self._name = name
+    self._connect_timeout = connect_timeout
+    self._read_timeout = read_timeout
+    self._max_retries = max_retries
+    self._backoff_factor = backoff_factor
+    self._rate_limiter = rate_limiter
+    self._cache = cache
+    self._stats = HttpClientStats()
+    self._stats_lock = Lock()
+    self._session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_maxsize,
+                          pool_maxsize=pool_maxsize,
+                          max_retries=0)
+    self._session.mount("http://", adapter)
+    self._session.mount("https://", adapter)
+
+  @property
+  def name(self) -> str:
+    return self._name
+
+  @property
+  def connect_timeout(self) -> float:
+    return self._connect_timeout
+
+  @property
+  def read_timeout(self) -> float:
+    return self._read_timeout
+
+  @property
+  def max_retries(self) -> int:
+    return self._max_retries
+
+  @property
+  def backoff_factor(self) -> float:
+    return self._backoff_factor
+
+  @property
+  def rate_limiter(self) -> Optional[HostRateLimiter]:
+    return self._rate_limiter
+
+  @property
+  def cache(self) -> Optional[HttpCache]:
+    return self._cache
+
+  @property
+  def stats(self) -> HttpClientStats:
+    return self._stats
+
+  def _record(self, latency: float, is_retry: bool, is_error: bool) -> None:
+    with self._stats_lock:
+      self._stats.request_count += 1
+      self._stats.total_latency += latency
+      self._stats.max_latency = max(self._stats.max_latency, latency)
+      if is_retry:
+        self._stats.retry_count += 1
+      if is_error:
+        self._stats.error_count += 1
+
+  def _record_cache(self, is_hit: bool) -> None:
+    with self._stats_lock:
+      if is_hit:
+        self._stats.cache_hit_count += 1
+      else:
+        self._stats.cache_miss_count += 1
+
+  def _backoff_delay(self, attempt: int,
+                     resp: Optional[requests.Response]) -> float:
+    """Compute delay before the next attempt
+
+    Args:
+        attempt (int): Index of the failed attempt (0-based)
+        resp (requests.Response | None): Failed response if any
+
+    Returns:
+        float: Delay in seconds
+    """
+    delay = self.backoff_factor * (2**attempt)
+    delay += uniform(0, self.backoff_factor)  # Jitter
+    if resp is not None:
+      retry_after = parse_retry_after(resp)
+      if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+  def _send(self, url: str, **kwargs) -> requests.Response:
+    """Send a GET request with retries
+
+    Args:
+        url (str): Requested URL
+
+    Raises:
+        requests.HTTPError: Retryable status persisted after all retries
+        requests.RequestException: Connection error persisted after all retries
+
+    Returns:
+        requests.Response: Response
+    """
+    kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+    for attempt in range(self.max_retries + 1):
+      if self.rate_limiter is not None:
+        self.rate_limiter.acquire(url)
+      resp: Optional[requests.Response] = None
+      start_time = monotonic()
+      try:
+        resp = self._session.get(url, **kwargs)
+      except (requests.ConnectionError, requests.Timeout) as err:
+        latency = monotonic() - start_time
+        self._record(latency, is_retry=attempt > 0, is_error=True)
+        get_dagster_logger().warning(
+            f"GET {url} failed after {latency:.3f}s ({attempt+1}): {err}")
+        if attempt == self.max_retries:
+          raise err
+      else:
+        latency = monotonic() - start_time
+        is_retryable = resp.status_code in RETRY_STATUS_CODES
+        self._record(latency, is_retry=attempt > 0, is_error=is_retryable)
+        get_dagster_logger().debug(
+            f"GET {url} {resp.status_code} in {latency:.3f}s")
+        if not is_retryable:
+          return resp
+        if attempt == self.max_retries:
+          resp.raise_for_status()
+      finally:
+        if self.rate_limiter is not None:
+          # Feedback for adaptive limits, failed requests have no status
+          self.rate_limiter.release(
+              url, monotonic() - start_time,
+              None if resp is None else resp.status_code,
+              None if resp is None else parse_retry_after(resp))
+      sleep(self._backoff_delay(attempt, resp))
+    return resp
+
+  def get(self, url: str, **kwargs) -> requests.Response:
+    """Send a GET request, revalidating the cached response if there is one
+
+    Args:
+        url (str): Requested URL
+
+    Returns:
+        requests.Response: Response (the cached one if not modified)
+    """
+    if self.cache is None:
+      return self._send(url, **kwargs)
+    cached = self.cache.get(url)
+    if cached is not None:
+      kwargs["headers"] = {
+          **(kwargs.get("headers") or {}),
+          **cached.conditional_headers()
+      }
+    resp = self._send(url, **kwargs)
+    if resp.status_code == 304 and cached is not None:
+      self._record_cache(is_hit=True)
+      self.cache.refresh(url)
+      return cached.to_response()
+    self._record_cache(is_hit=False)
+    if resp.status_code == 200:
+      self.cache.put(url, resp)
+    return resp
+
+  def close(self) -> None:
+    self._session.close()
+    if self.cache is not None:
+      self.cache.close()
+
+
+def _build_shared_buckets() -> Optional[BaseSharedTokenBuckets]:
+  """Build the token buckets shared by all runs from env vars
+
+  Raises:
+      ValueError: Unknown backend
+
+  Returns:
+      BaseSharedTokenBuckets | None: Shared buckets, None if disabled
+  """
+  if not EnvVariables.SHARED_RATE_LIMIT:
+    return None
+  rate = float(EnvVariables.SHARED_RATE_LIMIT)
+  if EnvVariables.SHARED_RATE_BACKEND == "postgres":
+    return PostgresSharedTokenBuckets(EnvVariables.SHARED_RATE_POSTGRES_URI,
+                                      rate)
+  if EnvVariables.SHARED_RATE_BACKEND == "file":
+    return FileSharedTokenBuckets(EnvVariables.SHARED_RATE_FILE, rate)
+  raise ValueError(
+      f"Unknown shared rate limit backend: {EnvVariables.SHARED_RATE_BACKEND}")
+
+
+def build_http_client_resource(provider: str, **kwargs) -> ResourceDefinition:
+  """Build a pooled HTTP client resource for the specified provider
+
+  Args:
+      provider (str): Provider
+
+  Returns:
+      ResourceDefinition: Dagster's Resource definition
+  """
+
+  @resource(**kwargs)
+  def _resource():
+    """[Provider]'s HTTP client shared by the ops of a run
+    """
+    cache: Optional[HttpCache] = None
+    if EnvVariables.HTTP_CACHE_DIR:
+      cache = HttpCache(path=f"{EnvVariables.HTTP_CACHE_DIR}/{provider}.sqlite",
+                        max_bytes=int(EnvVariables.HTTP_CACHE_MAX_BYTES),
+                        ttl=float(EnvVariables.HTTP_CACHE_TTL))
+    shared_buckets = _build_shared_buckets()
+    rate_limiter = HostRateLimiter(float(EnvVariables.SCRAPE_RATE_LIMIT),
+                                   shared_buckets=shared_buckets)
+    if EnvVariables.SCRAPE_ADAPTIVE_RATE.lower() == "true":
+      rate_limiter = AdaptiveHostRateLimiter(
+          float(EnvVariables.SCRAPE_RATE_LIMIT),
+          shared_buckets=shared_buckets,
+          min_rate=float(EnvVariables.SCRAPE_MIN_RATE),
+          max_rate=float(EnvVariables.SCRAPE_MAX_RATE),
+          min_concurrency=int(EnvVariables.SCRAPE_MIN_CONCURRENCY),
+          max_concurrency=int(EnvVariables.SCRAPE_MAX_CONCURRENCY),
+          target_latency=float(EnvVariables.SCRAPE_TARGET_LATENCY),
+          increase_step=float(EnvVariables.SCRAPE_RATE_INCREASE),
+          decrease_factor=float(EnvVariables.SCRAPE_RATE_DECREASE),
+          error_rate_threshold=float(EnvVariables.SCRAPE_ERROR_RATE_THRESHOLD))
+    client = HttpClient(name=provider,
+                        pool_maxsize=int(EnvVariables.HTTP_POOL_MAXSIZE),
+                        connect_timeout=float(EnvVariables.HTTP_CONNECT_TIMEOUT),
+                        read_timeout=float(EnvVariables.HTTP_READ_TIMEOUT),
+                        max_retries=int(EnvVariables.HTTP_MAX_RETRIES),
+                        backoff_factor=float(EnvVariables.HTTP_BACKOFF_FACTOR),
+                        rate_limiter=rate_limiter,
+                        cache=cache)
+    try:
+      yield client
+    finally:
+      get_dagster_logger().info(
+          f"{provider} HTTP client: {client.stats.summary()}, rate limit "
+          f"{rate_limiter.summary()}")
+      client.close()
+      rate_limiter.close()
+
+  return _resource
@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from dagster import ResourceDefinition, resource
+
+from common.config.env import EnvVariables
+
+
+def build_parse_pool_resource(provider: str, parser_module: str,
+                              **kwargs) -> ResourceDefinition:
+  """Build the process pool parsing articles' HTML for the specified provider,
+  created once per run and shared by its scrape ops (batches of links included)
+
+  Args:
+      provider (str): Provider
+      parser_module (str): Module of the provider's article parser, preloaded by
+        the pool's workers
+
+  Returns:
+      ResourceDefinition: Dagster's Resource definition
+  """
+
+  @resource(**kwargs)
+  def _resource():
+    """[Provider]'s parse pool, None if SCRAPE_PARSE_WORKERS is 0 (articles are
+    parsed in the fetching threads)
+    """
+    parse_workers = int(EnvVariables.SCRAPE_PARSE_WORKERS)
+    if parse_workers <= 0:
+      yield None
+      return
+    # NOTE: Forking a process running the fetching threads is unsafe, workers are
+    # forked from a server which imports the parser's module only once
+    mp_context = get_context("forkserver")
+    mp_context.set_forkserver_preload([parser_module])
+    parse_executor = ProcessPoolExecutor(max_workers=parse_workers,
+                                         mp_context=mp_context)
+    try:
+      yield parse_executor
+    finally:
+      parse_executor.shutdown(wait=True, cancel_futures=True)
+
+  return _resource
@@ -0,0 +1,56 @@
+from dagster import ResourceDefinition, get_dagster_logger, resource
+
+from common.config.env import EnvVariables
+from common.config.resource_keys import ResourceKeys
+from common.utils.resource import build_resource_key
+from common.utils.s3 import read_bytes_file_s3, write_bytes_file_s3
+from common.utils.seen_links import SeenLinks
+
+
+def _read_seen_links(uri: str) -> SeenLinks:
+  """Read the seen links' index from S3, an empty one if it does not exist yet
+  """
+  capacity = int(EnvVariables.SEEN_LINKS_CAPACITY)
+  error_rate = float(EnvVariables.SEEN_LINKS_ERROR_RATE)
+  try:
+    data = read_bytes_file_s3(uri)
+  except OSError:
+    get_dagster_logger().info(f"Initializing {uri} as file did not exist in prior.")
+    return SeenLinks(capacity, error_rate)
+  return SeenLinks.from_bytes(data, capacity, error_rate)
+
+
+def build_seen_links_resource(provider: str, **kwargs) -> ResourceDefinition:
+  """Build the index of already stored articles' links for the specified provider,
+  stored next to the cursors file and shared by all categories
+
+  Args:
+      provider (str): Provider
+
+  Returns:
+      ResourceDefinition: Dagster's Resource definition
+  """
+
+  s3_resource_key = build_resource_key(provider, ResourceKeys.S3_RESOURCE_URI)
+
+  @resource(required_resource_keys={s3_resource_key}, **kwargs)
+  def _resource(context):
+    """[Provider]'s seen links, written back to S3 if links were added
+
+    Args:
+        context: Dagster Context object
+    """
+    s3_resource = getattr(context.resources, s3_resource_key)
+    uri = f"{s3_resource}/{EnvVariables.SEEN_LINKS_FILENAME}"
+    seen_links = _read_seen_links(uri)
+    try:
+      yield seen_links
+    finally:
+      if seen_links.is_modified:
+        # NOTE: Merge links stored by concurrent runs (other categories) meanwhile
+        seen_links.merge(_read_seen_links(uri))
+        write_bytes_file_s3(seen_links.to_bytes(), uri)
+        get_dagster_logger().info(
+            f"Save {uri} successfully ({len(seen_links)} links).")
+
+  return _resource
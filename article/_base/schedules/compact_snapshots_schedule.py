@@ -0,0 +1,66 @@
+from datetime import timedelta
+from typing import Optional
+
+import pytz
+from dagster import (DefaultScheduleStatus, JobDefinition, RunRequest,
+                     ScheduleDefinition, get_dagster_logger, schedule)
+
+from article._base.schedules.base_schedule import BaseSchedule
+from common.config.date_formats import DateFormats
+from common.config.env import EnvVariables
+from common.config.providers import Providers
+from common.utils.date import format_datetime_str
+from common.utils.id import build_id
+
+
+class BaseCompactSnapshotsSchedule(BaseSchedule):
+  """Base Compact Snapshots Schedule, compacting the previous day (UTC)
+  """
+
+  def __init__(self,
+               provider: Providers,
+               cron_schedule: str,
+               job: JobDefinition,
+               default_status: DefaultScheduleStatus,
+               execution_timezone: Optional[str] = None) -> None:
+    super().__init__(provider=provider,
+                     cron_schedule=cron_schedule,
+                     job=job,
+                     default_status=default_status,
+                     execution_timezone=execution_timezone)
+
+  def build(self, **kwargs) -> ScheduleDefinition:
+    """Build a Schedule for Compacting Snapshots
+
+    Returns:
+        ScheduleDefinition: Dagster's Schedule Definition
+    """
+
+    @schedule(name=build_id(self.provider, "compact_snapshots_schedule"),
+              cron_schedule=self.cron_schedule,
+              job=self.job,
+              execution_timezone=self.execution_timezone,
+              default_status=self.default_status,
+              **kwargs)
+    def _schedule(context) -> RunRequest:
+      compacted_date = format_datetime_str(
+          context.scheduled_execution_time.astimezone(pytz.utc) -
+          timedelta(days=1), DateFormats.YYYYMMDD)
+      get_dagster_logger().info(
+          f"Trigger schedule of compacting {self.provider} snapshots of "
+          f"{compacted_date}.")
+      op_config = {
+          "date": compacted_date,
+          "expire_originals": EnvVariables.SNAPSHOT_EXPIRE_ORIGINALS.lower() == "true"
+      }
+      return RunRequest(run_key=None,
+                        run_config={
+                            "ops": {
+                                node_def.name: {
+                                    "config": op_config
+                                } for node_def in self.job.graph.node_defs
+                            }
+                        },
+                        tags={"date": compacted_date})
+
+    return _schedule
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from common.utils.date import format_datetime, format_datetime_str
+from common.utils.link import hash_link
+
+if TYPE_CHECKING:
+  from article._base.ops.scrape_articles import ArticleDetail
+
+
+def link_hash_hex(link: str) -> str:
+  """Hex digest of article's normalized link, as stored in cursors
+  """
+  return hash_link(link).hex()
+
+
+class ArticleCursor:
+  """High-watermark cursor of a category: the latest posted time of the stored
+  articles along with the hashes of the last stored links.
+
+    Description:
+      Listing pages are ordered newest first, so an article posted before the
+      watermark, or one of the last stored articles, marks the end of new articles.
+      It does not rely on a single article which may be deleted or edited since.
+
+  Attributes:
+      watermark (str | None): Latest posted time of stored articles
+      link_hashes (list[str]): Hashes of the last stored links, newest first
+  """
+
+  def __init__(self,
+               watermark: Optional[str] = None,
+               link_hashes: Optional[list[str]] = None) -> None:
+    self._watermark = watermark
+    self._link_hashes = list(link_hashes or [])
+    self._watermark_dt: Optional[datetime] = (None if watermark is None else
+                                              format_datetime(watermark))
+    self._link_hash_set = set(self._link_hashes)
+
+  @property
+  def watermark(self) -> Optional[str]:
+    return self._watermark
+
+  @property
+  def link_hashes(self) -> list[str]:
+    return self._link_hashes
+
+  @property
+  def watermark_dt(self) -> Optional[datetime]:
+    return self._watermark_dt
+
+  def is_known_link(self, link: str, posted_at: Optional[datetime]) -> bool:
+    """Check if a link was reached by a previous scrape
+
+    Args:
+        link (str): Article's link
+        posted_at (datetime | None): Article's posted time (naive UTC) if known
+
+    Returns:
+        bool: True if posted before the watermark or one of the last stored links
+    """
+    if link_hash_hex(link) in self._link_hash_set:
+      return True
+    if self._watermark_dt is None or posted_at is None:
+      return False
+    return posted_at < self._watermark_dt
+
+  def is_known(self, article: ArticleDetail) -> bool:
+    """Check if the article was reached by a previous scrape
+
+    Args:
+        article (ArticleDetail): Scraped article
+
+    Returns:
+        bool: True if posted before the watermark or one of the last stored links
+    """
+    return self.is_known_link(
+        article.link, None
+        if article.posted_at is None else format_datetime(article.posted_at))
+
+  def advance(self, articles: Iterable[ArticleDetail],
+              max_link_hashes: int) -> ArticleCursor:
+    """Build the cursor following newly stored articles
+
+    Args:
+        articles (Iterable[ArticleDetail]): Stored articles, newest first
+        max_link_hashes (int): Number of last links kept
+
+    Returns:
+        ArticleCursor: Advanced cursor
+    """
+    watermark_dt = self._watermark_dt
+    link_hashes: list[str] = []
+    for article in articles:
+      link_hashes.append(link_hash_hex(article.link))
+      if article.posted_at is None:
+        continue
+      posted_at_dt = format_datetime(article.posted_at)
+      if watermark_dt is None or posted_at_dt > watermark_dt:
+        watermark_dt = posted_at_dt
+    link_hashes.extend(self.link_hashes)
+    link_hashes = list(dict.fromkeys(link_hashes))[:max_link_hashes]
+    watermark = self.watermark
+    if watermark_dt is not None and watermark_dt != self._watermark_dt:
+      watermark = format_datetime_str(watermark_dt)
+    return ArticleCursor(watermark, link_hashes)
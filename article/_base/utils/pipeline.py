@@ -0,0 +1,433 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from queue import Empty, Full, Queue
+from threading import Condition, Event, Lock, Thread
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from common.utils.mongo import BulkWriteCounts
+
+_END_OF_PAGES = object()  # Sentinel sent by the producer after the last page
+_END_OF_CHUNKS = object()  # Sentinel sent by the producer after the last chunk
+
+PageItem = list[tuple[str, Future]]
+
+
+def _put(item_queue: Queue, item: Any, cancel_event: Event) -> bool:
+  """Put an item to the queue unless the pipeline gets cancelled meanwhile
+
+  Returns:
+      bool: True if the item was put
+  """
+  while not cancel_event.is_set():
+    try:
+      item_queue.put(item, timeout=0.1)
+      return True
+    except Full:
+      continue
+  return False
+
+
+class ScrapePipeline:
+  """Pipelined producer/consumer scraper.
+
+    Description:
+      A producer thread scrapes listing pages ahead of the consumer, submits the
+      fetches of their links to a thread pool and sends them to a bounded queue of
+      pages. The consumer parses fetched articles in the listing order (newest
+      first). Closing the iterator cancels the prefetched pages and pending fetches.
+      When parsing is offloaded to worker processes, the fetching threads submit
+      the parses without waiting, so that several articles are parsed at once.
+
+  Attributes:
+      max_workers (int): Number of concurrent article fetches
+      prefetch_pages (int): Maximum listing pages scraped ahead of the consumer
+  """
+
+  def __init__(self, scrape_links: Callable[[str], list[str]],
+               fetch_article: Callable[[str], Any],
+               parse_article: Callable[[str, Any], Any], max_workers: int,
+               prefetch_pages: int) -> None:
+    """Initialize pipeline's stages
+
+    Args:
+        scrape_links (Callable[[str], list[str]]): Scrape links of a listing page
+        fetch_article (Callable[[str], Any]): Fetch article by its link (e.g. its
+          HTML, or the future of its parse)
+        parse_article (Callable[[str, Any], Any]): Parse article from link & the
+          fetched article
+        max_workers (int): Number of concurrent article fetches
+        prefetch_pages (int): Maximum listing pages scraped ahead of the consumer
+    """
+    self._scrape_links = scrape_links
+    self._fetch_article = fetch_article
+    self._parse_article = parse_article
+    self._max_workers = max_workers
+    self._prefetch_pages = prefetch_pages
+
+  @property
+  def max_workers(self) -> int:
+    return self._max_workers
+
+  @property
+  def prefetch_pages(self) -> int:
+    return self._prefetch_pages
+
+  @staticmethod
+  def _put(page_queue: Queue, item: Any, cancel_event: Event) -> bool:
+    return _put(page_queue, item, cancel_event)
+
+  def _produce(self, page_urls: Iterable[str], executor: ThreadPoolExecutor,
+               page_queue: Queue, cancel_event: Event) -> None:
+    """Producer stage: scrape listing pages and submit fetches of their links
+    """
+    try:
+      for page_url in page_urls:
+        if cancel_event.is_set():
+          return
+        links = self._scrape_links(page_url)
+        if len(links) == 0:
+          break
+        item: PageItem = [
+            (link, executor.submit(self._fetch_article, link)) for link in links
+        ]
+        if not self._put(page_queue, item, cancel_event):
+          return
+      self._put(page_queue, _END_OF_PAGES, cancel_event)
+    except Exception as err:  # pylint: disable=broad-except
+      self._put(page_queue, err, cancel_event)
+
+  def run(self, page_urls: Iterable[str]) -> Iterator[Any]:
+    """Run the pipeline over listing pages
+
+    Args:
+        page_urls (Iterable[str]): Listing pages' URLs in order
+
+    Yields:
+        Any: Parsed articles in listing order
+    """
+    cancel_event = Event()
+    page_queue: Queue = Queue(maxsize=self.prefetch_pages)
+    executor = ThreadPoolExecutor(max_workers=self.max_workers)
+    producer = Thread(target=self._produce,
+                      args=(page_urls, executor, page_queue, cancel_event),
+                      daemon=True)
+    producer.start()
+    try:
+      while True:
+        item = page_queue.get()
+        if item is _END_OF_PAGES:
+          break
+        if isinstance(item, Exception):
+          raise item
+        for link, future in item:
+          yield self._parse_article(link, future.result())
+    finally:
+      # Cancel speculative work: prefetched pages and pending fetches
+      cancel_event.set()
+      producer.join()
+      while True:
+        try:
+          item = page_queue.get_nowait()
+        except Empty:
+          break
+        if isinstance(item, list):
+          for _, future in item:
+            future.cancel()
+      executor.shutdown(wait=True, cancel_futures=True)
+
+
+@dataclass
+class BulkWriteStats(BulkWriteCounts):
+  """Progress of a bulk write pipeline, aggregated over its writers
+  """
+  chunk_count: int = 0
+  request_count: int = 0
+  failed_chunk_count: int = 0
+
+  def summary(self) -> str:
+    return (f"{self.written_count}/{self.request_count} written in "
+            f"{self.chunk_count} chunks, {self.existing_count} existing, "
+            f"{self.duplicate_count} duplicates, {self.error_count} errors in "
+            f"{self.failed_chunk_count} chunks")
+
+
+@dataclass
+class _Chunk:
+  """Chunk of write requests, numbered in the input's order
+  """
+  index: int
+  requests: list[Any]
+  position: Any = None  # Position of the last request
+
+
+class _CommitWatermark:
+  """Chunks written so far, tracking the last position up to which all of them
+  are (writers complete chunks out of order)
+  """
+
+  def __init__(self) -> None:
+    self._next_index = 0
+    self._written: dict[int, Any] = {}
+    self._position: Any = None
+
+  @property
+  def position(self) -> Any:
+    return self._position
+
+  def commit(self, chunk: _Chunk) -> bool:
+    """Mark a chunk written
+
+    Returns:
+        bool: True if the watermark advanced
+    """
+    self._written[chunk.index] = chunk.position
+    advanced = False
+    while self._next_index in self._written:
+      self._position = self._written.pop(self._next_index)
+      self._next_index += 1
+      advanced = True
+    return advanced
+
+
+class _PendingCommit:
+  """Latest commit handed over by the writers (holding the stats' lock) to the
+  committer thread, superseding an older one not notified yet
+  """
+
+  def __init__(self, stats_lock: Lock) -> None:
+    self._condition = Condition(stats_lock)
+    self._commit: Optional[tuple[Any, BulkWriteStats]] = None
+    self._is_closed = False
+
+  def put(self, position: Any, stats: BulkWriteStats) -> None:
+    """Hand over a commit, with a copy of the statistics (stats' lock held)
+    """
+    self._commit = (position, replace(stats))
+    self._condition.notify()
+
+  def close(self) -> None:
+    with self._condition:
+      self._is_closed = True
+      self._condition.notify()
+
+  def get(self) -> Optional[tuple[Any, BulkWriteStats]]:
+    """Wait for the next commit
+
+    Returns:
+        tuple[Any, BulkWriteStats] | None: Position & statistics, None once
+          closed and drained
+    """
+    with self._condition:
+      self._condition.wait_for(
+          lambda: self._commit is not None or self._is_closed)
+      commit, self._commit = self._commit, None
+      return commit
+
+
+class BulkWritePipeline:
+  """Streaming producer/consumer bulk writer.
+
+    Description:
+      A producer thread pulls write requests from a (lazy) iterable, e.g. reading
+      and transforming a file line by line, groups them into chunks and sends them
+      to a bounded queue. Writer threads consume the chunks as soon as they fill,
+      so that memory is bounded by the queue whatever the input's size, and several
+      chunks are in flight at once to hide the round-trip latency. The writers
+      share the same (thread-safe, pooled) client through `write_chunk`. The first
+      error cancels the producer and the other writers. Requests may carry their
+      input's position (e.g. byte offset) to report the committed one, before
+      which every request is written, so that an interrupted run can resume.
+      Committed positions are reported by a committer thread, so that a slow
+      report (e.g. a checkpoint written to S3) never holds the writers back.
+
+  Attributes:
+      chunk_size (int): Write requests per chunk
+      max_pending_chunks (int): Maximum chunks waiting for the writers
+      max_workers (int): Number of concurrent writers
+  """
+
+  def __init__(self,
+               write_chunk: Callable[[list[Any]], BulkWriteCounts],
+               chunk_size: int,
+               max_pending_chunks: int,
+               max_workers: int = 1) -> None:
+    """Initialize pipeline's stages
+
+    Args:
+        write_chunk (Callable[[list[Any]], BulkWriteCounts]): Write a chunk of
+          requests, returning their outcome (called from the writer threads)
+        chunk_size (int): Write requests per chunk
+        max_pending_chunks (int): Maximum chunks waiting for the writers
+        max_workers (int, optional): Number of concurrent writers. Defaults to 1.
+
+    Raises:
+        ValueError: Chunk size, maximum pending chunks or writers below 1
+    """
+    if chunk_size < 1:
+      raise ValueError(f"Chunk size must be at least 1, got {chunk_size}")
+    if max_pending_chunks < 1:
+      raise ValueError(
+          f"Maximum pending chunks must be at least 1, got {max_pending_chunks}")
+    if max_workers < 1:
+      raise ValueError(f"Writers must be at least 1, got {max_workers}")
+    self._write_chunk = write_chunk
+    self._chunk_size = chunk_size
+    self._max_pending_chunks = max_pending_chunks
+    self._max_workers = max_workers
+
+  @property
+  def chunk_size(self) -> int:
+    return self._chunk_size
+
+  @property
+  def max_pending_chunks(self) -> int:
+    return self._max_pending_chunks
+
+  @property
+  def max_workers(self) -> int:
+    return self._max_workers
+
+  def _produce(self, requests: Iterable[Any], chunk_queue: Queue,
+               cancel_event: Event, has_positions: bool) -> None:
+    """Producer stage: group write requests into chunks, numbered in order
+    """
+    try:
+      index = 0
+      position: Any = None
+      chunk: list[Any] = []
+      for request in requests:
+        if has_positions:
+          position, request = request
+        chunk.append(request)
+        if len(chunk) == self.chunk_size:
+          if not _put(chunk_queue, _Chunk(index, chunk, position),
+                      cancel_event):
+            return
+          index += 1
+          chunk = []
+      if len(chunk) > 0 and not _put(
+          chunk_queue, _Chunk(index, chunk, position), cancel_event):
+        return
+      _put(chunk_queue, _END_OF_CHUNKS, cancel_event)
+    except Exception as err:  # pylint: disable=broad-except
+      _put(chunk_queue, err, cancel_event)
+
+  def _write(self, chunk_queue: Queue, cancel_event: Event,
+             stats: BulkWriteStats, stats_lock: Lock, errors: list[Exception],
+             watermark: _CommitWatermark,
+             on_progress: Optional[Callable[[BulkWriteStats], None]],
+             pending_commit: Optional[_PendingCommit]) -> None:
+    """Writer stage: write chunks until the end or the first error
+    """
+    while not cancel_event.is_set():
+      try:
+        chunk = chunk_queue.get(timeout=0.1)
+      except Empty:
+        continue
+      if chunk is _END_OF_CHUNKS:
+        _put(chunk_queue, chunk, cancel_event)  # Stop the other writers too
+        return
+      try:
+        if isinstance(chunk, Exception):
+          raise chunk
+        counts = self._write_chunk(chunk.requests)
+      except Exception as err:  # pylint: disable=broad-except
+        with stats_lock:
+          errors.append(err)
+        cancel_event.set()
+        return
+      with stats_lock:
+        stats.chunk_count += 1
+        stats.request_count += len(chunk.requests)
+        stats.add(counts)
+        if counts.error_count > 0:
+          stats.failed_chunk_count += 1
+        if on_progress is not None:
+          on_progress(stats)
+        if watermark.commit(chunk) and pending_commit is not None:
+          pending_commit.put(watermark.position, stats)
+
+  @staticmethod
+  def _notify_commits(pending_commit: _PendingCommit,
+                      on_commit: Callable[[Any, BulkWriteStats], None],
+                      cancel_event: Event, stats_lock: Lock,
+                      errors: list[Exception]) -> None:
+    """Committer stage: report the latest committed position until the writers
+    stop, out of the stats' lock
+    """
+    while True:
+      commit = pending_commit.get()
+      if commit is None:
+        return
+      try:
+        on_commit(*commit)
+      except Exception as err:  # pylint: disable=broad-except
+        with stats_lock:
+          errors.append(err)
+        cancel_event.set()
+        return
+
+  def run(
+      self,
+      requests: Iterable[Any],
+      on_progress: Optional[Callable[[BulkWriteStats], None]] = None,
+      on_commit: Optional[Callable[[Any, BulkWriteStats], None]] = None
+  ) -> BulkWriteStats:
+    """Run the pipeline over write requests
+
+    Args:
+        requests (Iterable[Any]): Write requests in order, (position, request)
+          pairs if committed positions are reported
+        on_progress (Callable[[BulkWriteStats], None], optional): Called after
+          each written chunk (serialized between writers)
+        on_commit (Callable[[Any, BulkWriteStats], None], optional): Called with
+          the position of the last request written along with all the previous
+          ones and a copy of the statistics, whenever it advances (from the
+          committer thread, in order, superseded positions are skipped), e.g. to
+          checkpoint. The last committed position is reported before returning.
+
+    Raises:
+        Exception: First error of the producer or a writer
+
+    Returns:
+        BulkWriteStats: Final statistics
+    """
+    stats = BulkWriteStats()
+    stats_lock = Lock()
+    errors: list[Exception] = []
+    watermark = _CommitWatermark()
+    pending_commit = _PendingCommit(stats_lock) if on_commit is not None else None
+    cancel_event = Event()
+    chunk_queue: Queue = Queue(maxsize=self.max_pending_chunks)
+    producer = Thread(target=self._produce,
+                      args=(requests, chunk_queue, cancel_event, on_commit
+                            is not None),
+                      daemon=True)
+    writers = [
+        Thread(target=self._write,
+               args=(chunk_queue, cancel_event, stats, stats_lock, errors,
+                     watermark, on_progress, pending_commit),
+               daemon=True) for _ in range(self.max_workers)
+    ]
+    committer: Optional[Thread] = None
+    if on_commit is not None:
+      committer = Thread(target=self._notify_commits,
+                         args=(pending_commit, on_commit, cancel_event,
+                               stats_lock, errors),
+                         daemon=True)
+      committer.start()
+    producer.start()
+    for writer in writers:
+      writer.start()
+    try:
+      for writer in writers:
+        writer.join()
+    finally:
+      cancel_event.set()
+      producer.join()
+      if committer is not None:
+        pending_commit.close()
+        committer.join()
+    if len(errors) > 0:
+      raise errors[0]
+    return stats
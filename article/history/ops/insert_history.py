@@ -1,19 +1,29 @@
 from dataclasses import dataclass
-from typing import Optional
+from time import monotonic
+from typing import Iterator, Optional, Union
 
-from dagster import OpDefinition, OpExecutionContext, get_dagster_logger, op
+from dagster import (Field, OpDefinition, OpExecutionContext,
+                     get_dagster_logger, op)
 from dataclasses_json import DataClassJsonMixin
-from pymongo import InsertOne
+from pymongo import InsertOne, UpdateOne
 from pymongo.database import Database
-from pymongo.errors import BulkWriteError
 
 from article._base.ops.base_op import BaseOp
 from article._base.ops.save_quests import ArticleSchema
+from article._base.utils.pipeline import BulkWritePipeline, BulkWriteStats
+from common.config.env import EnvVariables
 from common.config.providers import Providers
 from common.config.resource_keys import ResourceKeys
-from common.utils.date import format_datetime, get_today_utc
+from common.config.write_modes import WriteModes
+from common.utils.date import (format_datetime, format_datetime_str,
+                               get_today_utc)
+from common.utils.mongo import (build_article_write_request,
+                                bulk_write_articles, create_article_link_index)
 from common.utils.resource import build_resource_key
-from common.utils.s3 import read_dataclass_multiple_json_lines_s3
+from common.utils.s3 import (list_files_s3, read_dataclass_json_lines_offsets_s3,
+                             read_json_file_s3, write_json_file_s3)
+
+CHECKPOINTS_DIRNAME = "checkpoints"
 
 
 @dataclass
@@ -31,9 +41,63 @@ class HistoryArticleDetail(DataClassJsonMixin):
   author: Optional[str] = None
 
 
+@dataclass
+class HistoryImportCheckpoint(DataClassJsonMixin):
+  """Committed progress of a history file's import
+  """
+  news_file: str
+  offset: int = 0  # Byte offset before which every line is written
+  request_count: int = 0
+  error_count: int = 0
+  completed: bool = False
+  updated_at: Optional[str] = None
+
+
+def history_article_to_write_request(
+    history_article: HistoryArticleDetail,
+    write_mode: WriteModes) -> Union[InsertOne, UpdateOne]:
+  """Transform a history article into a write request of its article's schema
+
+  Args:
+      history_article (HistoryArticleDetail): History article
+      write_mode (WriteModes): Write mode
+
+  Returns:
+      InsertOne | UpdateOne: Write request to 'articles' collection
+  """
+  article_schema = ArticleSchema(
+      author=None,
+      title=history_article.title,
+      content=history_article.content,
+      thumbnailURL=history_article.thumbnailURL,
+      link=history_article.link,
+      category="unknown",
+      subcategory=None,
+      provider=history_article.domain
+      if history_article.domain is not None else "unknown",
+      providerAvatarURL=None,
+      quests=[],
+      postedAt=format_datetime(history_article.postedAt),
+      createdAt=get_today_utc(),
+  )
+  return build_article_write_request(article_schema.to_dict(), write_mode)
+
+
 class InsertHistoryOps(BaseOp):
   """Insert History Articles to Ops
 
+    Description:
+      The history file is streamed line by line, transformed and written by chunks
+      as they fill, through a bounded queue between reading and writing: memory
+      stays flat whatever the file's size. Several writers share the Duty DB's
+      client so that chunks are not bound by one round trip at a time.
+
+      The byte offset before which every line is written is checkpointed next to
+      the file (at most every checkpoint interval, and when the import stops), so
+      that a rerun seeks straight to it instead of starting over. Articles are
+      keyed by their normalized link (unique index), so that the replayed chunks
+      and reruns do not duplicate documents.
+
   Args:
       BaseOp (_type_): _description_
   """
@@ -46,27 +110,52 @@ class InsertHistoryOps(BaseOp):
             str(ResourceKeys.DUTY_MONGO_CLIENT)
         },
     )
-    self._config_schema = {"news_file": str}
-
-  def _chunk_insert_db(self, db_client: Database,
-                       chunks: list[list[InsertOne]]):
-    """Insert individual chunk from list of chunks to Duty DB
-
-    Args:
-        db_client (Database): DB Client
-        chunks (list[list[InsertOne]]): List of Chunks
-    """
-    get_dagster_logger().info("Inserting documents by chunks to Duty DB...")
-    for chunk in chunks:
-      error_count = 0
-      try:
-        db_client.articles.bulk_write(chunk, ordered=False)
-      except BulkWriteError as bwe:
-        error_count = len(bwe.details["writeErrors"])
-        get_dagster_logger().error(bwe.details)
-      get_dagster_logger().info(
-          f"Successfully inserted {len(chunk)-error_count} documents of a chunk to 'articles' collection."
-      )
+    self._config_schema = {
+        "news_file":
+            str,
+        "chunk_size":
+            Field(int,
+                  default_value=int(EnvVariables.HISTORY_CHUNK_SIZE),
+                  description="Insert requests per bulk write (at least 1)"),
+        "max_pending_chunks":
+            Field(int,
+                  default_value=int(EnvVariables.HISTORY_MAX_PENDING_CHUNKS),
+                  description="Maximum chunks read ahead of the writers (at least 1)"),
+        "write_workers":
+            Field(int,
+                  default_value=int(EnvVariables.HISTORY_WRITE_WORKERS),
+                  description="Concurrent bulk writes sharing the Mongo "
+                  "client's connection pool (at least 1)"),
+        "write_mode":
+            Field(str,
+                  default_value=str(EnvVariables.ARTICLES_WRITE_MODE),
+                  description="'upsert' new links only, or 'insert' (existing "
+                  "links fail as duplicates)"),
+        "resume":
+            Field(bool,
+                  default_value=True,
+                  description="Resume from the file's checkpoint, if any"),
+        "checkpoint_interval":
+            Field(float,
+                  default_value=float(EnvVariables.HISTORY_CHECKPOINT_INTERVAL),
+                  description="Minimum seconds between checkpoints"),
+    }
+
+  @staticmethod
+  def _build_checkpoint_uri(s3_resource: str, filename: str) -> str:
+    return f"{s3_resource}/{CHECKPOINTS_DIRNAME}/{filename}.checkpoint.json"
+
+  @staticmethod
+  def _read_checkpoint(checkpoint_uri: str) -> Optional[HistoryImportCheckpoint]:
+    if len(list_files_s3(checkpoint_uri)) == 0:
+      return None
+    return HistoryImportCheckpoint.from_dict(read_json_file_s3(checkpoint_uri))
+
+  @staticmethod
+  def _write_checkpoint(checkpoint: HistoryImportCheckpoint,
+                        checkpoint_uri: str) -> None:
+    checkpoint.updated_at = format_datetime_str(get_today_utc())
+    write_json_file_s3(checkpoint.to_dict(), checkpoint_uri)
 
   def build(self, **kwargs) -> OpDefinition:
 
@@ -81,44 +170,66 @@ class InsertHistoryOps(BaseOp):
           build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI))
       duty_db: Database = getattr(context.resources,
                                   ResourceKeys.DUTY_MONGO_CLIENT)
+      # NOTE: Built first, so that an invalid config fails before the checkpoint
+      pipeline = BulkWritePipeline(
+          write_chunk=lambda chunk: bulk_write_articles(duty_db.articles, chunk),
+          chunk_size=context.op_config["chunk_size"],
+          max_pending_chunks=context.op_config["max_pending_chunks"],
+          max_workers=context.op_config["write_workers"])
       uri = f"{s3_resource}/{filename}"
-      get_dagster_logger().info(f"Reading history articles at file {uri}...")
-      history_articles: list[
-          HistoryArticleDetail] = read_dataclass_multiple_json_lines_s3(
-              HistoryArticleDetail, uri)
-      insert_request_chunks: list[list[InsertOne]] = []
-      cur_chunk: list[InsertOne] = []
-      skip_count = 0
-      for history_article in history_articles:
-        if not history_article.postedAt:
-          skip_count += 1
-          continue
-        # Chunk by 1000
-        if len(cur_chunk) == 1000:
-          insert_request_chunks.append(cur_chunk[:])
-          cur_chunk.clear()  # Reset
-        article_schema = ArticleSchema(
-            author=None,
-            title=history_article.title,
-            content=history_article.content,
-            thumbnailURL=history_article.thumbnailURL,
-            link=history_article.link,
-            category="unknown",
-            subcategory=None,
-            provider=history_article.domain
-            if history_article.domain is not None else "unknown",
-            providerAvatarURL=None,
-            quests=[],
-            postedAt=format_datetime(history_article.postedAt),
-            createdAt=get_today_utc(),
-        )
-        cur_chunk.append(InsertOne(article_schema.to_dict()))
-      # Add remaining
-      if len(cur_chunk) > 0:
-        insert_request_chunks.append(cur_chunk[:])
+      checkpoint_uri = self._build_checkpoint_uri(s3_resource, filename)
+      checkpoint = None
+      if context.op_config["resume"]:
+        checkpoint = self._read_checkpoint(checkpoint_uri)
+      if checkpoint is None:
+        checkpoint = HistoryImportCheckpoint(news_file=filename)
+      elif checkpoint.completed:
+        get_dagster_logger().info(
+            f"History file {uri} is already imported ({checkpoint_uri}).")
+        return
+      start = HistoryImportCheckpoint.from_dict(checkpoint.to_dict())
       get_dagster_logger().info(
-          f"Total chunks: {len(insert_request_chunks)} in {len(history_articles)-skip_count} valid elements"
-      )
-      self._chunk_insert_db(duty_db, insert_request_chunks)
+          f"Reading history articles at file {uri} from byte {start.offset}...")
+      history_articles: Iterator[tuple[
+          int, HistoryArticleDetail]] = read_dataclass_json_lines_offsets_s3(
+              HistoryArticleDetail, uri, start_offset=start.offset)
+      write_mode = WriteModes(context.op_config["write_mode"])
+      write_requests = (
+          (offset, history_article_to_write_request(history_article,
+                                                    write_mode))
+          for offset, history_article in history_articles
+          if history_article.postedAt)
+      create_article_link_index(duty_db.articles)
+      last_checkpoint_time = monotonic()
+
+      def _commit(offset: int, stats: BulkWriteStats):
+        nonlocal last_checkpoint_time
+        checkpoint.offset = offset
+        checkpoint.request_count = start.request_count + stats.request_count
+        checkpoint.error_count = start.error_count + stats.error_count
+        if monotonic(
+        ) - last_checkpoint_time >= context.op_config["checkpoint_interval"]:
+          self._write_checkpoint(checkpoint, checkpoint_uri)
+          last_checkpoint_time = monotonic()
+
+      get_dagster_logger().info(
+          f"Writing documents ({write_mode}) by chunks to Duty DB with "
+          f"{pipeline.max_workers} writers...")
+      try:
+        stats = pipeline.run(
+            write_requests,
+            on_progress=lambda stats: get_dagster_logger().info(
+                f"Wrote chunk {stats.chunk_count} to 'articles' collection: "
+                f"{stats.summary()}"),
+            on_commit=_commit)
+      except Exception:
+        self._write_checkpoint(checkpoint, checkpoint_uri)
+        get_dagster_logger().error(
+            f"History import stopped, resume from byte {checkpoint.offset} "
+            f"({checkpoint_uri}).")
+        raise
+      checkpoint.completed = True
+      self._write_checkpoint(checkpoint, checkpoint_uri)
+      get_dagster_logger().info(f"History import done: {stats.summary()}")
 
     return _op
@@ -9,9 +9,13 @@ from strenum import StrEnum
 from article._base.jobs.base_job import BaseCategorizedJobFactory
 from article._base.sensors.base_sensor import BaseCategorizedSensorFactory
 from article.history.jobs.insert_history import InsertHistoryJob
+from article.vnexpress.jobs.compact_snapshots import VNExpressCompactSnapshotsJob
 from article.vnexpress.jobs.save_quests import VNExpressSaveQuestsJobFactory
-from article.vnexpress.jobs.scrape_articles import \
-    VNExpressScrapeArticlesJobFactory
+from article.vnexpress.jobs.scrape_articles import (
+    VNExpressDynamicScrapeArticlesJobFactory, VNExpressScrapeAllArticlesJob,
+    VNExpressScrapeArticlesJobFactory)
+from article.vnexpress.schedules.compact_snapshots_schedule import \
+    VNExpressCompactSnapshotsSchedule
 from article.vnexpress.schedules.scrape_articles_schedule import \
     VNExpressScrapeArticlesScheduleFactory
 from article.vnexpress.sensors.save_quests_sensor import \
@@ -22,6 +26,7 @@ NEWS_CRON_SCHEDULE = "0 13 * * *"  # Run at 1 P.M Every day
 BUSINESS_CRON_SCHEDULE = "0 16 * * *"  # Run at 4 P.M Every day
 LIFE_CRON_SCHEDULE = "0 20 * * *"  # Run at 8 P.M Every day
 WORLD_CRON_SCHEDULE = "0 23 * * *"  # Run at 11 P.M Every day
+COMPACT_CRON_SCHEDULE = "0 9 * * *"  # Run at 9 A.M Every day (previous UTC day)
 
 
 def init_categorized_jobs(factory: BaseCategorizedJobFactory,
@@ -45,12 +50,19 @@ def article_repository() -> RepositoryDefinition:
   """
   # History Job
   insert_history_job = InsertHistoryJob().build()
+  # All categories' scraping Job
+  vnexpress_scrape_all_articles_job = VNExpressScrapeAllArticlesJob().build()
+  # Snapshots' compaction Job
+  vnexpress_compact_snapshots_job = VNExpressCompactSnapshotsJob().build()
   # Job definitions
   jobs = [
       *(init_categorized_jobs(VNExpressScrapeArticlesJobFactory(),
                               VNExpressCategories)),
+      *(init_categorized_jobs(VNExpressDynamicScrapeArticlesJobFactory(),
+                              VNExpressCategories)),
       *(init_categorized_jobs(VNExpressSaveQuestsJobFactory(),
-                              VNExpressCategories)), insert_history_job
+                              VNExpressCategories)), insert_history_job,
+      vnexpress_scrape_all_articles_job, vnexpress_compact_snapshots_job
   ]
   # Schedule definitions
   vnexpress_scrape_articles_schedule_factory = VNExpressScrapeArticlesScheduleFactory(
@@ -64,6 +76,7 @@ def article_repository() -> RepositoryDefinition:
           VNExpressCategories.LIFE, LIFE_CRON_SCHEDULE),
       vnexpress_scrape_articles_schedule_factory.create_schedule(
           VNExpressCategories.WORLD, WORLD_CRON_SCHEDULE),
+      VNExpressCompactSnapshotsSchedule(COMPACT_CRON_SCHEDULE).build(),
   ]
   # Sensor definitions
   sensors = [
@@ -0,0 +1,19 @@
+from article._base.jobs.compact_snapshots import BaseCompactSnapshotsJob
+from article.vnexpress.ops.compact_snapshots import \
+    VNExpressCompactSnapshotsOpFactory
+from article.vnexpress.resources.s3 import (vnexpress_s3_resource,
+                                            vnexpress_s3_resource_key)
+from common.config.categories import VNExpressCategories
+from common.config.providers import Providers
+
+
+class VNExpressCompactSnapshotsJob(BaseCompactSnapshotsJob):
+  """VNExpress Compact Snapshots job of all categories
+  """
+
+  def __init__(self) -> None:
+    super().__init__(
+        categories=VNExpressCategories,
+        provider=Providers.VNEXPRESS,
+        compact_snapshots_op_factory=VNExpressCompactSnapshotsOpFactory())
+    self.resource_defs = {vnexpress_s3_resource_key: vnexpress_s3_resource}
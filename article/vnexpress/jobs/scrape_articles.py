@@ -1,16 +1,28 @@
 from dagster import JobDefinition
 
 from article._base.jobs.base_job import BaseCategorizedJobFactory
-from article._base.jobs.scrape_articles import BaseScrapeArticlesJob
+from article._base.jobs.scrape_articles import (BaseDynamicScrapeArticlesJob,
+                                                BaseScrapeAllArticlesJob,
+                                                BaseScrapeArticlesJob)
+from article.vnexpress.ops.export_articles import \
+    VNExpressExportArticlesOpFactory
 from article.vnexpress.ops.save_articles import VNExpressSaveArticlesOpFactory
-from article.vnexpress.ops.save_cursor import VNExpressSaveCursorOpFactory
-from article.vnexpress.ops.scrape_articles import \
-    VNExpressScrapeArticlesOpFactory
+from article.vnexpress.ops.save_cursor import (VNExpressSaveAllCursorsOp,
+                                               VNExpressSaveCursorOpFactory)
+from article.vnexpress.ops.scrape_articles import (
+    VNExpressScrapeAllArticlesOp, VNExpressScrapeArticlesOpFactory)
 from article.vnexpress.resources.cursors import (
     vnexpress_article_cursors_key, vnexpress_article_cursors_resource)
+from article.vnexpress.resources.http import (
+    vnexpress_http_client_key, vnexpress_http_client_resource)
+from article.vnexpress.resources.parse_pool import (
+    vnexpress_parse_pool_key, vnexpress_parse_pool_resource)
 from article.vnexpress.resources.s3 import (vnexpress_s3_resource,
                                             vnexpress_s3_resource_key)
+from article.vnexpress.resources.seen_links import (
+    vnexpress_seen_links_key, vnexpress_seen_links_resource)
 from common.config.categories import VNExpressCategories
+from common.config.env import EnvVariables
 from common.config.providers import Providers
 from common.errors.key import CategoryKeyError
 
@@ -28,10 +40,43 @@ class VNExpressScrapeArticlesJob(BaseScrapeArticlesJob):
         provider=Providers.VNEXPRESS,
         scrape_articles_op_factory=VNExpressScrapeArticlesOpFactory(),
         save_articles_op_factory=VNExpressSaveArticlesOpFactory(),
-        save_cursor_op_factory=VNExpressSaveCursorOpFactory())
+        save_cursor_op_factory=VNExpressSaveCursorOpFactory(),
+        export_articles_op_factory=VNExpressExportArticlesOpFactory()
+        if EnvVariables.ARTICLES_EXPORT_FORMAT else None)
     self.resource_defs = {
         vnexpress_s3_resource_key: vnexpress_s3_resource,
-        vnexpress_article_cursors_key: vnexpress_article_cursors_resource
+        vnexpress_article_cursors_key: vnexpress_article_cursors_resource,
+        vnexpress_http_client_key: vnexpress_http_client_resource,
+        vnexpress_seen_links_key: vnexpress_seen_links_resource,
+        vnexpress_parse_pool_key: vnexpress_parse_pool_resource
+    }
+
+
+class VNExpressDynamicScrapeArticlesJob(BaseDynamicScrapeArticlesJob,
+                                        VNExpressScrapeArticlesJob):
+  """VNExpress Scrape Articles job fanning out batches of links
+  """
+
+
+class VNExpressScrapeAllArticlesJob(BaseScrapeAllArticlesJob):
+  """VNExpress Scrape Articles job crawling all categories in one run
+  """
+
+  def __init__(self) -> None:
+    super().__init__(
+        categories=VNExpressCategories,
+        provider=Providers.VNEXPRESS,
+        scrape_all_articles_op=VNExpressScrapeAllArticlesOp(VNExpressCategories),
+        save_articles_op_factory=VNExpressSaveArticlesOpFactory(),
+        save_all_cursors_op=VNExpressSaveAllCursorsOp(VNExpressCategories),
+        export_articles_op_factory=VNExpressExportArticlesOpFactory()
+        if EnvVariables.ARTICLES_EXPORT_FORMAT else None)
+    self.resource_defs = {
+        vnexpress_s3_resource_key: vnexpress_s3_resource,
+        vnexpress_article_cursors_key: vnexpress_article_cursors_resource,
+        vnexpress_http_client_key: vnexpress_http_client_resource,
+        vnexpress_seen_links_key: vnexpress_seen_links_resource,
+        vnexpress_parse_pool_key: vnexpress_parse_pool_resource
     }
 
 
@@ -47,3 +92,17 @@ class VNExpressScrapeArticlesJobFactory(BaseCategorizedJobFactory):
       raise CategoryKeyError(VNExpressCategories) from key_err
     scrape_job = VNExpressScrapeArticlesJob(category).build(**kwargs)
     return scrape_job
+
+
+class VNExpressDynamicScrapeArticlesJobFactory(BaseCategorizedJobFactory):
+  """Dynamic Scrape Articles Job Factory for VNExpress provider
+  """
+
+  def create_job(self, category: VNExpressCategories,
+                 **kwargs) -> JobDefinition:
+    try:
+      category = VNExpressCategories[category.upper()]
+    except KeyError as key_err:
+      raise CategoryKeyError(VNExpressCategories) from key_err
+    scrape_job = VNExpressDynamicScrapeArticlesJob(category).build(**kwargs)
+    return scrape_job
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from dagster import OpDefinition
+from strenum import StrEnum
+
+from article._base.ops.base_op import BaseCategorizedOpFactory
+from article._base.ops.compact_snapshots import BaseCompactSnapshotsOp
+from common.config.categories import VNExpressCategories
+from common.config.providers import Providers
+from common.config.resource_keys import ResourceKeys
+from common.errors.key import CategoryKeyError
+from common.utils.resource import build_resource_key
+
+
+class VNExpressCompactSnapshotsOp(BaseCompactSnapshotsOp):
+  """VNExpress Compact Snapshots Operation
+
+  Args:
+      BaseCompactSnapshotsOp: Base Compact Snapshots Operation class
+  """
+
+  def __init__(self, category: StrEnum) -> None:
+    super().__init__(category=category, provider=Providers.VNEXPRESS)
+    self.required_resource_keys = {
+        build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI)
+    }
+
+
+class VNExpressCompactSnapshotsOpFactory(BaseCategorizedOpFactory):
+  """Op Factory for creating Compact Snapshots Op for specified category
+
+  Args:
+      BaseCategorizedOpFactory: Base Categorized Op Factory
+  """
+
+  def create_op(self, category: VNExpressCategories, **kwargs) -> OpDefinition:
+    """Creating Compact Snapshots operation based on specified category of
+    VNExpress
+
+    Args:
+        category (StrEnum): Enum of Category
+
+    Returns:
+        OpDefinition: Dagster's Op Definition
+    """
+    try:
+      category = VNExpressCategories[category.upper()]
+    except KeyError as key_err:
+      raise CategoryKeyError(VNExpressCategories) from key_err
+    compact_snapshots_op = VNExpressCompactSnapshotsOp(category).build(**kwargs)
+    return compact_snapshots_op
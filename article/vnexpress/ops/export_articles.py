@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from dagster import OpDefinition
+from strenum import StrEnum
+
+from article._base.ops.base_op import BaseCategorizedOpFactory
+from article._base.ops.export_articles import BaseExportArticlesOp
+from common.config.categories import VNExpressCategories
+from common.config.env import EnvVariables
+from common.config.providers import Providers
+from common.errors.key import CategoryKeyError
+
+
+class VNExpressExportArticlesOp(BaseExportArticlesOp):
+  """VNExpress Export Articles Operation
+
+  Args:
+      BaseExportArticlesOp: Base Export Articles Operation class
+  """
+
+  def __init__(self, category: StrEnum) -> None:
+    super().__init__(category=category,
+                     provider=Providers.VNEXPRESS,
+                     export_format=EnvVariables.ARTICLES_EXPORT_FORMAT)
+
+
+class VNExpressExportArticlesOpFactory(BaseCategorizedOpFactory):
+  """Op Factory for creating Export Articles Op for specified category
+
+  Args:
+      BaseCategorizedOpFactory: Base Categorized Op Factory
+  """
+
+  def create_op(self, category: VNExpressCategories, **kwargs) -> OpDefinition:
+    """Creating Export Articles operation based on specified category of
+    VNExpress
+
+    Args:
+        category (StrEnum): Enum of Category
+
+    Returns:
+        OpDefinition: Dagster's Op Definition
+    """
+    try:
+      category = VNExpressCategories[category.upper()]
+    except KeyError as key_err:
+      raise CategoryKeyError(VNExpressCategories) from key_err
+    export_articles_op = VNExpressExportArticlesOp(category).build(**kwargs)
+    return export_articles_op
@@ -25,7 +25,8 @@ class VNExpressSaveArticlesOp(BaseSaveArticlesOp):
   ) -> None:
     super().__init__(category=category, provider=Providers.VNEXPRESS)
     self.required_resource_keys = {
-        build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI)
+        build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI),
+        build_resource_key(self.provider, ResourceKeys.SEEN_LINKS)
     }
 
 
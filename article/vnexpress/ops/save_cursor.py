@@ -1,18 +1,47 @@
 from dataclasses import replace
+from typing import Iterable
 
 from dagster import In, OpDefinition, op
 from strenum import StrEnum
 
 from article._base.ops import ArticleDetail, BaseSaveCursorOp
 from article._base.ops.base_op import BaseCategorizedOpFactory
+from article._base.utils.cursor import ArticleCursor
 from article.vnexpress.resources.cursors import VNExpressArticleCursors
 from common.config import ResourceKeys, VNExpressCategories
+from common.config.env import EnvVariables
 from common.config.providers import Providers
 from common.errors.key import CategoryKeyError
 from common.utils.resource import build_resource_key
 from common.utils.s3 import read_dataclass_json_file_s3, write_json_file_s3
 
 
+def advance_article_cursors(
+    article_cursors_data: VNExpressArticleCursors, category: str,
+    articles: list[ArticleDetail]) -> VNExpressArticleCursors:
+  """Advance a category's cursor past its newly scraped articles
+
+  Args:
+      article_cursors_data (VNExpressArticleCursors): Cursors of all categories
+      category (str): Category
+      articles (list[ArticleDetail]): Category's scraped articles (non-empty)
+
+  Returns:
+      VNExpressArticleCursors: Updated cursors
+  """
+  article_cursor = ArticleCursor(
+      watermark=getattr(article_cursors_data, f"{category}_cursor"),
+      link_hashes=getattr(article_cursors_data, f"{category}_link_hashes"))
+  latest_cursor = article_cursor.advance(
+      articles, max_link_hashes=int(EnvVariables.CURSOR_LINK_HASHES))
+  # Update/Replace cursor
+  params = {
+      f"{category}_cursor": latest_cursor.watermark,
+      f"{category}_link_hashes": latest_cursor.link_hashes
+  }
+  return replace(article_cursors_data, **params)
+
+
 class VNExpressSaveCursorOp(BaseSaveCursorOp):
   """VNExpress Save Cursor Operation
 
@@ -35,9 +64,9 @@ class VNExpressSaveCursorOp(BaseSaveCursorOp):
     Returns:
       OpDefinition: Dagster's Op Definition
     """
+    kwargs.setdefault("name", f"save_{self.category}_article_cursor")
 
-    @op(name=f"save_{self.category}_article_cursor",
-        required_resource_keys=self.required_resource_keys,
+    @op(required_resource_keys=self.required_resource_keys,
         ins={"articles": In(dagster_type=list[ArticleDetail])},
         **kwargs)
     def _op(context, articles: list[ArticleDetail]):
@@ -49,13 +78,67 @@ class VNExpressSaveCursorOp(BaseSaveCursorOp):
       """
       if len(articles) == 0:
         return  # Skip updating
-      latest_cursor: str = articles[0].posted_at
       uri = self._build_file_uri(context)
       article_cursors_data: VNExpressArticleCursors = read_dataclass_json_file_s3(
           dataclass=VNExpressArticleCursors, uri=uri, many=False)
-      # Update/Replace cursor
-      params = {f"{self.category}_cursor": latest_cursor}
-      article_cursors_data = replace(article_cursors_data, **params)
+      article_cursors_data = advance_article_cursors(article_cursors_data,
+                                                     self.category, articles)
+      write_json_file_s3(article_cursors_data.to_dict(), uri)
+
+    return _op
+
+
+class VNExpressSaveAllCursorsOp(BaseSaveCursorOp):
+  """VNExpress Save Cursors of all categories at once (one read and one write of
+  the cursors file)
+
+  Attributes:
+      categories (list[VNExpressCategories]): Categories
+  """
+
+  def __init__(self, categories: Iterable[VNExpressCategories]) -> None:
+    super().__init__(category="all", provider=Providers.VNEXPRESS)
+    self._categories = list(categories)
+    self._required_resource_keys = {
+        build_resource_key(self.provider, ResourceKeys.S3_RESOURCE_URI)
+    }
+
+  @property
+  def categories(self) -> list[VNExpressCategories]:
+    return self._categories
+
+  def build(self, **kwargs) -> OpDefinition:
+    """Save article cursors of all categories
+
+    Returns:
+      OpDefinition: Dagster's Op Definition
+    """
+    kwargs.setdefault("name", "save_all_article_cursors")
+
+    @op(required_resource_keys=self.required_resource_keys,
+        ins={
+            f"{category}_articles": In(dagster_type=list[ArticleDetail])
+            for category in self.categories
+        },
+        **kwargs)
+    def _op(context, **category_articles: list[ArticleDetail]):
+      """Save article cursors of the categories having new articles
+
+      Args:
+          context: Dagster's Context
+          category_articles (list[ArticleDetail]): Scraped article's detail of
+            each category (`<category>_articles`)
+      """
+      if all(len(articles) == 0 for articles in category_articles.values()):
+        return  # Skip updating
+      uri = self._build_file_uri(context)
+      article_cursors_data: VNExpressArticleCursors = read_dataclass_json_file_s3(
+          dataclass=VNExpressArticleCursors, uri=uri, many=False)
+      for category in self.categories:
+        articles = category_articles[f"{category}_articles"]
+        if len(articles) > 0:
+          article_cursors_data = advance_article_cursors(
+              article_cursors_data, category, articles)
       write_json_file_s3(article_cursors_data.to_dict(), uri)
 
     return _op
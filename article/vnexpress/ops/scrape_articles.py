@@ -1,29 +1,27 @@
-from datetime import datetime
-from time import sleep, strptime
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, Iterable, Optional, Set
 
-import requests
 from bs4 import BeautifulSoup
-from dagster import OpDefinition, get_dagster_logger, op
-
-from article._base.ops import ArticleDetail, BaseScrapeArticlesOp
-from article._base.ops.base_op import BaseCategorizedOpFactory
-from article.vnexpress.utils import (extract_author, extract_category,
-                                     extract_lead_post_detail_row,
-                                     extract_posted_at_datestr,
-                                     extract_subcategory, extract_thumbnail_url,
-                                     extract_title)
-from common.config import (VNEXPRESS_CATEGORY_URL, HTMLSelectors,
-                           VNExpressSelectors)
+from dagster import (DynamicOut, DynamicOutput, Field, In, OpDefinition, Out,
+                     Output, get_dagster_logger, op)
+
+from article._base.ops import ArticleDetail, BaseOp, BaseScrapeArticlesOp
+from article._base.ops.scrape_articles import BaseScrapeArticlesOpFactory
+from article._base.resources.http import HttpClient
+from article._base.utils.cursor import ArticleCursor
+from article.vnexpress.utils import extract_article_detail
+from common.config import (VNEXPRESS_CATEGORY_FEED_URL, VNEXPRESS_CATEGORY_URL,
+                           DiscoveryModes, HTMLSelectors, VNExpressSelectors)
 from common.config.categories import VNExpressCategories
-from common.config.date_formats import DateFormats
 from common.config.env import EnvVariables
 from common.config.providers import Providers
 from common.config.resource_keys import ResourceKeys
 from common.errors.key import CategoryKeyError
 from common.utils.content import is_restricted_content
-from common.utils.date import format_datetime
 from common.utils.id import build_id
 from common.utils.resource import build_resource_key
+from common.utils.seen_links import SeenLinks
 
 
 class VNExpressScrapeArticlesOp(BaseScrapeArticlesOp):
@@ -34,21 +32,35 @@ class VNExpressScrapeArticlesOp(BaseScrapeArticlesOp):
     super().__init__(category=category,
                      provider=Providers.VNEXPRESS,
                      scrape_threshold=int(EnvVariables.PAGE_SCRAPING_THRESHOLD),
-                     scrape_sleep_time=float(EnvVariables.SCRAPE_SLEEP_TIME))
+                     scrape_sleep_time=float(EnvVariables.SCRAPE_SLEEP_TIME),
+                     scrape_max_workers=int(EnvVariables.SCRAPE_MAX_WORKERS),
+                     scrape_prefetch_pages=int(
+                         EnvVariables.SCRAPE_PREFETCH_PAGES))
     self.required_resource_keys = {
-        build_resource_key(self.provider, ResourceKeys.ARTICLE_CURSORS)
+        build_resource_key(self.provider, ResourceKeys.ARTICLE_CURSORS),
+        build_resource_key(self.provider, ResourceKeys.HTTP_CLIENT),
+        build_resource_key(self.provider, ResourceKeys.SEEN_LINKS),
+        build_resource_key(self.provider, ResourceKeys.PARSE_POOL)
+    }
+    self.config_schema = {
+        "discovery_mode":
+            Field(str,
+                  default_value=str(EnvVariables.VNEXPRESS_DISCOVERY_MODE),
+                  description="Discovery of new links: 'listing' pages or RSS "
+                  "'feed' (listing pages as fallback)")
     }
 
-  def _scrape_links(self, page_url: str) -> list[str]:
+  def _scrape_links(self, http_client: HttpClient, page_url: str) -> list[str]:
     """Scrape list of VNExpress links from a page.
 
     Args:
+        http_client (HttpClient): Shared HTTP client
         page_url (int): Page's url to scrape links
 
     Returns:
         list[str]: List of links
     """
-    json_data = requests.get(page_url).json()
+    json_data = http_client.get(page_url).json()
     if json_data["end"] == 1:  # Handle ending
       return []
     soup = BeautifulSoup(json_data["html"], "html.parser")
@@ -65,46 +77,120 @@ class VNExpressScrapeArticlesOp(BaseScrapeArticlesOp):
       print(link, end='\n' * 2)
     return links
 
-  def _scrape_article(self, article_url: str) -> list[str]:
-    """Scrape article's detail from VNExpress
+  def _fetch_article(self, http_client: HttpClient, article_url: str) -> str:
+    """Fetch article's HTML from VNExpress
 
     Args:
-        link (str): Link to article
+        http_client (HttpClient): Shared HTTP client
+        article_url (str): Link to article
 
     Returns:
-        ArticleDetail: article's detail
+        str: Article's HTML
     """
-    resp = requests.get(article_url)
     get_dagster_logger().info(f"Scraping an article at: {article_url}")
-    soup = BeautifulSoup(resp.text, "html.parser")
-    title = extract_title(soup)
-    author = extract_author(soup)
-    posted_at = extract_posted_at_datestr(soup)
-    thumbnail_url = extract_thumbnail_url(soup)
-    lead_post_detail = extract_lead_post_detail_row(soup)
-    category = extract_category(soup)
-    subcategory = extract_subcategory(soup)
-    paragraphs = [lead_post_detail]  # Init paragraphs content
-    article_body_p_tags = soup.find_all(
-        HTMLSelectors.PARAGRAPH,
-        class_=VNExpressSelectors.ARTICLE_BODY_PARAGRAPH)
-    if len(article_body_p_tags) > 0:
-      for p_tag in article_body_p_tags:
-        paragraphs.append(p_tag.text)
-    else:
-      p_tags = soup.find_all(HTMLSelectors.PARAGRAPH,
-                             class_=VNExpressSelectors.NORMAL_PARAGRAPH)
-      for p_tag in p_tags:
-        paragraphs.append(p_tag.text)
-    content = '\n'.join(paragraphs)
-    return ArticleDetail(title=title,
-                         thumbnail_url=thumbnail_url,
-                         content=content,
-                         author=author,
-                         link=article_url,
-                         posted_at=posted_at,
-                         category=category,
-                         subcategory=subcategory)
+    return http_client.get(article_url).text
+
+  @property
+  def article_parser(self) -> Callable[[str, str], ArticleDetail]:
+    return extract_article_detail
+
+  def _get_cursor(self, context) -> ArticleCursor:
+    """Get category's cursor from the cursors resource
+
+    Args:
+        context: Dagster's Context
+
+    Returns:
+        ArticleCursor: Category's cursor
+    """
+    article_cursors_resource = getattr(
+        context.resources,
+        build_resource_key(self.provider, ResourceKeys.ARTICLE_CURSORS))
+    article_cursor = ArticleCursor(
+        watermark=getattr(article_cursors_resource, f"{self.category}_cursor"),
+        link_hashes=getattr(article_cursors_resource,
+                            f"{self.category}_link_hashes"))
+    get_dagster_logger().info(
+        f"Latest Datetime of {self.category}'s cursor: "
+        f"{article_cursor.watermark} "
+        f"({len(article_cursor.link_hashes)} last links)")
+    return article_cursor
+
+  def _get_http_client(self, context) -> HttpClient:
+    return getattr(context.resources,
+                   build_resource_key(self.provider, ResourceKeys.HTTP_CLIENT))
+
+  def _get_seen_links(self, context) -> SeenLinks:
+    return getattr(context.resources,
+                   build_resource_key(self.provider, ResourceKeys.SEEN_LINKS))
+
+  def _get_parse_executor(self, context) -> Optional[Executor]:
+    return getattr(context.resources,
+                   build_resource_key(self.provider, ResourceKeys.PARSE_POOL))
+
+  def _discover_pages(
+      self, http_client: HttpClient, article_cursor: ArticleCursor,
+      discovery_mode: str
+  ) -> tuple[Iterable[str], Optional[Callable[[str], list[str]]]]:
+    """Select the pages to scrape links from
+
+    Args:
+        http_client (HttpClient): Shared HTTP client
+        article_cursor (ArticleCursor): Category's cursor
+        discovery_mode (str): Discovery mode (DiscoveryModes)
+
+    Returns:
+        tuple[Iterable[str], Callable | None]: Pages' URLs and their links' scraper
+          (None for listing pages)
+    """
+    # Discover links from the feed if selected, per listing page otherwise
+    if DiscoveryModes(discovery_mode) == DiscoveryModes.FEED:
+      feed_url = VNEXPRESS_CATEGORY_FEED_URL[self.category]
+      feed_links = self._discover_feed_links(http_client, feed_url,
+                                             article_cursor)
+      if feed_links is not None:
+        return [feed_url], lambda _: feed_links
+    page_urls = (f"{VNEXPRESS_CATEGORY_URL[self.category]}/page/{page}"
+                 for page in range(1, self.scrape_threshold + 1))
+    return page_urls, None
+
+  def collect_articles(
+      self,
+      context,
+      claimed_links: Optional[Set[str]] = None) -> list[ArticleDetail]:
+    """Scrape the category's new articles until its cursor
+
+    Args:
+        context: Dagster's Context (resources and op's config)
+        claimed_links (Set[str], optional): Links already scraped by the run in
+          other categories, skipped (updated with the category's links)
+
+    Returns:
+        list[ArticleDetail]: List of article details, newest first
+    """
+    article_cursor = self._get_cursor(context)
+    http_client = self._get_http_client(context)
+    page_urls, scrape_links = self._discover_pages(
+        http_client, article_cursor, context.op_config["discovery_mode"])
+    if claimed_links is not None:
+      page_urls, scrape_links = self._claim_pages(
+          page_urls, scrape_links or partial(self._scrape_links, http_client),
+          claimed_links)
+    articles: list[ArticleDetail] = []
+    scraped_articles = self._scrape_articles(
+        http_client,
+        page_urls,
+        parse_executor=self._get_parse_executor(context),
+        seen_links=self._get_seen_links(context),
+        scrape_links=scrape_links)
+    for article in scraped_articles:
+      if article_cursor.is_known(article):
+        scraped_articles.close()  # Early-stop scraping
+        break
+      articles.append(article)
+    get_dagster_logger().info(
+        f"Total {self.category} articles collected: {len(articles)}")
+    return articles
 
   def build(self, **kwargs) -> OpDefinition:
     """Build Scrape Articles operation
@@ -116,6 +202,7 @@ class VNExpressScrapeArticlesOp(BaseScrapeArticlesOp):
     @op(name=build_id(provider=self.provider,
                       identifier=f"scrape_{self.category}_articles_op"),
         required_resource_keys=self.required_resource_keys,
+        config_schema=self.config_schema,
         **kwargs)
     def _op(context) -> list[ArticleDetail]:
       """Scrape list of articles based on category operation
@@ -123,43 +210,138 @@ class VNExpressScrapeArticlesOp(BaseScrapeArticlesOp):
       Returns:
           list[ArticleDetail]: List of article details
       """
-      # Extract config from env vars
-      article_cursors_resource = getattr(
-          context.resources,
-          build_resource_key(self.provider, ResourceKeys.ARTICLE_CURSORS))
-      # Get article's cursor by category
-      article_cursor: str = getattr(article_cursors_resource,
-                                    f"{self.category}_cursor")
-      cursor_dt: datetime = None if article_cursor is None else format_datetime(
-          article_cursor)
-      get_dagster_logger().info(
-          f"Latest Datetime of {self.category}'s cursor: {cursor_dt}")
-      # Scrape articles per page
-      articles: list[ArticleDetail] = []
-      for page in range(1, self.scrape_threshold + 1):
-        scrape_url = f"{VNEXPRESS_CATEGORY_URL[self.category]}/page/{page}"
-        links = self._scrape_links(scrape_url)
-        if len(links) == 0:
-          break
-        for link in links:
-          article = self._scrape_article(link)
-          posted_at_dt = strptime(article.posted_at, DateFormats.YYYYMMDDHHMMSS)
-          if (cursor_dt is not None) and (posted_at_dt == cursor_dt):
-            return articles  # Early-stop scraping
-          articles.append(article)
-          sleep(self.scrape_sleep_time)  # Delay scraper
-      get_dagster_logger().info(
-          f"Total {self.category} articles collected: {len(articles)}")
-      return articles
+      return self.collect_articles(context)
 
     return _op
 
+  def build_discover_links(self, **kwargs) -> OpDefinition:
+    """Build the op discovering batches of new links (dynamic scrape job)
+
+    Returns:
+        OpDefinition: Dagster's Op Definition
+    """
 
-class VNExpressScrapeArticlesOpFactory(BaseCategorizedOpFactory):
+    @op(name=build_id(provider=self.provider,
+                      identifier=f"discover_{self.category}_links_op"),
+        required_resource_keys=self.required_resource_keys,
+        config_schema={
+            "discovery_mode": self.config_schema["discovery_mode"]
+        },
+        out=DynamicOut(list[str]),
+        **kwargs)
+    def _op(context):
+      """Discover new links of the category, one dynamic output per batch
+
+      Yields:
+          DynamicOutput: Batch of links
+      """
+      article_cursor = self._get_cursor(context)
+      http_client = self._get_http_client(context)
+      page_urls, scrape_links = self._discover_pages(
+          http_client, article_cursor, context.op_config["discovery_mode"])
+      link_batches = self._discover_link_batches(
+          http_client,
+          page_urls,
+          article_cursor,
+          seen_links=self._get_seen_links(context),
+          scrape_links=scrape_links)
+      for idx, links in enumerate(link_batches):
+        yield DynamicOutput(links, mapping_key=f"batch_{idx:04d}")
+
+    return _op
+
+  def build_scrape_links(self, **kwargs) -> OpDefinition:
+    """Build the op scraping a batch of links (mapped over the dynamic outputs)
+
+    Returns:
+        OpDefinition: Dagster's Op Definition
+    """
+
+    @op(name=build_id(provider=self.provider,
+                      identifier=f"scrape_{self.category}_links_op"),
+        required_resource_keys=self.required_resource_keys,
+        ins={"links": In(dagster_type=list[str])},
+        **kwargs)
+    def _op(context, links: list[str]) -> list[ArticleDetail]:
+      """Scrape articles of a batch of links
+
+      Args:
+          links (list[str]): Batch of links
+
+      Returns:
+          list[ArticleDetail]: List of article details
+      """
+      return self._scrape_link_batch(
+          self._get_http_client(context),
+          links,
+          self._get_cursor(context),
+          parse_executor=self._get_parse_executor(context))
+
+    return _op
+
+
+class VNExpressScrapeAllArticlesOp(BaseOp):
+  """VNExpress Scrape Articles of all categories in one op, sharing the run's
+  HTTP client (connection pool, rate limit), seen links index and cursors
+
+  Attributes:
+      categories (list[VNExpressCategories]): Scraped categories, in order
+      category_ops (list[VNExpressScrapeArticlesOp]): Scrape op of each category
+  """
+
+  def __init__(self, categories: Iterable[VNExpressCategories]) -> None:
+    super().__init__(provider=Providers.VNEXPRESS)
+    self._category_ops = [
+        VNExpressScrapeArticlesOp(category) for category in categories
+    ]
+    # Categories' ops share the same resources and config
+    self.required_resource_keys = self._category_ops[0].required_resource_keys
+    self.config_schema = self._category_ops[0].config_schema
+
+  @property
+  def categories(self) -> list[VNExpressCategories]:
+    return [category_op.category for category_op in self._category_ops]
+
+  @property
+  def category_ops(self) -> list[VNExpressScrapeArticlesOp]:
+    return self._category_ops
+
+  def build(self, **kwargs) -> OpDefinition:
+    """Build Scrape All Articles operation, one output per category
+
+    Returns:
+        OpDefinition: Dagster's Op Definition
+    """
+
+    @op(name=build_id(provider=self.provider,
+                      identifier="scrape_all_articles_op"),
+        required_resource_keys=self.required_resource_keys,
+        config_schema=self.config_schema,
+        out={
+            f"{category}_articles": Out(list[ArticleDetail])
+            for category in self.categories
+        },
+        **kwargs)
+    def _op(context):
+      """Scrape list of articles of every category. An article listed in several
+      categories is fetched once, for the first category listing it.
+
+      Yields:
+          Output: List of article details of each category
+      """
+      claimed_links: Set[str] = set()
+      for category_op in self.category_ops:
+        articles = category_op.collect_articles(context, claimed_links)
+        yield Output(articles, output_name=f"{category_op.category}_articles")
+
+    return _op
+
+
+class VNExpressScrapeArticlesOpFactory(BaseScrapeArticlesOpFactory):
   """Op Factory for creating Scrape Articles Op of specified category
 
   Args:
-      BaseCategorizedOpFactory: Base Categorized Op Factory
+      BaseScrapeArticlesOpFactory: Base Scrape Articles Op Factory
   """
 
   def create_op(self, category: VNExpressCategories, **kwargs) -> OpDefinition:
@@ -177,3 +359,25 @@ class VNExpressScrapeArticlesOpFactory(BaseCategorizedOpFactory):
       raise CategoryKeyError(VNExpressCategories) from key_err
     scrape_op = VNExpressScrapeArticlesOp(category).build(**kwargs)
     return scrape_op
+
+  def create_dynamic_ops(
+      self, category: VNExpressCategories,
+      **kwargs) -> tuple[OpDefinition, OpDefinition, OpDefinition]:
+    """Creating the ops of the dynamic Scrape Articles job based on specified
+    category
+
+    Args:
+        category (VNExpressCategories): Enum of VNExpress category
+
+    Returns:
+        tuple[OpDefinition, OpDefinition, OpDefinition]: Discover links, scrape
+          links (mapped) and collect articles ops
+    """
+    try:
+      category = VNExpressCategories[category.upper()]
+    except KeyError as key_err:
+      raise CategoryKeyError(VNExpressCategories) from key_err
+    scrape_articles_op = VNExpressScrapeArticlesOp(category)
+    return (scrape_articles_op.build_discover_links(**kwargs),
+            scrape_articles_op.build_scrape_links(**kwargs),
+            scrape_articles_op.build_collect_articles(**kwargs))
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 from dagster import get_dagster_logger, resource
@@ -13,12 +13,17 @@ from common.utils.resource import build_resource_key
 
 @dataclass
 class VNExpressArticleCursors(DataClassJsonMixin):
-  """Latest VNExpress articles' cursor by category data
+  """Latest VNExpress articles' cursor by category data: watermark (latest posted
+  time) and hashes of the last stored links
   """
   news_cursor: Optional[str] = None
   business_cursor: Optional[str] = None
   life_cursor: Optional[str] = None
   world_cursor: Optional[str] = None
+  news_link_hashes: list[str] = field(default_factory=list)
+  business_link_hashes: list[str] = field(default_factory=list)
+  life_link_hashes: list[str] = field(default_factory=list)
+  world_link_hashes: list[str] = field(default_factory=list)
 
 
 vnexpress_article_cursors_key = build_resource_key(Providers.VNEXPRESS,
@@ -0,0 +1,8 @@
+from article._base.resources.http import build_http_client_resource
+from common.config.providers import Providers
+from common.config.resource_keys import ResourceKeys
+from common.utils.resource import build_resource_key
+
+vnexpress_http_client_resource = build_http_client_resource(Providers.VNEXPRESS)
+vnexpress_http_client_key = build_resource_key(Providers.VNEXPRESS,
+                                               ResourceKeys.HTTP_CLIENT)
@@ -0,0 +1,9 @@
+from article._base.resources.parse_pool import build_parse_pool_resource
+from common.config.providers import Providers
+from common.config.resource_keys import ResourceKeys
+from common.utils.resource import build_resource_key
+
+vnexpress_parse_pool_resource = build_parse_pool_resource(
+    Providers.VNEXPRESS, parser_module="article.vnexpress.utils.soup")
+vnexpress_parse_pool_key = build_resource_key(Providers.VNEXPRESS,
+                                              ResourceKeys.PARSE_POOL)
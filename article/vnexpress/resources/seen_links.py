@@ -0,0 +1,8 @@
+from article._base.resources.seen_links import build_seen_links_resource
+from common.config.providers import Providers
+from common.config.resource_keys import ResourceKeys
+from common.utils.resource import build_resource_key
+
+vnexpress_seen_links_resource = build_seen_links_resource(Providers.VNEXPRESS)
+vnexpress_seen_links_key = build_resource_key(Providers.VNEXPRESS,
+                                              ResourceKeys.SEEN_LINKS)
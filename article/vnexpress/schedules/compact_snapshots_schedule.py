@@ -0,0 +1,21 @@
+from dagster import DefaultScheduleStatus
+
+from article._base.schedules.compact_snapshots_schedule import \
+    BaseCompactSnapshotsSchedule
+from article.vnexpress.jobs.compact_snapshots import VNExpressCompactSnapshotsJob
+from common.config.env import EnvVariables
+from common.config.providers import Providers
+
+
+class VNExpressCompactSnapshotsSchedule(BaseCompactSnapshotsSchedule):
+  """VNExpress Compact Snapshots Schedule
+  """
+
+  def __init__(self, cron_schedule: str) -> None:
+    super().__init__(
+        provider=Providers.VNEXPRESS,
+        cron_schedule=cron_schedule,
+        job=VNExpressCompactSnapshotsJob().build(),
+        default_status=DefaultScheduleStatus.STOPPED,
+        # NOTE: Convert env to str for execution_timezone!
+        execution_timezone=str(EnvVariables.SCHEDULE_TIMEZONE))
@@ -1,4 +1,5 @@
-from article.vnexpress.utils.soup import (extract_author, extract_category,
+from article.vnexpress.utils.soup import (extract_article_detail,
+                                          extract_author, extract_category,
                                           extract_lead_post_detail_row,
                                           extract_posted_at_datestr,
                                           extract_subcategory,
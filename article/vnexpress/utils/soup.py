@@ -1,18 +1,192 @@
 ## Helper functions ##
 
 import re
+from dataclasses import dataclass
 from datetime import datetime
+from html.parser import HTMLParser
+from typing import Optional
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
+from article._base.ops.scrape_articles import ArticleDetail
 from common.config import DateFormats
 from common.config.env import EnvVariables
-from common.config.providers import Providers
 from common.config.selectors import HTMLSelectors, VNExpressSelectors
+from common.errors.article import ArticleParseError
 from common.utils.date import format_datetime_str, naive_datetime_to_utc
 
 VNEXPRESS_DATETIME_REGEX = r"([a-zA-Z]+ [0-9]+, [0-9]+ \| [0-9]+:[0-9]+ [a-z]+)"
 
+# Elements of an article page needed by ArticleDetail, by tag name
+ARTICLE_ELEMENT_SELECTORS: dict[str, tuple[VNExpressSelectors, ...]] = {
+    HTMLSelectors.DIV: (VNExpressSelectors.AUTHOR,
+                        VNExpressSelectors.THUMB_DETAIL_TOP,
+                        VNExpressSelectors.ITEM_MENU_LEFT_ACTIVE,
+                        VNExpressSelectors.FOLDER_NAME_DETAIL),
+    HTMLSelectors.H1: (VNExpressSelectors.TITLE_POST,),
+    HTMLSelectors.SPAN: (VNExpressSelectors.LEAD_POST_DETAIL_ROW,),
+    HTMLSelectors.PARAGRAPH: (VNExpressSelectors.ARTICLE_BODY_PARAGRAPH,
+                              VNExpressSelectors.NORMAL_PARAGRAPH),
+}
+
+# Elements that every article's page must have
+REQUIRED_ARTICLE_SELECTORS = (VNExpressSelectors.AUTHOR,
+                              VNExpressSelectors.TITLE_POST,
+                              VNExpressSelectors.LEAD_POST_DETAIL_ROW,
+                              VNExpressSelectors.ITEM_MENU_LEFT_ACTIVE,
+                              VNExpressSelectors.FOLDER_NAME_DETAIL)
+
+
+def _has_class(classes: list[str], selector: str) -> bool:
+  """Match a class selector the same way as BeautifulSoup's `class_` filter
+  (any single class, or the whole class attribute value)
+  """
+  return selector in classes or ' '.join(classes) == selector
+
+
+def _match_article_element(name: str, classes: list[str]) -> bool:
+  """Check if a tag is one of the article's elements
+
+  Args:
+      name (str): Tag's name
+      classes (list[str]): Tag's classes
+
+  Returns:
+      bool: True if the tag is needed for extraction
+  """
+  return any(
+      _has_class(classes, selector)
+      for selector in ARTICLE_ELEMENT_SELECTORS.get(name, ()))
+
+
+# Elements without end tag, closed right away by BeautifulSoup's html.parser
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr", "basefont",
+    "bgsound", "command", "frame", "image", "isindex", "nextid", "spacer"
+})
+
+# Ancestors changing how BeautifulSoup builds the strings of their descendants
+# (whitespaces kept, or string types left out of `.text`)
+STRING_CONTEXT_ELEMENTS = frozenset({"pre", "textarea", "rt", "rp", "template"})
+
+
+@dataclass
+class _ArticleElementSource:
+  """Source of an article's element, up to where the full tree closes it
+  """
+  name: str
+  classes: list[str]
+  start: int
+  end: Optional[int] = None
+  context: str = ""  # Start tags of the string context ancestors
+
+  def parse(self, html: str) -> Tag:
+    """Parse the element alone, giving the same subtree as the full page's
+    """
+    soup = BeautifulSoup(self.context + html[self.start:self.end],
+                         "html.parser")
+    return soup.find(self.name)
+
+
+class _ArticleElementScanner(HTMLParser):
+  """Single pass over an article's page locating its elements, without building
+  any tree. Open tags are tracked as BeautifulSoup's html.parser does: an end tag
+  closes the last open tag of its name and every tag opened after it (it is
+  ignored if there is none), so that an element ends where the full tree closes
+  it, even when its own end tag is missing.
+  """
+
+  def __init__(self, html: str) -> None:
+    super().__init__(convert_charrefs=True)
+    self._line_offsets = [0]
+    self._line_offsets.extend(match.end() for match in re.finditer("\n", html))
+    self._open_tags: list[tuple[str, Optional[_ArticleElementSource]]] = []
+    self.elements: list[_ArticleElementSource] = []
+
+  def _offset(self) -> int:
+    lineno, offset = self.getpos()
+    return self._line_offsets[lineno - 1] + offset
+
+  def _match_element(self, tag, attrs) -> Optional[_ArticleElementSource]:
+    if tag not in ARTICLE_ELEMENT_SELECTORS:
+      return None
+    # NOTE: The last duplicate attribute wins and a valueless one is empty, as in
+    # BeautifulSoup
+    classes = (dict(attrs).get(HTMLSelectors.CLASS) or "").split()
+    if not _match_article_element(tag, classes):
+      return None
+    element = _ArticleElementSource(
+        name=tag,
+        classes=classes,
+        start=self._offset(),
+        context="".join(f"<{name}>" for name, _ in self._open_tags
+                        if name in STRING_CONTEXT_ELEMENTS))
+    self.elements.append(element)
+    return element
+
+  def handle_starttag(self, tag, attrs):
+    if tag in VOID_ELEMENTS:
+      return
+    self._open_tags.append((tag, self._match_element(tag, attrs)))
+
+  def handle_startendtag(self, tag, attrs):
+    element = self._match_element(tag, attrs)
+    if element is not None:
+      element.end = element.start + len(self.get_starttag_text())
+
+  def handle_endtag(self, tag):
+    for depth in range(len(self._open_tags) - 1, -1, -1):
+      if self._open_tags[depth][0] == tag:
+        break
+    else:
+      return  # Ignored, nothing to close
+    closed_elements = [
+        element for _, element in self._open_tags[depth:] if element is not None
+    ]
+    if len(closed_elements) > 0:
+      end = self._offset()
+      for element in closed_elements:
+        element.end = end
+    del self._open_tags[depth:]
+
+
+def _scan_article_elements(html: str) -> list[_ArticleElementSource]:
+  scanner = _ArticleElementScanner(html)
+  scanner.feed(html)
+  scanner.close()
+  return scanner.elements  # Elements left open end with the page (end is None)
+
+
+def _author_from_div(author_div: Tag) -> str:
+  if author_div.a is None:
+    return "Unknown"
+  return author_div.a.text
+
+
+def _posted_at_datestr_from_div(author_div: Tag) -> Optional[str]:
+  author_div_txt = author_div.text.replace("&nbsp", "")
+  match_datestr = re.search(VNEXPRESS_DATETIME_REGEX, author_div_txt)
+  if match_datestr is None:
+    return None
+  post_datestr = author_div_txt[match_datestr.start():match_datestr.end()]
+  posted_at_date = datetime.strptime(post_datestr,
+                                     DateFormats.VNEXPRESS_DATE_POSTED)
+  utc_datetime = naive_datetime_to_utc(posted_at_date,
+                                       EnvVariables.VNEXPRESS_TIMEZONE)
+  return format_datetime_str(utc_datetime)
+
+
+def _thumbnail_url_from_div(thumb_detail_div: Optional[Tag]) -> str:
+  # Handle missing thumbnail detail
+  if thumb_detail_div is None:
+    return ""
+  return thumb_detail_div.img[HTMLSelectors.SRC]
+
+
+def _subcategory_from_div(detail_div: Tag) -> str:
+  return detail_div.a.text.lower().replace('\n', '').replace('\t', '')
+
 
 def extract_author(soup: BeautifulSoup) -> str:
   """Extract author from VNExpress article.
@@ -24,9 +198,7 @@ def extract_author(soup: BeautifulSoup) -> str:
       str: Author's name
   """
   author_div = soup.find(HTMLSelectors.DIV, class_=VNExpressSelectors.AUTHOR)
-  if author_div.a is None:
-    return "Unknown"
-  return author_div.a.text
+  return _author_from_div(author_div)
 
 
 def extract_title(soup: BeautifulSoup) -> str:
@@ -65,16 +237,7 @@ def extract_posted_at_datestr(soup: BeautifulSoup) -> str:
       str: Date String for posted time
   """
   author_div = soup.find(HTMLSelectors.DIV, class_=VNExpressSelectors.AUTHOR)
-  author_div_txt = author_div.text.replace("&nbsp", "")
-  match_datestr = re.search(VNEXPRESS_DATETIME_REGEX, author_div_txt)
-  if match_datestr is None:
-    return None
-  post_datestr = author_div_txt[match_datestr.start():match_datestr.end()]
-  posted_at_date = datetime.strptime(post_datestr,
-                                     DateFormats.VNEXPRESS_DATE_POSTED)
-  utc_datetime = naive_datetime_to_utc(posted_at_date,
-                                       EnvVariables.VNEXPRESS_TIMEZONE)
-  return format_datetime_str(utc_datetime)
+  return _posted_at_datestr_from_div(author_div)
 
 
 def extract_thumbnail_url(soup: BeautifulSoup) -> str:
@@ -86,11 +249,9 @@ def extract_thumbnail_url(soup: BeautifulSoup) -> str:
   Returns:
       str: Thumbnail's URL
   """
-  thumb_detail_div = soup.find(HTMLSelectors.DIV, class_="thumb_detail_top")
-  # Handle missing thumbnail detail
-  if thumb_detail_div is None:
-    return ""
-  return thumb_detail_div.img["src"]
+  thumb_detail_div = soup.find(HTMLSelectors.DIV,
+                               class_=VNExpressSelectors.THUMB_DETAIL_TOP)
+  return _thumbnail_url_from_div(thumb_detail_div)
 
 
 def extract_category(soup: BeautifulSoup) -> str:
@@ -119,5 +280,61 @@ def extract_subcategory(soup: BeautifulSoup) -> str:
   """
   detail_div = soup.find(HTMLSelectors.DIV,
                          class_=VNExpressSelectors.FOLDER_NAME_DETAIL)
-  subcategory = detail_div.a.text.lower().replace('\n', '').replace('\t', '')
-  return subcategory
+  return _subcategory_from_div(detail_div)
+
+
+def extract_article_detail(html: str, article_url: str) -> ArticleDetail:
+  """Extract all article's detail fields from VNExpress article's HTML at once.
+
+    Description:
+      A single pass over the page's tags (no tree) locates the needed elements
+      in document order, then only those elements are parsed into trees, giving
+      the same results as the per-field extract functions over the full tree.
+
+  Args:
+      html (str): Article's HTML
+      article_url (str): Link to article
+
+  Raises:
+      ArticleParseError: Missing element needed by article's detail
+
+  Returns:
+      ArticleDetail: Article's detail
+  """
+  sources: dict[VNExpressSelectors, _ArticleElementSource] = {}
+  body_paragraphs: list[_ArticleElementSource] = []
+  normal_paragraphs: list[_ArticleElementSource] = []
+  for source in _scan_article_elements(html):
+    for selector in ARTICLE_ELEMENT_SELECTORS[source.name]:
+      if not _has_class(source.classes, selector):
+        continue
+      if selector == VNExpressSelectors.ARTICLE_BODY_PARAGRAPH:
+        body_paragraphs.append(source)
+      elif selector == VNExpressSelectors.NORMAL_PARAGRAPH:
+        normal_paragraphs.append(source)
+      else:
+        sources.setdefault(selector, source)
+  for selector in REQUIRED_ARTICLE_SELECTORS:
+    if selector not in sources:
+      raise ArticleParseError(article_url, selector)
+  elements = {
+      selector: source.parse(html) for selector, source in sources.items()
+  }
+  author_div = elements[VNExpressSelectors.AUTHOR]
+  paragraphs = [elements[VNExpressSelectors.LEAD_POST_DETAIL_ROW].text]
+  paragraphs.extend(
+      paragraph.parse(html).text
+      for paragraph in (body_paragraphs if len(body_paragraphs) > 0 else
+                        normal_paragraphs))
+  return ArticleDetail(
+      title=elements[VNExpressSelectors.TITLE_POST].text,
+      thumbnail_url=_thumbnail_url_from_div(
+          elements.get(VNExpressSelectors.THUMB_DETAIL_TOP)),
+      content='\n'.join(paragraphs),
+      author=_author_from_div(author_div),
+      link=article_url,
+      posted_at=_posted_at_datestr_from_div(author_div),
+      category=elements[
+          VNExpressSelectors.ITEM_MENU_LEFT_ACTIVE].a.text.lower(),
+      subcategory=_subcategory_from_div(
+          elements[VNExpressSelectors.FOLDER_NAME_DETAIL]))
@@ -1,7 +1,11 @@
 from common.config.aws import AWSServices
 from common.config.categories import VNExpressCategories
 from common.config.date_formats import DateFormats
+from common.config.discovery import DiscoveryModes
 from common.config.env import EnvVariables
 from common.config.resource_keys import ResourceKeys
 from common.config.selectors import HTMLSelectors, VNExpressSelectors
-from common.config.url import VNEXPRESS_CATEGORY_URL, VNEXPRESS_COVID19_URL
+from common.config.snapshot import ExportFormats, SnapshotFormats
+from common.config.url import (VNEXPRESS_CATEGORY_FEED_URL,
+                               VNEXPRESS_CATEGORY_URL, VNEXPRESS_COVID19_URL)
+from common.config.write_modes import WriteModes
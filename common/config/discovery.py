@@ -0,0 +1,8 @@
+from strenum import StrEnum  # pylint: disable=invalid-name
+
+
+class DiscoveryModes(StrEnum):
+  """Ways of discovering new articles' links
+  """
+  LISTING = "listing"  # Paging category's listing pages
+  FEED = "feed"  # Reading category's RSS feed/sitemap, listing pages as fallback
@@ -13,7 +13,60 @@ class EnvVariables(StrEnum):
   S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
   S3_BUCKET_URI = os.getenv("S3_BUCKET_URI")
   ARTICLE_CURSORS_FILENAME = os.getenv("ARTICLE_CURSORS_FILENAME")
+  CURSOR_LINK_HASHES = os.getenv("CURSOR_LINK_HASHES") or "50"
+  SEEN_LINKS_FILENAME = os.getenv("SEEN_LINKS_FILENAME") or "seen_links.bloom"
+  SEEN_LINKS_CAPACITY = os.getenv("SEEN_LINKS_CAPACITY") or "100000"
+  SEEN_LINKS_ERROR_RATE = os.getenv("SEEN_LINKS_ERROR_RATE") or "0.001"
   PAGE_SCRAPING_THRESHOLD = os.getenv("PAGE_SCRAPING_THRESHOLD")
   SCRAPE_SLEEP_TIME = os.getenv("SCRAPE_SLEEP_TIME")
+  VNEXPRESS_DISCOVERY_MODE = os.getenv("VNEXPRESS_DISCOVERY_MODE") or "listing"
+  SNAPSHOT_FORMAT = os.getenv("SNAPSHOT_FORMAT") or "json"  # Or "jsonl.gz"
+  SNAPSHOT_EXPIRE_ORIGINALS = os.getenv(
+      "SNAPSHOT_EXPIRE_ORIGINALS") or "false"  # Delete compacted snapshots
+  ARTICLES_WRITE_MODE = os.getenv(
+      "ARTICLES_WRITE_MODE") or "upsert"  # Or "insert"
+  HISTORY_CHUNK_SIZE = os.getenv("HISTORY_CHUNK_SIZE") or "1000"
+  HISTORY_MAX_PENDING_CHUNKS = os.getenv("HISTORY_MAX_PENDING_CHUNKS") or "8"
+  HISTORY_WRITE_WORKERS = os.getenv("HISTORY_WRITE_WORKERS") or "4"
+  HISTORY_CHECKPOINT_INTERVAL = os.getenv(
+      "HISTORY_CHECKPOINT_INTERVAL") or "10"  # Seconds
+  ARTICLES_EXPORT_FORMAT = os.getenv(
+      "ARTICLES_EXPORT_FORMAT") or ""  # "parquet" or "arrow", empty to disable
+  ARTICLES_EXPORT_PREFIX = os.getenv("ARTICLES_EXPORT_PREFIX") or "export"
+  SCRAPE_MAX_WORKERS = os.getenv("SCRAPE_MAX_WORKERS") or "1"
+  SCRAPE_PREFETCH_PAGES = os.getenv("SCRAPE_PREFETCH_PAGES") or "0"
+  SCRAPE_PARSE_WORKERS = os.getenv("SCRAPE_PARSE_WORKERS") or "0"
+  SCRAPE_RATE_LIMIT = os.getenv("SCRAPE_RATE_LIMIT") or "2.0"
+  SHARED_RATE_LIMIT = os.getenv("SHARED_RATE_LIMIT") or ""  # Empty to disable
+  SHARED_RATE_BACKEND = os.getenv("SHARED_RATE_BACKEND") or "file"
+  SHARED_RATE_FILE = os.getenv(
+      "SHARED_RATE_FILE") or "/tmp/shared_rate_limit.json"
+  SHARED_RATE_POSTGRES_URI = os.getenv("SHARED_RATE_POSTGRES_URI") or ""
+  SCRAPE_ADAPTIVE_RATE = os.getenv("SCRAPE_ADAPTIVE_RATE") or "false"
+  SCRAPE_MIN_RATE = os.getenv("SCRAPE_MIN_RATE") or "0.2"
+  SCRAPE_MAX_RATE = os.getenv("SCRAPE_MAX_RATE") or "10.0"
+  SCRAPE_MIN_CONCURRENCY = os.getenv("SCRAPE_MIN_CONCURRENCY") or "1"
+  SCRAPE_MAX_CONCURRENCY = os.getenv("SCRAPE_MAX_CONCURRENCY") or "8"
+  SCRAPE_TARGET_LATENCY = os.getenv("SCRAPE_TARGET_LATENCY") or "2.0"
+  SCRAPE_RATE_INCREASE = os.getenv("SCRAPE_RATE_INCREASE") or "0.1"
+  SCRAPE_RATE_DECREASE = os.getenv("SCRAPE_RATE_DECREASE") or "0.5"
+  SCRAPE_ERROR_RATE_THRESHOLD = os.getenv(
+      "SCRAPE_ERROR_RATE_THRESHOLD") or "0.1"
+  HTTP_POOL_MAXSIZE = os.getenv("HTTP_POOL_MAXSIZE") or "10"
+  HTTP_CONNECT_TIMEOUT = os.getenv("HTTP_CONNECT_TIMEOUT") or "5.0"
+  HTTP_READ_TIMEOUT = os.getenv("HTTP_READ_TIMEOUT") or "30.0"
+  HTTP_MAX_RETRIES = os.getenv("HTTP_MAX_RETRIES") or "3"
+  HTTP_BACKOFF_FACTOR = os.getenv("HTTP_BACKOFF_FACTOR") or "0.5"
+  HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR") or ""  # Empty to disable
+  HTTP_CACHE_MAX_BYTES = os.getenv("HTTP_CACHE_MAX_BYTES") or "536870912"
+  HTTP_CACHE_TTL = os.getenv("HTTP_CACHE_TTL") or "604800"
   ALCHEMY_API_URL = os.getenv("ALCHEMY_API_URL")
+  ALCHEMY_MAX_IN_FLIGHT = os.getenv("ALCHEMY_MAX_IN_FLIGHT") or "4"
+  ALCHEMY_BATCH_MAX_CHARS = os.getenv(
+      "ALCHEMY_BATCH_MAX_CHARS") or "20000"  # 0 to disable batching
+  ALCHEMY_MODEL_VERSION = os.getenv("ALCHEMY_MODEL_VERSION") or "1"
+  QUEST_CACHE_ENABLED = os.getenv("QUEST_CACHE_ENABLED") or "true"
+  QUEST_CACHE_COLLECTION = os.getenv("QUEST_CACHE_COLLECTION") or "quest_cache"
+  QUEST_CACHE_TTL = os.getenv("QUEST_CACHE_TTL") or "2592000"  # 30 days
+  QUEST_CACHE_MAX_ENTRIES = os.getenv("QUEST_CACHE_MAX_ENTRIES") or "100000"
   DUTY_MONGO_URI = os.getenv("DUTY_MONGO_URI")
@@ -8,3 +8,6 @@ class ResourceKeys(StrEnum):
   S3_RESOURCE_URI = "s3_resource_uri"
   ALCHEMY_CLIENT = "alchemy_client"
   DUTY_MONGO_CLIENT = "duty_mongo_client"
+  HTTP_CLIENT = "http_client"
+  SEEN_LINKS = "seen_links"
+  PARSE_POOL = "parse_pool"
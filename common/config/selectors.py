@@ -10,6 +10,9 @@ class HTMLSelectors(StrEnum):
   PARAGRAPH = "p"
   CLASS = "class"
   H1 = "h1"
+  ANCHOR = "a"
+  IMG = "img"
+  SRC = "src"
 
 
 class VNExpressSelectors(StrEnum):
@@ -25,6 +28,7 @@ class VNExpressSelectors(StrEnum):
   FOLDER_NAME_DETAIL = "folder_name_detail"
   ARTICLE_BODY_PARAGRAPH = "article-body__element__2p5pI"
   ARTICLE_HEADER_DIV = "article-header__heading__15OpQ"
+  THUMB_DETAIL_TOP = "thumb_detail_top"
   # Icons
   ICON_PHOTO = "ic-photo"
   ICON_VIDEO = "ic-video"
@@ -0,0 +1,15 @@
+from strenum import StrEnum  # pylint: disable=invalid-name
+
+
+class SnapshotFormats(StrEnum):
+  """Formats of scraped articles' snapshots, also their files' extension
+  """
+  JSON = "json"  # One indented JSON array (legacy)
+  JSONL_GZ = "jsonl.gz"  # One compact record per line, gzip-compressed
+
+
+class ExportFormats(StrEnum):
+  """Columnar formats of articles' exports, also their files' extension
+  """
+  PARQUET = "parquet"
+  ARROW = "arrow"  # Arrow IPC file (Feather V2)
@@ -11,4 +11,11 @@ VNEXPRESS_CATEGORY_URL = {
         "https://e.vnexpress.net/category/listcategory/category_id/1003902"
 }
 
+VNEXPRESS_CATEGORY_FEED_URL = {
+    VNExpressCategories.NEWS: "https://e.vnexpress.net/rss/news.rss",
+    VNExpressCategories.BUSINESS: "https://e.vnexpress.net/rss/business.rss",
+    VNExpressCategories.LIFE: "https://e.vnexpress.net/rss/life.rss",
+    VNExpressCategories.WORLD: "https://e.vnexpress.net/rss/world.rss"
+}
+
 VNEXPRESS_COVID19_URL = "https://e.vnexpress.net/covid-19/covid-19-viet-nam"
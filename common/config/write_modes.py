@@ -0,0 +1,8 @@
+from strenum import StrEnum  # pylint: disable=invalid-name
+
+
+class WriteModes(StrEnum):
+  """Modes of writing articles to Duty's DB
+  """
+  INSERT = "insert"  # Plain inserts, duplicates fail on the unique link index
+  UPSERT = "upsert"  # Insert unless the normalized link exists ($setOnInsert)
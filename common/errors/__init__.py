@@ -1 +1,2 @@
+from common.errors.article import ArticleParseError
 from common.errors.key import CategoryKeyError
@@ -0,0 +1,18 @@
+class ArticleParseError(Exception):
+  """Article Parse Exception raised when an article's page misses elements needed
+  by its detail (e.g. photo/video only articles)
+
+  Attributes:
+    link (str): Link to article
+    element (str): Missing element's selector
+    message (str): Exception Message
+  """
+
+  def __init__(self, link: str, element: str) -> None:
+    self.link = link
+    self.element = element
+    self.message: str = f"ArticleParseError: Missing '{element}' element in article at: {link}"
+    super().__init__(link, element)  # Picklable from worker processes
+
+  def __str__(self) -> str:
+    return self.message
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+import struct
+
+_HEADER = struct.Struct(">4sQdQ")  # Magic, capacity, error rate, count
+_MAGIC = b"BLM1"
+
+
+class BloomFilter:
+  """Fixed-size Bloom filter of 16-byte digests (e.g. hashed links)
+
+  Attributes:
+      capacity (int): Number of items kept within the error rate
+      error_rate (float): False positive rate at capacity
+      size (int): Number of bits
+      hash_count (int): Number of bits set per item
+      count (int): Number of added items
+  """
+
+  def __init__(self, capacity: int, error_rate: float) -> None:
+    if capacity <= 0:
+      raise ValueError(f"Bloom filter's capacity must be positive, got {capacity}")
+    if not 0 < error_rate < 1:
+      raise ValueError(
+          f"Bloom filter's error rate must be in (0, 1), got {error_rate}")
+    self._capacity = capacity
+    self._error_rate = error_rate
+    self._size = math.ceil(-capacity * math.log(error_rate) / (math.log(2)**2))
+    self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+    self._bits = bytearray((self._size + 7) // 8)
+    self._count = 0
+
+  @property
+  def capacity(self) -> int:
+    return self._capacity
+
+  @property
+  def error_rate(self) -> float:
+    return self._error_rate
+
+  @property
+  def size(self) -> int:
+    return self._size
+
+  @property
+  def hash_count(self) -> int:
+    return self._hash_count
+
+  @property
+  def count(self) -> int:
+    return self._count
+
+  def _positions(self, digest: bytes) -> list[int]:
+    """Bit positions of a digest (double hashing)
+    """
+    first, second = struct.unpack(">QQ", digest[:16])
+    return [(first + i * second) % self._size for i in range(self._hash_count)]
+
+  def __contains__(self, digest: bytes) -> bool:
+    return all(self._bits[pos >> 3] & (1 << (pos & 7))
+               for pos in self._positions(digest))
+
+  def add(self, digest: bytes) -> bool:
+    """Add a digest to the filter
+
+    Args:
+        digest (bytes): 16-byte digest
+
+    Returns:
+        bool: True if the digest was not in the filter yet
+    """
+    is_new = False
+    for pos in self._positions(digest):
+      mask = 1 << (pos & 7)
+      if not self._bits[pos >> 3] & mask:
+        self._bits[pos >> 3] |= mask
+        is_new = True
+    if is_new:
+      self._count += 1
+    return is_new
+
+  def is_full(self) -> bool:
+    return self._count >= self._capacity
+
+  def union(self, other: BloomFilter) -> None:
+    """Merge another filter of the same parameters into this one
+
+    Args:
+        other (BloomFilter): Other filter
+
+    Raises:
+        ValueError: Parameters of the filters are different
+    """
+    if (other.capacity, other.error_rate) != (self.capacity, self.error_rate):
+      raise ValueError("Cannot merge Bloom filters of different parameters")
+    merged = (int.from_bytes(self._bits, 'big') |
+              int.from_bytes(other._bits, 'big'))
+    self._bits = bytearray(merged.to_bytes(len(self._bits), 'big'))
+    self._count = max(self._count, other.count)
+
+  def to_bytes(self) -> bytes:
+    return _HEADER.pack(_MAGIC, self._capacity, self._error_rate,
+                        self._count) + bytes(self._bits)
+
+  @classmethod
+  def from_bytes(cls, data: bytes) -> BloomFilter:
+    """Load a filter serialized by `to_bytes`
+
+    Args:
+        data (bytes): Serialized filter
+
+    Raises:
+        ValueError: Invalid data
+
+    Returns:
+        BloomFilter: Bloom filter
+    """
+    magic, capacity, error_rate, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+      raise ValueError("Invalid Bloom filter data")
+    bloom_filter = cls(capacity, error_rate)
+    bits = data[_HEADER.size:]
+    if len(bits) != len(bloom_filter._bits):
+      raise ValueError("Invalid Bloom filter data")
+    bloom_filter._bits = bytearray(bits)
+    bloom_filter._count = count
+    return bloom_filter
@@ -0,0 +1,117 @@
+import os
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from common.config.snapshot import ExportFormats
+
+
+def _resolve_uri(uri: str) -> tuple[fs.FileSystem, str]:
+  """Resolve the filesystem (S3 or local) and the path of an URI
+
+  Args:
+      uri (str): S3 URI or local path
+
+  Returns:
+      tuple[fs.FileSystem, str]: Filesystem and path within it
+  """
+  if not urlparse(uri).scheme:
+    uri = os.path.abspath(uri)
+  return fs.FileSystem.from_uri(uri)
+
+
+# Names of the export formats in pyarrow's datasets
+DATASET_FORMATS = {ExportFormats.PARQUET: "parquet", ExportFormats.ARROW: "ipc"}
+
+
+def _hive_partitioning(partition_columns: Iterable[str]) -> ds.Partitioning:
+  schema = pa.schema([(column, pa.string()) for column in partition_columns])
+  return ds.partitioning(schema, flavor="hive")
+
+
+def write_partitioned_dataset(records: list[dict],
+                              uri: str,
+                              export_format: ExportFormats,
+                              partition_columns: list[str],
+                              basename: str,
+                              dictionary_columns: Iterable[str] = (),
+                              compressed_columns: Iterable[str] = ()) -> None:
+  """Write records into a columnar dataset (Hive partitioning, e.g.
+  `<uri>/provider=.../category=.../date=...`), adding files next to the existing
+  ones.
+
+  Args:
+      records (list[dict]): Records (same keys, string partition values)
+      uri (str): Dataset's root URI (S3 or local)
+      export_format (ExportFormats): Parquet or Arrow IPC files
+      partition_columns (list[str]): Columns partitioning the files
+      basename (str): Files' base name, unique to the write
+      dictionary_columns (Iterable[str], optional): Dictionary-encoded columns
+      compressed_columns (Iterable[str], optional): Columns compressed with zstd
+        (Parquet, the others use snappy), Arrow IPC files compress every column.
+  """
+  table = pa.Table.from_pylist(records)
+  for column in dictionary_columns:
+    table = table.set_column(table.schema.get_field_index(column), column,
+                             pc.dictionary_encode(table[column]))
+  export_format = ExportFormats(export_format)
+  if export_format == ExportFormats.PARQUET:
+    compressed_columns = set(compressed_columns)
+    file_format = ds.ParquetFileFormat()
+    file_options = file_format.make_write_options(
+        use_dictionary=list(dictionary_columns),
+        compression={
+            column: "zstd" if column in compressed_columns else "snappy"
+            for column in table.column_names
+            if column not in partition_columns
+        })
+  else:
+    file_format = ds.IpcFileFormat()
+    file_options = file_format.make_write_options(compression="zstd")
+  filesystem, path = _resolve_uri(uri)
+  ds.write_dataset(table,
+                   path,
+                   filesystem=filesystem,
+                   format=file_format,
+                   file_options=file_options,
+                   partitioning=_hive_partitioning(partition_columns),
+                   basename_template=f"{basename}-{{i}}.{export_format}",
+                   existing_data_behavior="overwrite_or_ignore")
+
+
+def read_partitioned_dataset(uri: str,
+                             export_format: ExportFormats,
+                             partition_columns: list[str],
+                             columns: Optional[list[str]] = None,
+                             filter_: Optional[ds.Expression] = None) -> pa.Table:
+  """Scan a columnar dataset written by `write_partitioned_dataset`. Only the
+  projected columns are read, and filters on partition columns skip whole
+  directories while the others skip Parquet row groups by their statistics.
+
+    Example:
+      >>> read_partitioned_dataset(
+      ...     "s3://bucket/export", ExportFormats.PARQUET,
+      ...     ["provider", "category", "date"], columns=["title", "author"],
+      ...     filter_=(ds.field("category") == "news") &
+      ...     (ds.field("date") >= "2022-03-01"))
+
+  Args:
+      uri (str): Dataset's root URI (S3 or local)
+      export_format (ExportFormats): Parquet or Arrow IPC files
+      partition_columns (list[str]): Columns partitioning the files
+      columns (list[str], optional): Projected columns, all if not specified
+      filter_ (ds.Expression, optional): Predicate on rows (`ds.field(...)`)
+
+  Returns:
+      pa.Table: Matching rows
+  """
+  filesystem, path = _resolve_uri(uri)
+  dataset = ds.dataset(path,
+                       filesystem=filesystem,
+                       format=DATASET_FORMATS[ExportFormats(export_format)],
+                       partitioning=_hive_partitioning(partition_columns))
+  return dataset.to_table(columns=columns, filter=filter_)
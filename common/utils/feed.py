@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Iterator, Optional
+from xml.etree.ElementTree import iterparse
+
+import pytz
+
+# Elements of RSS items and sitemap URLs (namespaces stripped)
+_ENTRY_TAGS = frozenset({"item", "url"})
+_LINK_TAGS = frozenset({"link", "loc"})
+_RFC822_DATE_TAGS = frozenset({"pubDate"})
+_ISO8601_DATE_TAGS = frozenset({"publication_date", "lastmod"})
+
+
+@dataclass
+class FeedEntry:
+  """Link announced by a RSS feed or a sitemap
+  """
+  link: str
+  published_at: Optional[datetime]  # Naive UTC datetime
+
+
+def _local_name(tag: str) -> str:
+  return tag.rsplit('}', 1)[-1]
+
+
+def _to_naive_utc(datetime_obj: datetime) -> datetime:
+  if datetime_obj.tzinfo is None:
+    return datetime_obj  # Assumed to be UTC
+  return datetime_obj.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def _parse_published_at(tag: str, text: str) -> Optional[datetime]:
+  try:
+    if tag in _RFC822_DATE_TAGS:
+      return _to_naive_utc(parsedate_to_datetime(text))
+    return _to_naive_utc(datetime.fromisoformat(text.replace('Z', '+00:00')))
+  except (TypeError, ValueError):
+    return None
+
+
+def iter_feed_entries(content: bytes) -> Iterator[FeedEntry]:
+  """Stream entries of a RSS feed (<item>) or a sitemap (<url>) without building
+  the whole tree
+
+  Args:
+      content (bytes): Feed's XML
+
+  Raises:
+      xml.etree.ElementTree.ParseError: Invalid XML
+
+  Yields:
+      FeedEntry: Entry's link & publish time, in document order
+  """
+  link: Optional[str] = None
+  published_at: Optional[datetime] = None
+  depth = 0
+  for event, element in iterparse(BytesIO(content), events=("start", "end")):
+    tag = _local_name(element.tag)
+    if event == "start":
+      if tag in _ENTRY_TAGS:
+        depth += 1
+        link, published_at = None, None
+      continue
+    if depth == 0:
+      element.clear()  # Channel's metadata
+      continue
+    text = (element.text or '').strip()
+    if tag in _LINK_TAGS and link is None and text:
+      link = text
+    elif (tag in _RFC822_DATE_TAGS or tag in _ISO8601_DATE_TAGS) and text:
+      published_at = published_at or _parse_published_at(tag, text)
+    elif tag in _ENTRY_TAGS:
+      depth -= 1
+      if link is not None:
+        yield FeedEntry(link=link, published_at=published_at)
+      element.clear()
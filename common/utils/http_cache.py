@@ -0,0 +1,186 @@
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from threading import Lock
+from time import time
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+@dataclass
+class CachedResponse:  # pylint: disable=too-many-instance-attributes
+  """Cached HTTP response with its validators
+  """
+  url: str
+  status_code: int
+  headers: dict[str, str]
+  content: bytes
+  encoding: Optional[str]
+  etag: Optional[str]
+  last_modified: Optional[str]
+
+  def conditional_headers(self) -> dict[str, str]:
+    """Build the headers revalidating this entry
+
+    Returns:
+        dict[str, str]: If-None-Match/If-Modified-Since headers
+    """
+    headers = {}
+    if self.etag is not None:
+      headers["If-None-Match"] = self.etag
+    if self.last_modified is not None:
+      headers["If-Modified-Since"] = self.last_modified
+    return headers
+
+  def to_response(self) -> requests.Response:
+    """Rebuild a requests' Response from the cached entry
+
+    Returns:
+        requests.Response: Response
+    """
+    resp = requests.Response()
+    resp.url = self.url
+    resp.status_code = self.status_code
+    resp.headers = CaseInsensitiveDict(self.headers)
+    resp.encoding = self.encoding
+    resp._content = self.content  # pylint: disable=protected-access
+    return resp
+
+
+class HttpCache:
+  """Persistent (SQLite) HTTP cache keyed by URL for conditional GET requests.
+  Entries expire after the TTL and the least recently used ones are evicted once
+  the total stored size goes over the cap.
+
+  Attributes:
+      path (str): Path of the SQLite database file
+      max_bytes (int): Size cap of the cached contents
+      ttl (float): Time to live of an entry in seconds
+  """
+
+  def __init__(self, path: str, max_bytes: int, ttl: float) -> None:
+    self._path = path
+    self._max_bytes = max_bytes
+    self._ttl = ttl
+    self._lock = Lock()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # NOTE: Several runs may share the file, WAL mode lets readers run during writes
+    self._conn = sqlite3.connect(path,
+                                 timeout=30,
+                                 check_same_thread=False,
+                                 isolation_level=None)
+    self._conn.execute("PRAGMA journal_mode=WAL")
+    self._conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+        url TEXT PRIMARY KEY,
+        status_code INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        content BLOB NOT NULL,
+        encoding TEXT,
+        etag TEXT,
+        last_modified TEXT,
+        size INTEGER NOT NULL,
+        stored_at REAL NOT NULL,
+        accessed_at REAL NOT NULL)""")
+    self._conn.execute(
+        "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+  @property
+  def path(self) -> str:
+    return self._path
+
+  @property
+  def max_bytes(self) -> int:
+    return self._max_bytes
+
+  @property
+  def ttl(self) -> float:
+    return self._ttl
+
+  def get(self, url: str) -> Optional[CachedResponse]:
+    """Get the cached entry of an URL if it has not expired, marking it recently
+    used
+
+    Args:
+        url (str): URL
+
+    Returns:
+        CachedResponse | None: Cached entry
+    """
+    now = time()
+    with self._lock:
+      row = self._conn.execute(
+          """SELECT status_code, headers, content, encoding, etag, last_modified,
+          stored_at FROM entries WHERE url = ?""", (url,)).fetchone()
+      if row is None:
+        return None
+      if row[6] < now - self.ttl:
+        self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+        return None
+      self._conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?",
+                         (now, url))
+    return CachedResponse(url=url,
+                          status_code=row[0],
+                          headers=json.loads(row[1]),
+                          content=row[2],
+                          encoding=row[3],
+                          etag=row[4],
+                          last_modified=row[5])
+
+  def put(self, url: str, resp: requests.Response) -> None:
+    """Store a response if it carries validators (ETag/Last-Modified)
+
+    Args:
+        url (str): Requested URL
+        resp (requests.Response): Response
+    """
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag is None and last_modified is None:
+      return  # Cannot be revalidated
+    content = resp.content
+    now = time()
+    with self._lock:
+      self._conn.execute(
+          "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+          (url, resp.status_code, json.dumps(dict(resp.headers)), content,
+           resp.encoding, etag, last_modified, len(content), now, now))
+      self._evict()
+
+  def refresh(self, url: str) -> None:
+    """Mark an entry as revalidated and recently used
+
+    Args:
+        url (str): URL
+    """
+    now = time()
+    with self._lock:
+      self._conn.execute(
+          "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE url = ?",
+          (now, now, url))
+
+  def _evict(self) -> None:
+    """Evict expired entries, then least recently used ones over the size cap
+    (lock must be held)
+    """
+    self._conn.execute("DELETE FROM entries WHERE stored_at < ?",
+                       (time() - self.ttl,))
+    total_size = self._conn.execute(
+        "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total_size <= self.max_bytes:
+      return
+    rows = self._conn.execute(
+        "SELECT url, size FROM entries ORDER BY accessed_at ASC").fetchall()
+    evicted_urls = []
+    for url, size in rows:
+      if total_size <= self.max_bytes:
+        break
+      evicted_urls.append((url,))
+      total_size -= size
+    self._conn.executemany("DELETE FROM entries WHERE url = ?", evicted_urls)
+
+  def close(self) -> None:
+    with self._lock:
+      self._conn.close()
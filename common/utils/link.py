@@ -0,0 +1,29 @@
+from hashlib import blake2b
+from urllib.parse import urlsplit, urlunsplit
+
+
+def normalize_link(link: str) -> str:
+  """Normalize article's link, so that the same article is identified by one link
+  (lowercase scheme & host, no query string, fragment or trailing slash)
+
+  Args:
+      link (str): Article's link
+
+  Returns:
+      str: Normalized link
+  """
+  parts = urlsplit(link.strip())
+  return urlunsplit((parts.scheme.lower(), parts.netloc.lower(),
+                     parts.path.rstrip('/'), '', ''))
+
+
+def hash_link(link: str) -> bytes:
+  """Hash article's normalized link
+
+  Args:
+      link (str): Article's link
+
+  Returns:
+      bytes: 16-byte digest
+  """
+  return blake2b(normalize_link(link).encode('utf-8'), digest_size=16).digest()
@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from typing import Union
+
+import pymongo
+from dagster import get_dagster_logger
+from pymongo import InsertOne, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+from common.config.write_modes import WriteModes
+from common.utils.link import normalize_link
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+ARTICLE_LINK_FIELD = "normalizedLink"
+ARTICLE_LINK_INDEX = "normalizedLink_unique"
+
+
+@dataclass
+class BulkWriteCounts:
+  """Outcome of bulk writes
+  """
+  written_count: int = 0  # Inserted or upserted documents
+  existing_count: int = 0  # Upserts matching an existing document
+  duplicate_count: int = 0  # Duplicate key errors
+  error_count: int = 0  # Other write errors
+
+  def add(self, other: "BulkWriteCounts") -> None:
+    self.written_count += other.written_count
+    self.existing_count += other.existing_count
+    self.duplicate_count += other.duplicate_count
+    self.error_count += other.error_count
+
+
+def backfill_article_links(collection: Collection,
+                           batch_size: int = 1000) -> int:
+  """Set the normalized link of the articles written without one (before the
+  unique index), keeping it on the oldest article of a link only: the others
+  already duplicate it and would break the unique index
+
+  Args:
+      collection (Collection): Articles' collection
+      batch_size (int, optional): Updates per bulk write. Defaults to 1000.
+
+  Returns:
+      int: Number of backfilled articles
+  """
+  known_links = {
+      document[ARTICLE_LINK_FIELD] for document in collection.find(
+          {ARTICLE_LINK_FIELD: {
+              "$exists": True
+          }}, {
+              ARTICLE_LINK_FIELD: 1,
+              "_id": 0
+          })
+  }
+  documents = collection.find({
+      ARTICLE_LINK_FIELD: {
+          "$exists": False
+      },
+      "link": {
+          "$type": "string"
+      }
+  }, {
+      "link": 1
+  }).sort("_id", pymongo.ASCENDING)
+  requests: list[UpdateOne] = []
+  backfill_count = 0
+  duplicate_count = 0
+  for document in documents:
+    link = normalize_link(document["link"])
+    if link in known_links:
+      duplicate_count += 1
+      continue
+    known_links.add(link)
+    requests.append(
+        UpdateOne({"_id": document["_id"]}, {"$set": {
+            ARTICLE_LINK_FIELD: link
+        }}))
+    if len(requests) == batch_size:
+      collection.bulk_write(requests, ordered=False)
+      backfill_count += len(requests)
+      requests = []
+  if len(requests) > 0:
+    collection.bulk_write(requests, ordered=False)
+    backfill_count += len(requests)
+  get_dagster_logger().info(
+      f"Backfilled the normalized link of {backfill_count} articles, "
+      f"{duplicate_count} already duplicated articles left unindexed.")
+  return backfill_count
+
+
+def create_article_link_index(collection: Collection) -> None:
+  """Create the unique index of articles' normalized link, backfilling the
+  articles written before it first (once, while the index does not exist), so
+  that they are matched by upserts and existing links' lookups
+
+  Args:
+      collection (Collection): Articles' collection
+  """
+  if ARTICLE_LINK_INDEX in collection.index_information():
+    return
+  backfill_article_links(collection)
+  collection.create_index([(ARTICLE_LINK_FIELD, pymongo.ASCENDING)],
+                          name=ARTICLE_LINK_INDEX,
+                          unique=True,
+                          sparse=True)
+
+
+def find_existing_links(collection: Collection, links: list[str]) -> set[str]:
+  """Find which normalized links already have an article, with one query covered
+  by the unique link index. Articles written before the index are found through
+  their backfilled normalized link (see `create_article_link_index`, to call
+  first).
+
+  Args:
+      collection (Collection): Articles' collection
+      links (list[str]): Normalized links
+
+  Returns:
+      set[str]: Existing links among them
+  """
+  if len(links) == 0:
+    return set()
+  documents = collection.find({ARTICLE_LINK_FIELD: {
+      "$in": links
+  }}, {
+      ARTICLE_LINK_FIELD: 1,
+      "_id": 0
+  })
+  return {document[ARTICLE_LINK_FIELD] for document in documents}
+
+
+def build_article_write_request(
+    document: dict, write_mode: WriteModes) -> Union[InsertOne, UpdateOne]:
+  """Build the write request of an article's document, keyed by its normalized
+  link
+
+  Args:
+      document (dict): Article's document
+      write_mode (WriteModes): Write mode
+
+  Returns:
+      InsertOne | UpdateOne: Insert, or upsert inserting only a new link
+  """
+  link = normalize_link(document["link"])
+  document[ARTICLE_LINK_FIELD] = link
+  if write_mode == WriteModes.UPSERT:
+    return UpdateOne({ARTICLE_LINK_FIELD: link}, {"$setOnInsert": document},
+                     upsert=True)
+  return InsertOne(document)
+
+
+def bulk_write_articles(
+    collection: Collection,
+    requests: list[Union[InsertOne, UpdateOne]]) -> BulkWriteCounts:
+  """Write articles' requests (unordered), counting duplicate keys apart from the
+  other errors, which are logged
+
+  Args:
+      collection (Collection): Articles' collection
+      requests (list[InsertOne | UpdateOne]): Write requests
+
+  Returns:
+      BulkWriteCounts: Outcome of the writes
+  """
+  if len(requests) == 0:
+    return BulkWriteCounts()
+  try:
+    result = collection.bulk_write(requests, ordered=False)
+    return BulkWriteCounts(written_count=result.inserted_count +
+                           result.upserted_count,
+                           existing_count=result.matched_count)
+  except BulkWriteError as bwe:
+    write_errors = bwe.details["writeErrors"]
+    duplicate_count = sum(1 for write_error in write_errors
+                          if write_error["code"] == DUPLICATE_KEY_ERROR_CODE)
+    if duplicate_count < len(write_errors):
+      get_dagster_logger().error([
+          write_error for write_error in write_errors
+          if write_error["code"] != DUPLICATE_KEY_ERROR_CODE
+      ])
+    return BulkWriteCounts(written_count=bwe.details["nInserted"] +
+                           bwe.details["nUpserted"],
+                           existing_count=bwe.details["nMatched"],
+                           duplicate_count=duplicate_count,
+                           error_count=len(write_errors) - duplicate_count)
@@ -0,0 +1,191 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import timedelta
+from hashlib import blake2b
+from threading import Lock
+
+import pymongo
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+
+from common.utils.date import get_today_utc
+
+CREATED_AT_INDEX = "createdAt_ttl"
+
+
+def normalize_content(content: str) -> str:
+  """Normalize content, so that the same text hashes the same (NFC, collapsed
+  whitespaces)
+
+  Args:
+      content (str): Content
+
+  Returns:
+      str: Normalized content
+  """
+  return re.sub(r"\s+", " ", unicodedata.normalize("NFC", content)).strip()
+
+
+def hash_content(content: str, model_version: str) -> str:
+  """Hash normalized content with the model's version
+
+  Args:
+      content (str): Content
+      model_version (str): Version of the quest generation model
+
+  Returns:
+      str: Hex digest
+  """
+  digest = blake2b(digest_size=16)
+  digest.update(model_version.encode('utf-8'))
+  digest.update(b'\0')
+  digest.update(normalize_content(content).encode('utf-8'))
+  return digest.hexdigest()
+
+
+@dataclass
+class QuestCacheStats:
+  """Lookup statistics of a quest cache
+  """
+  hit_count: int = 0
+  miss_count: int = 0
+
+  @property
+  def hit_rate(self) -> float:
+    lookup_count = self.hit_count + self.miss_count
+    if lookup_count == 0:
+      return 0.0
+    return self.hit_count / lookup_count
+
+  def summary(self) -> str:
+    return (f"{self.hit_count} hits / {self.miss_count} misses "
+            f"({self.hit_rate:.1%} hit rate)")
+
+
+class QuestCache:
+  """Persistent (MongoDB collection) cache of generated quests keyed by the hash
+  of normalized content and model's version, shared by all runs. Entries expire
+  after the TTL (TTL index) and the least recently used ones are evicted once
+  the entries go over the cap.
+
+  Attributes:
+      collection (Collection): Cache's collection
+      model_version (str): Version of the quest generation model
+      ttl (float): Time to live of an entry in seconds
+      max_entries (int): Maximum entries
+      stats (QuestCacheStats): Lookup statistics
+  """
+
+  def __init__(self, collection: Collection, model_version: str, ttl: float,
+               max_entries: int) -> None:
+    self._collection = collection
+    self._model_version = model_version
+    self._ttl = ttl
+    self._max_entries = max_entries
+    self._stats = QuestCacheStats()
+    self._stats_lock = Lock()
+    try:
+      collection.create_index([("createdAt", pymongo.ASCENDING)],
+                              name=CREATED_AT_INDEX,
+                              expireAfterSeconds=int(ttl))
+    except OperationFailure:  # TTL changed
+      collection.database.command("collMod",
+                                  collection.name,
+                                  index={
+                                      "name": CREATED_AT_INDEX,
+                                      "expireAfterSeconds": int(ttl)
+                                  })
+    collection.create_index([("accessedAt", pymongo.ASCENDING)])
+
+  @property
+  def collection(self) -> Collection:
+    return self._collection
+
+  @property
+  def model_version(self) -> str:
+    return self._model_version
+
+  @property
+  def ttl(self) -> float:
+    return self._ttl
+
+  @property
+  def max_entries(self) -> int:
+    return self._max_entries
+
+  @property
+  def stats(self) -> QuestCacheStats:
+    return self._stats
+
+  def build_key(self, content: str) -> str:
+    return hash_content(content, self.model_version)
+
+  def get_many(self, keys: list[str]) -> dict[str, list[dict]]:
+    """Get the cached quests of several keys (expired entries are misses, even
+    before the TTL monitor deletes them)
+
+    Args:
+        keys (list[str]): Keys
+
+    Returns:
+        dict[str, list[dict]]: Quests of each cached key
+    """
+    if len(keys) == 0:
+      return {}
+    now = get_today_utc()
+    documents = self._collection.find({
+        "_id": {
+            "$in": keys
+        },
+        "createdAt": {
+            "$gte": now - timedelta(seconds=self.ttl)
+        }
+    })
+    cached = {document["_id"]: document["quests"] for document in documents}
+    if len(cached) > 0:
+      self._collection.update_many({"_id": {
+          "$in": list(cached)
+      }}, {"$set": {
+          "accessedAt": now
+      }})
+    with self._stats_lock:
+      self._stats.hit_count += sum(1 for key in keys if key in cached)
+      self._stats.miss_count += sum(1 for key in keys if key not in cached)
+    return cached
+
+  def put_many(self, entries: dict[str, list[dict]]) -> None:
+    """Store the quests of several keys, then evict over the cap
+
+    Args:
+        entries (dict[str, list[dict]]): Quests of each key
+    """
+    if len(entries) == 0:
+      return
+    now = get_today_utc()
+    requests = [
+        pymongo.ReplaceOne({"_id": key}, {
+            "quests": quests,
+            "modelVersion": self.model_version,
+            "createdAt": now,
+            "accessedAt": now
+        },
+                           upsert=True) for key, quests in entries.items()
+    ]
+    self._collection.bulk_write(requests, ordered=False)
+    self._evict()
+
+  def _evict(self) -> None:
+    """Evict the least recently used entries over the cap
+    """
+    excess_count = self._collection.estimated_document_count(
+    ) - self.max_entries
+    if excess_count <= 0:
+      return
+    documents = self._collection.find({}, {
+        "_id": 1
+    }).sort("accessedAt", pymongo.ASCENDING).limit(excess_count)
+    self._collection.delete_many(
+        {"_id": {
+            "$in": [document["_id"] for document in documents]
+        }})
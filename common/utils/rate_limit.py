@@ -0,0 +1,316 @@
+from collections import deque
+from threading import Condition, Lock
+from time import monotonic, sleep
+from typing import Optional
+from urllib.parse import urlparse
+
+from common.utils.shared_rate_limit import BaseSharedTokenBuckets
+
+
+class TokenBucket:
+  """Thread-safe token bucket limiting the rate of an activity
+
+  Attributes:
+      rate (float): Refilled tokens per second
+      capacity (float): Maximum tokens held by the bucket (burst size)
+  """
+
+  def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+    if rate <= 0:
+      raise ValueError(f"Token bucket's rate must be positive, got {rate}")
+    self._rate = rate
+    self._capacity = capacity if capacity is not None else 1.0
+    self._tokens = self._capacity
+    self._last_refill = monotonic()
+    self._lock = Lock()
+
+  @property
+  def rate(self) -> float:
+    return self._rate
+
+  @rate.setter
+  def rate(self, rate: float) -> None:
+    with self._lock:
+      self._refill()
+      self._rate = rate
+
+  @property
+  def capacity(self) -> float:
+    return self._capacity
+
+  def _refill(self) -> None:
+    """Refill tokens based on elapsed time (lock must be held)
+    """
+    now = monotonic()
+    self._tokens = min(self._capacity,
+                       self._tokens + (now - self._last_refill) * self._rate)
+    self._last_refill = now
+
+  def acquire(self, tokens: float = 1.0) -> None:
+    """Block until the requested tokens are available, then consume them
+
+    Args:
+        tokens (float, optional): Tokens to consume. Defaults to 1.0.
+    """
+    while True:
+      with self._lock:
+        self._refill()
+        if self._tokens >= tokens:
+          self._tokens -= tokens
+          return
+        wait_time = (tokens - self._tokens) / self._rate
+      sleep(wait_time)
+
+
+class HostRateLimiter:
+  """Rate limiter keeping one token bucket per host, drawing from buckets shared
+  with the other runs as well if specified
+
+  Attributes:
+      rate (float): Allowed requests per second for each host
+      capacity (float): Burst size for each host
+      shared_buckets (BaseSharedTokenBuckets | None): Cross-run buckets per host
+  """
+
+  def __init__(
+      self,
+      rate: float,
+      capacity: Optional[float] = None,
+      shared_buckets: Optional[BaseSharedTokenBuckets] = None) -> None:
+    self._rate = rate
+    self._capacity = capacity
+    self._shared_buckets = shared_buckets
+    self._buckets: dict[str, TokenBucket] = {}
+    self._lock = Lock()
+
+  @property
+  def rate(self) -> float:
+    return self._rate
+
+  @property
+  def shared_buckets(self) -> Optional[BaseSharedTokenBuckets]:
+    return self._shared_buckets
+
+  def _acquire_shared(self, url: str) -> None:
+    if self._shared_buckets is not None:
+      self._shared_buckets.acquire(urlparse(url).netloc)
+
+  def _get_bucket(self, host: str) -> TokenBucket:
+    with self._lock:
+      if host not in self._buckets:
+        self._buckets[host] = TokenBucket(self._rate, self._capacity)
+      return self._buckets[host]
+
+  def acquire(self, url: str) -> None:
+    """Block until a request to the URL's host is allowed
+
+    Args:
+        url (str): Requested URL
+    """
+    self._get_bucket(urlparse(url).netloc).acquire()
+    self._acquire_shared(url)
+
+  def release(self,
+              url: str,
+              latency: float,
+              status_code: Optional[int] = None,
+              retry_after: Optional[float] = None) -> None:
+    """Report the outcome of an acquired request (nothing to do for a static
+    limit)
+
+    Args:
+        url (str): Requested URL
+        latency (float): Request's latency in seconds
+        status_code (int, optional): Response's status, None if it failed
+        retry_after (float, optional): Delay (seconds) requested by Retry-After
+    """
+
+  def summary(self) -> str:
+    summary = f"static {self.rate:.2f} req/s per host"
+    if self._shared_buckets is not None:
+      summary += f" (shared {self._shared_buckets.rate:.2f} req/s per host)"
+    return summary
+
+  def close(self) -> None:
+    if self._shared_buckets is not None:
+      self._shared_buckets.close()
+
+
+class AdaptiveRateController:  # pylint: disable=too-many-instance-attributes
+  """AIMD controller of a host's request rate and concurrency.
+
+    Description:
+      A successful response within the target latency increases the rate by a
+      fixed step and the concurrency by one (additive increase), at most once per
+      interval (the target latency, at least a second) so that concurrent
+      responses count once, whatever the number of fetchers. A 429, a
+      Retry-After, a 5xx rate above the threshold or a latency above the target
+      multiplies both by the decrease factor (multiplicative decrease), at most
+      once per interval as well so that a burst of concurrent failures counts
+      once. Retry-After also pauses the host.
+
+  Attributes:
+      rate (float): Current requests per second
+      concurrency (int): Current maximum in-flight requests
+      decrease_count (int): Number of decreases
+  """
+
+  def __init__(self,
+               initial_rate: float,
+               min_rate: float,
+               max_rate: float,
+               min_concurrency: int,
+               max_concurrency: int,
+               target_latency: float,
+               increase_step: float,
+               decrease_factor: float,
+               error_rate_threshold: float,
+               window: int = 20) -> None:
+    self._min_rate = min_rate
+    self._max_rate = max_rate
+    self._min_concurrency = min_concurrency
+    self._max_concurrency = max_concurrency
+    self._target_latency = target_latency
+    self._increase_step = increase_step
+    self._decrease_factor = decrease_factor
+    self._error_rate_threshold = error_rate_threshold
+    self._interval = max(target_latency, 1.0)
+    self._bucket = TokenBucket(min(max(initial_rate, min_rate), max_rate))
+    self._concurrency = float(min_concurrency)
+    self._in_flight = 0
+    self._paused_until = 0.0
+    self._last_increase = 0.0
+    self._last_decrease = 0.0
+    self._decrease_count = 0
+    self._outcomes: deque[bool] = deque(maxlen=window)  # True for 5xx/failures
+    self._condition = Condition()
+
+  @property
+  def rate(self) -> float:
+    return self._bucket.rate
+
+  @property
+  def concurrency(self) -> int:
+    return int(self._concurrency)
+
+  @property
+  def decrease_count(self) -> int:
+    return self._decrease_count
+
+  def acquire(self) -> None:
+    """Block until the host is not paused, a concurrency slot is free and the
+    rate allows a request
+    """
+    with self._condition:
+      while True:
+        wait_time = self._paused_until - monotonic()
+        if wait_time <= 0 and self._in_flight < self.concurrency:
+          break
+        self._condition.wait(timeout=wait_time if wait_time > 0 else None)
+      self._in_flight += 1
+    self._bucket.acquire()
+
+  def release(self,
+              latency: float,
+              status_code: Optional[int] = None,
+              retry_after: Optional[float] = None) -> None:
+    """Free the request's slot and adapt the limits to its outcome
+
+    Args:
+        latency (float): Request's latency in seconds
+        status_code (int, optional): Response's status, None if it failed
+        retry_after (float, optional): Delay (seconds) requested by Retry-After
+    """
+    now = monotonic()
+    with self._condition:
+      self._in_flight -= 1
+      is_error = status_code is None or status_code >= 500
+      self._outcomes.append(is_error)
+      if retry_after is not None:
+        self._paused_until = max(self._paused_until, now + retry_after)
+      error_rate = sum(self._outcomes) / len(self._outcomes)
+      if (status_code == 429 or retry_after is not None or
+          latency > self._target_latency or
+          (is_error and error_rate > self._error_rate_threshold)):
+        self._decrease(now)
+      elif not is_error:
+        self._increase(now)
+      self._condition.notify_all()
+
+  def _decrease(self, now: float) -> None:
+    """Multiplicative decrease (condition's lock must be held)
+    """
+    if now - self._last_decrease < self._interval:
+      return  # Cooldown, concurrent responses of the same episode
+    self._last_decrease = now
+    self._decrease_count += 1
+    self._bucket.rate = max(self._min_rate,
+                            self._bucket.rate * self._decrease_factor)
+    self._concurrency = max(float(self._min_concurrency),
+                            self._concurrency * self._decrease_factor)
+
+  def _increase(self, now: float) -> None:
+    """Additive increase (condition's lock must be held)
+    """
+    if now - self._last_increase < self._interval:
+      return  # Already increased for the responses of this interval
+    self._last_increase = now
+    self._bucket.rate = min(self._max_rate,
+                            self._bucket.rate + self._increase_step)
+    self._concurrency = min(float(self._max_concurrency),
+                            self._concurrency + 1)
+
+  def summary(self) -> str:
+    return (f"{self.rate:.2f} req/s, concurrency {self.concurrency}, "
+            f"{self.decrease_count} decreases")
+
+
+class AdaptiveHostRateLimiter(HostRateLimiter):
+  """Rate limiter keeping one AIMD controller per host
+
+  Attributes:
+      rate (float): Initial requests per second for each host
+  """
+
+  def __init__(self,
+               rate: float,
+               shared_buckets: Optional[BaseSharedTokenBuckets] = None,
+               **controller_kwargs) -> None:
+    """Initialize limiter
+
+    Args:
+        rate (float): Initial requests per second for each host
+        shared_buckets (BaseSharedTokenBuckets, optional): Cross-run buckets
+        controller_kwargs: AdaptiveRateController's limits (except initial_rate)
+    """
+    super().__init__(rate, shared_buckets=shared_buckets)
+    self._controller_kwargs = controller_kwargs
+    self._controllers: dict[str, AdaptiveRateController] = {}
+
+  def _get_controller(self, url: str) -> AdaptiveRateController:
+    host = urlparse(url).netloc
+    with self._lock:
+      if host not in self._controllers:
+        self._controllers[host] = AdaptiveRateController(
+            initial_rate=self.rate, **self._controller_kwargs)
+      return self._controllers[host]
+
+  def acquire(self, url: str) -> None:
+    self._get_controller(url).acquire()
+    self._acquire_shared(url)
+
+  def release(self,
+              url: str,
+              latency: float,
+              status_code: Optional[int] = None,
+              retry_after: Optional[float] = None) -> None:
+    self._get_controller(url).release(latency, status_code, retry_after)
+
+  def summary(self) -> str:
+    with self._lock:
+      controllers = list(self._controllers.items())
+    summary = "; ".join(f"{host}: {controller.summary()}"
+                        for host, controller in controllers) or "adaptive, idle"
+    if self._shared_buckets is not None:
+      summary += f" (shared {self._shared_buckets.rate:.2f} req/s per host)"
+    return summary
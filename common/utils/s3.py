@@ -1,12 +1,19 @@
+import glob
 import json
 import os
+from dataclasses import fields
+from functools import lru_cache
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
 
 import boto3
+import orjson
 from dagster import get_dagster_logger
 from dataclasses_json import DataClassJsonMixin
 from smart_open import open as s_open
 
 from common.config.aws import AWSServices
+from common.config.snapshot import SnapshotFormats
 
 
 def upload_file_s3(filename: str, bucket: str, object_name=None):
@@ -24,6 +31,56 @@ def upload_file_s3(filename: str, bucket: str, object_name=None):
   s3_client.upload_file(filename, bucket, object_name)
 
 
+def list_files_s3(uri_prefix: str) -> list[str]:
+  """List URIs of files starting with a prefix on S3 Bucket (or local files).
+
+  Args:
+      uri_prefix (str): URI's prefix (e.g. s3://bucket/provider/category/2022-03-05)
+
+  Returns:
+      list[str]: Files' URIs sorted by key
+  """
+  parsed_uri = urlparse(uri_prefix)
+  if parsed_uri.scheme != AWSServices.S3:
+    return sorted(glob.glob(f"{glob.escape(uri_prefix)}*"))
+  bucket = parsed_uri.netloc
+  s3_client = boto3.client(AWSServices.S3)
+  paginator = s3_client.get_paginator("list_objects_v2")
+  uris = []
+  for page in paginator.paginate(Bucket=bucket,
+                                 Prefix=parsed_uri.path.lstrip('/')):
+    uris.extend(f"s3://{bucket}/{obj['Key']}" for obj in page.get("Contents", []))
+  return sorted(uris)
+
+
+def delete_files_s3(uris: list[str]):
+  """Delete files on S3 Bucket (or local files) via URIs.
+
+  Args:
+      uris (list[str]): Files' URIs
+  """
+  keys_by_bucket: dict[str, list[str]] = {}
+  for uri in uris:
+    parsed_uri = urlparse(uri)
+    if parsed_uri.scheme != AWSServices.S3:
+      os.remove(uri)
+      continue
+    keys_by_bucket.setdefault(parsed_uri.netloc,
+                              []).append(parsed_uri.path.lstrip('/'))
+  if len(keys_by_bucket) == 0:
+    return
+  s3_client = boto3.client(AWSServices.S3)
+  for bucket, keys in keys_by_bucket.items():
+    for idx in range(0, len(keys), 1000):  # Maximum keys of a request
+      s3_client.delete_objects(Bucket=bucket,
+                               Delete={
+                                   "Objects": [{
+                                       "Key": key
+                                   } for key in keys[idx:idx + 1000]],
+                                   "Quiet": True
+                               })
+
+
 def write_file_s3(data: object, uri: str):
   """Write data into file on S3 Bucket via URI and filename.
 
@@ -46,6 +103,45 @@ def write_json_file_s3(data: object, uri: str):
     json.dump(data, file, ensure_ascii=False, indent=4)
 
 
+def write_json_lines_file_s3(records: Iterable[object], uri: str):
+  """Write Python objects into a JSON Lines file (one compact record per line) on
+  S3 Bucket via URI, streamed record by record. Compressed according to the
+  URI's extension (e.g. `.gz`).
+
+  Args:
+      records (Iterable[object]): Records
+      uri (str): URI of S3 bucket resource
+  """
+  with s_open(uri, 'w', encoding='utf-8') as file:
+    for record in records:
+      file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+      file.write('\n')
+
+
+def write_bytes_file_s3(data: bytes, uri: str):
+  """Write binary data into file on S3 Bucket via URI.
+
+  Args:
+      data (bytes): Data
+      uri (str): URI of S3 bucket resource
+  """
+  with s_open(uri, 'wb') as file:
+    file.write(data)
+
+
+def read_bytes_file_s3(uri: str) -> bytes:
+  """Read binary file from S3 Bucket via URI.
+
+  Args:
+      uri (str): S3 URI
+
+  Returns:
+      bytes: Data
+  """
+  with s_open(uri, 'rb') as file:
+    return file.read()
+
+
 def read_dataclass_json_file_s3(dataclass: DataClassJsonMixin, uri: str,
                                 many: bool) -> object:
   """Read json file as dataclass.
@@ -64,26 +160,121 @@ def read_dataclass_json_file_s3(dataclass: DataClassJsonMixin, uri: str,
   return data
 
 
-def read_dataclass_multiple_json_lines_s3(dataclass: DataClassJsonMixin,
-                                          uri: str) -> object:
-  """Read multiple json lines as dataclass.
+def iter_dataclass_json_lines_s3(dataclass: DataClassJsonMixin,
+                                 uri: str) -> Iterator[DataClassJsonMixin]:
+  """Read a JSON Lines file (decompressed according to the URI's extension) as
+  dataclass objects, one line at a time.
+
+  Args:
+      dataclass (DataClassJsonMixin): Dataclass
+      uri (str): S3 URI
+
+  Yields:
+      DataClassJsonMixin: Data object of each non-empty line
+  """
+  schema = dataclass.schema()
+  with s_open(uri, 'r', encoding='utf-8') as file:
+    for line in file:
+      if line.strip():
+        yield schema.loads(line)
+
+
+def read_dataclass_snapshot_s3(dataclass: DataClassJsonMixin,
+                               uri: str) -> Iterable[DataClassJsonMixin]:
+  """Read a snapshot file as dataclass objects based on its extension: JSON Lines
+  snapshots are streamed, legacy JSON ones are loaded at once.
 
   Args:
       dataclass (DataClassJsonMixin): Dataclass
       uri (str): S3 URI
-      many (bool): (True) Parse many into list | (False) Parse one into object
 
   Returns:
-      object: Data object(s)
+      Iterable[DataClassJsonMixin]: Data objects
   """
-  data = []
-  with s_open(uri, 'r') as file:
+  if uri.endswith(f".{SnapshotFormats.JSONL_GZ}"):
+    return iter_dataclass_json_lines_s3(dataclass, uri)
+  return read_dataclass_json_file_s3(dataclass, uri, many=True)
+
+
+@lru_cache(maxsize=None)
+def _dataclass_schema(dataclass: DataClassJsonMixin):
+  return dataclass.schema()
+
+
+@lru_cache(maxsize=None)
+def _dataclass_field_names(dataclass: DataClassJsonMixin) -> frozenset[str]:
+  return frozenset(field.name for field in fields(dataclass))
+
+
+def read_dataclass_json_lines_offsets_s3(
+    dataclass: DataClassJsonMixin,
+    uri: str,
+    start_offset: int = 0,
+    validate: bool = False) -> Iterator[tuple[int, DataClassJsonMixin]]:
+  """Read multiple json lines as dataclass from a byte offset, one line at a time,
+  with the offset reached after each line.
+
+    Description:
+      Lines are decoded with orjson and the dataclass is built directly from the
+      decoded fields (unknown ones are ignored), the marshmallow schema (built once
+      per dataclass) only runs when validating. Malformed lines are logged with
+      their line number (counted from the start offset) and skipped. Resuming from
+      a returned offset seeks straight to the next line (ranged GET on S3).
+
+  Args:
+      dataclass (DataClassJsonMixin): Dataclass
+      uri (str): S3 URI
+      start_offset (int, optional): Byte offset of the first line to read
+        (of the decompressed stream). Defaults to 0.
+      validate (bool, optional): Validate (and convert) fields' types with the
+        dataclass' schema. Defaults to False.
+
+  Yields:
+      tuple[int, DataClassJsonMixin]: Byte offset after the line, data object of
+        each valid line
+  """
+  field_names = _dataclass_field_names(dataclass)
+  schema = _dataclass_schema(dataclass) if validate else None
+  with s_open(uri, 'rb') as file:
+    if start_offset > 0:
+      file.seek(start_offset)
+    offset = start_offset
     for idx, line in enumerate(file):
+      offset += len(line)
+      if not line.strip():
+        continue
       try:
-        data.append(dataclass.schema().loads(line))
-      except Exception as err:
+        record = orjson.loads(line)
+        if schema is not None:
+          data = schema.load(record)
+        else:
+          data = dataclass(
+              **{key: record[key] for key in field_names if key in record})
+      except Exception as err:  # pylint: disable=broad-except
         get_dagster_logger().error(f"{err} at line {idx+1}")
-  return data
+        continue
+      yield offset, data
+
+
+def read_dataclass_multiple_json_lines_s3(
+    dataclass: DataClassJsonMixin,
+    uri: str,
+    validate: bool = False) -> Iterator[DataClassJsonMixin]:
+  """Read multiple json lines as dataclass, one line at a time.
+
+  Args:
+      dataclass (DataClassJsonMixin): Dataclass
+      uri (str): S3 URI
+      validate (bool, optional): Validate (and convert) fields' types with the
+        dataclass' schema. Defaults to False.
+
+  Yields:
+      DataClassJsonMixin: Data object of each valid line
+  """
+  for _, data in read_dataclass_json_lines_offsets_s3(dataclass,
+                                                      uri,
+                                                      validate=validate):
+    yield data
 
 
 def read_json_file_s3(uri: str,) -> object:
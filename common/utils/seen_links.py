@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import struct
+from typing import Iterable, Optional
+
+from common.utils.bloom import BloomFilter
+from common.utils.link import hash_link
+
+_GENERATION_SIZE = struct.Struct(">Q")
+
+
+class SeenLinks:
+  """Bounded index of already stored articles' links.
+
+    Description:
+      Links are kept in two generations of Bloom filters: once the current one
+      reaches its capacity it replaces the previous one and a new one is started,
+      so the size stays bounded (two filters) and the oldest links are forgotten
+      first. A lookup may report an unseen link as seen with a probability of about
+      twice the configured error rate.
+
+  Attributes:
+      capacity (int): Links per generation
+      error_rate (float): False positive rate of a generation at capacity
+      is_modified (bool): True if links were added since loaded
+  """
+
+  def __init__(self,
+               capacity: int,
+               error_rate: float,
+               current: Optional[BloomFilter] = None,
+               previous: Optional[BloomFilter] = None) -> None:
+    self._capacity = capacity
+    self._error_rate = error_rate
+    self._current = current or BloomFilter(capacity, error_rate)
+    self._previous = previous
+    self._is_modified = False
+
+  @property
+  def capacity(self) -> int:
+    return self._capacity
+
+  @property
+  def error_rate(self) -> float:
+    return self._error_rate
+
+  @property
+  def is_modified(self) -> bool:
+    return self._is_modified
+
+  def __contains__(self, link: str) -> bool:
+    digest = hash_link(link)
+    return digest in self._current or (self._previous is not None and
+                                       digest in self._previous)
+
+  def __len__(self) -> int:
+    return self._current.count + (self._previous.count
+                                  if self._previous is not None else 0)
+
+  def add(self, link: str) -> None:
+    """Mark a link as seen
+
+    Args:
+        link (str): Article's link
+    """
+    digest = hash_link(link)
+    if digest in self._current:
+      return
+    # NOTE: Rotation drops the previous generation, only the links of the last two
+    # generations are remembered (between one and two capacities' worth)
+    if self._current.is_full():
+      self._previous = self._current
+      self._current = BloomFilter(self.capacity, self.error_rate)
+    self._current.add(digest)
+    self._is_modified = True
+
+  def update(self, links: Iterable[str]) -> None:
+    for link in links:
+      self.add(link)
+
+  def merge(self, other: SeenLinks) -> None:
+    """Merge links seen by another index (e.g. stored concurrently by another run).
+    Generations are matched by position, the other index is dropped if its
+    parameters are different.
+
+    Args:
+        other (SeenLinks): Other index
+    """
+    if (other.capacity, other.error_rate) != (self.capacity, self.error_rate):
+      return
+    # pylint: disable=protected-access
+    self._current.union(other._current)
+    if other._previous is not None:
+      if self._previous is None:
+        self._previous = other._previous
+      else:
+        self._previous.union(other._previous)
+
+  def to_bytes(self) -> bytes:
+    generations = [self._current]
+    if self._previous is not None:
+      generations.append(self._previous)
+    data = bytearray()
+    for generation in generations:
+      generation_data = generation.to_bytes()
+      data += _GENERATION_SIZE.pack(len(generation_data)) + generation_data
+    return bytes(data)
+
+  @classmethod
+  def from_bytes(cls, data: bytes, capacity: int,
+                 error_rate: float) -> SeenLinks:
+    """Load an index serialized by `to_bytes`. Links stored with other parameters
+    are discarded (e.g. after the capacity or error rate is reconfigured).
+
+    Args:
+        data (bytes): Serialized index
+        capacity (int): Links per generation
+        error_rate (float): False positive rate of a generation at capacity
+
+    Returns:
+        SeenLinks: Index of seen links
+    """
+    generations: list[BloomFilter] = []
+    offset = 0
+    while offset < len(data):
+      (size,) = _GENERATION_SIZE.unpack_from(data, offset)
+      offset += _GENERATION_SIZE.size
+      generations.append(BloomFilter.from_bytes(data[offset:offset + size]))
+      offset += size
+    if len(generations) == 0 or (generations[0].capacity,
+                                 generations[0].error_rate) != (capacity,
+                                                                error_rate):
+      return cls(capacity, error_rate)
+    return cls(capacity, error_rate, generations[0],
+               generations[1] if len(generations) > 1 else None)
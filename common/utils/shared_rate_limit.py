@@ -0,0 +1,158 @@
+import fcntl
+import json
+import os
+from abc import ABC, abstractmethod
+from threading import Lock
+from time import sleep, time
+
+try:
+  import psycopg2
+except ImportError:  # Only needed by the postgres backend
+  psycopg2 = None
+
+
+class BaseSharedTokenBuckets(ABC):
+  """Token buckets per host shared by every run (process) drawing from them, so
+  that the combined rate of overlapping runs on a host stays bounded
+
+  Attributes:
+      rate (float): Refilled tokens per second of each host
+      capacity (float): Maximum tokens held by a host's bucket (burst size)
+  """
+
+  def __init__(self, rate: float, capacity: float = 1.0) -> None:
+    if rate <= 0:
+      raise ValueError(f"Token bucket's rate must be positive, got {rate}")
+    self._rate = rate
+    self._capacity = capacity
+
+  @property
+  def rate(self) -> float:
+    return self._rate
+
+  @property
+  def capacity(self) -> float:
+    return self._capacity
+
+  def _refill(self, tokens: float, updated_at: float, now: float) -> float:
+    return min(self.capacity, tokens + max(0.0, now - updated_at) * self.rate)
+
+  @abstractmethod
+  def _try_acquire(self, host: str, tokens: float) -> float:
+    """Atomically refill the host's bucket and consume tokens if available
+
+    Returns:
+        float: 0 if consumed, seconds to wait for the tokens otherwise
+    """
+
+  def acquire(self, host: str, tokens: float = 1.0) -> None:
+    """Block until the host's shared bucket has the tokens, then consume them
+
+    Args:
+        host (str): Host
+        tokens (float, optional): Tokens to consume. Defaults to 1.0.
+    """
+    while True:
+      wait_time = self._try_acquire(host, tokens)
+      if wait_time <= 0:
+        return
+      sleep(wait_time)
+
+  def close(self) -> None:
+    pass
+
+
+class FileSharedTokenBuckets(BaseSharedTokenBuckets):
+  """Shared token buckets stored in a JSON file guarded by an exclusive lock
+  (flock), for runs on the same machine/volume
+
+  Attributes:
+      path (str): Path of the buckets' file
+  """
+
+  def __init__(self, path: str, rate: float, capacity: float = 1.0) -> None:
+    super().__init__(rate, capacity)
+    self._path = path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+  @property
+  def path(self) -> str:
+    return self._path
+
+  def _try_acquire(self, host: str, tokens: float) -> float:
+    with open(self.path, 'a+', encoding='utf-8') as file:
+      fcntl.flock(file, fcntl.LOCK_EX)
+      try:
+        file.seek(0)
+        content = file.read()
+        buckets = json.loads(content) if content else {}
+        now = time()
+        available, updated_at = buckets.get(host, (self.capacity, now))
+        available = self._refill(available, updated_at, now)
+        wait_time = 0.0
+        if available >= tokens:
+          available -= tokens
+        else:
+          wait_time = (tokens - available) / self.rate
+        buckets[host] = (available, now)
+        file.seek(0)
+        file.truncate()
+        json.dump(buckets, file)
+        file.flush()
+        return wait_time
+      finally:
+        fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class PostgresSharedTokenBuckets(BaseSharedTokenBuckets):
+  """Shared token buckets stored in Postgres (e.g. Dagster's instance database),
+  one row per host locked while refilled (SELECT ... FOR UPDATE). Times come from
+  the database's clock so that runs on different machines agree.
+
+  Attributes:
+      uri (str): Postgres connection URI
+  """
+
+  def __init__(self, uri: str, rate: float, capacity: float = 1.0) -> None:
+    if psycopg2 is None:
+      raise ImportError(
+          "The postgres shared rate limit backend requires psycopg2, install "
+          "psycopg2-binary (requirements.txt)")
+    super().__init__(rate, capacity)
+    self._uri = uri
+    self._lock = Lock()
+    self._conn = psycopg2.connect(uri)
+    with self._conn, self._conn.cursor() as cursor:
+      cursor.execute("""CREATE TABLE IF NOT EXISTS host_token_buckets (
+          host TEXT PRIMARY KEY,
+          tokens DOUBLE PRECISION NOT NULL,
+          updated_at DOUBLE PRECISION NOT NULL)""")
+
+  @property
+  def uri(self) -> str:
+    return self._uri
+
+  def _try_acquire(self, host: str, tokens: float) -> float:
+    with self._lock, self._conn, self._conn.cursor() as cursor:
+      cursor.execute(
+          """INSERT INTO host_token_buckets (host, tokens, updated_at)
+          VALUES (%s, %s, EXTRACT(EPOCH FROM clock_timestamp()))
+          ON CONFLICT (host) DO NOTHING""", (host, self.capacity))
+      cursor.execute(
+          """SELECT tokens, updated_at, EXTRACT(EPOCH FROM clock_timestamp())
+          FROM host_token_buckets WHERE host = %s FOR UPDATE""", (host,))
+      available, updated_at, now = cursor.fetchone()
+      available = self._refill(available, updated_at, float(now))
+      wait_time = 0.0
+      if available >= tokens:
+        available -= tokens
+      else:
+        wait_time = (tokens - available) / self.rate
+      cursor.execute(
+          """UPDATE host_token_buckets SET tokens = %s, updated_at = %s
+          WHERE host = %s""", (available, float(now), host))
+    return wait_time
+
+  def close(self) -> None:
+    with self._lock:
+      self._conn.close()
@@ -0,0 +1,89 @@
+import glob
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+
+from article._base.ops.scrape_articles import ArticleDetail
+from article.vnexpress.utils.soup import (extract_article_detail,
+                                          extract_author, extract_category,
+                                          extract_lead_post_detail_row,
+                                          extract_posted_at_datestr,
+                                          extract_subcategory,
+                                          extract_thumbnail_url, extract_title)
+from common.config.selectors import HTMLSelectors, VNExpressSelectors
+from common.errors.article import ArticleParseError
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "vnexpress")
+
+# Markup around paragraphs that the full tree builds in its own way
+EDGE_MARKUP_SNIPPETS = (
+    '<div><p class="Normal">unclosed <b>bold</div>after',
+    '<p class="Normal">outer <p class="Normal">inner</p> rest',
+    '<p class="Normal"/>tail',
+    '<pre><p class="Normal">  <b>a</b>   \n  <i>b</i></p></pre>',
+    '<template><p class="Normal">x <b>y</b></p></template>',
+    '<p class>valueless</p><p class="x" class="Normal">duplicate</p>',
+    '<p class="Normal">&amp; &amp &nbsp;&nbsp &#150; &foo; a<br>b</br>c</p>',
+    '<p class="Normal">s<script>var a="</p>";</script>t<!-- c -->u</p>',
+)
+
+
+def extract_article_detail_full(html: str, article_url: str) -> ArticleDetail:
+  """Extract article's detail with the per-field functions over the full tree
+  """
+  soup = BeautifulSoup(html, "html.parser")
+  paragraphs = [extract_lead_post_detail_row(soup)]
+  body_paragraphs = soup.find_all(
+      HTMLSelectors.PARAGRAPH, class_=VNExpressSelectors.ARTICLE_BODY_PARAGRAPH)
+  if len(body_paragraphs) == 0:
+    body_paragraphs = soup.find_all(HTMLSelectors.PARAGRAPH,
+                                    class_=VNExpressSelectors.NORMAL_PARAGRAPH)
+  paragraphs.extend(paragraph.text for paragraph in body_paragraphs)
+  return ArticleDetail(title=extract_title(soup),
+                       thumbnail_url=extract_thumbnail_url(soup),
+                       content='\n'.join(paragraphs),
+                       author=extract_author(soup),
+                       link=article_url,
+                       posted_at=extract_posted_at_datestr(soup),
+                       category=extract_category(soup),
+                       subcategory=extract_subcategory(soup))
+
+
+class ExtractArticleDetailTest(unittest.TestCase):
+  """Single-pass extraction gives the same article's detail as the full tree
+  """
+
+  def test_same_as_full_tree(self):
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "article_*.html")))
+    self.assertGreater(len(paths), 0)
+    for path in paths:
+      with self.subTest(path=os.path.basename(path)):
+        with open(path, encoding="utf-8") as file:
+          html = file.read()
+        self.assertEqual(
+            extract_article_detail(html, path).to_json(),
+            extract_article_detail_full(html, path).to_json())
+
+  def test_same_as_full_tree_edge_markup(self):
+    with open(os.path.join(FIXTURES_DIR, "article_01.html"),
+              encoding="utf-8") as file:
+      html = file.read()
+    position = html.index('<p class="Normal">')
+    for snippet in EDGE_MARKUP_SNIPPETS:
+      with self.subTest(snippet=snippet):
+        page = html[:position] + snippet + html[position:]
+        self.assertEqual(
+            extract_article_detail(page, "article_01.html").to_json(),
+            extract_article_detail_full(page, "article_01.html").to_json())
+
+  def test_missing_elements(self):
+    with open(os.path.join(FIXTURES_DIR, "video_only.html"),
+              encoding="utf-8") as file:
+      html = file.read()
+    with self.assertRaises(ArticleParseError):
+      extract_article_detail(html, "video_only.html")
+
+
+if __name__ == "__main__":
+  unittest.main()